@@ -0,0 +1,174 @@
+"""Answer cache shared by worker processes through an SQLite file."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from caching import LRUCache
+from nlp_processor import normalize_query
+
+# Default bounds of the cache
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_TTL = 3600.0  # seconds since the answer was computed
+DEFAULT_MEMORY_ENTRIES = 512
+
+# Seconds a write waits for another process's write to finish
+_BUSY_TIMEOUT = 5.0
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS answers (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS answers_created ON answers (created)'
+)
+
+# PUBLIC_INTERFACE
+class AnswerCache:
+    """
+    Size-bounded cache of chat answers keyed by documents and query.
+
+    Keys combine a fingerprint of the documents answered from (their ids
+    are content hashes, see corpus.Corpus.fingerprint), the processing
+    version and the normalized query. A re-ingested, replaced or deleted
+    document changes the fingerprint, so answers computed from the old
+    content are never served again; they age out by ttl or make room for
+    newer ones.
+
+    Entries are JSON values in an SQLite file that every worker process
+    opens, so an answer computed by one worker serves the others. The most
+    recently used entries are also held in memory, serialized, so a hit
+    never shares objects with an earlier caller. Storage errors only turn
+    lookups into misses.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        version: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str): SQLite file shared by the worker processes
+            version (str): Processing version key (see nlp_processor.pipeline_version)
+            max_entries (int): Maximum number of answers stored in the file
+            ttl (float): Seconds an answer is served after it was computed
+            memory_entries (int): Answers also held in memory by each process
+        """
+        self.path = path
+        self.version = version
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._memory = LRUCache(memory_entries)
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(self, fingerprint: str, query: str) -> str:
+        """
+        Build the cache key of a query.
+
+        Args:
+            fingerprint (str): Fingerprint of the documents answered from
+            query (str): User's query text
+
+        Returns:
+            str: Cache key
+        """
+        text = '\n'.join((self.version, fingerprint, normalize_query(query)))
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up an answer.
+
+        Args:
+            key (str): Cache key built by key
+
+        Returns:
+            Optional[Dict]: A fresh copy of the cached value, or None on a
+                miss or when the answer is older than ttl
+        """
+        entry = self._memory.get(key)
+        if entry is None:
+            try:
+                row = self._connection().execute(
+                    'SELECT value, created FROM answers WHERE key = ?', (key,)
+                ).fetchone()
+            except sqlite3.Error:
+                row = None
+            if row is not None:
+                entry = (row[1] + self.ttl, row[0])
+                self._memory.put(key, entry)
+
+        if entry is None or entry[0] < time.time():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(entry[1])
+
+    def put(self, key: str, value: Dict) -> None:
+        """
+        Store an answer, dropping expired and the oldest ones beyond max_entries.
+
+        Args:
+            key (str): Cache key built by key
+            value (Dict): JSON-serialisable answer
+        """
+        now = time.time()
+        payload = json.dumps(value, separators=(',', ':'))
+        self._memory.put(key, (now + self.ttl, payload))
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO answers (key, value, created) VALUES (?, ?, ?)', (key, payload, now)
+                )
+                connection.execute('DELETE FROM answers WHERE created < ?', (now - self.ttl,))
+                connection.execute(
+                    'DELETE FROM answers WHERE key IN '
+                    '(SELECT key FROM answers ORDER BY created DESC LIMIT -1 OFFSET ?)',
+                    (self.max_entries,)
+                )
+        except sqlite3.Error:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report cache usage by this process.
+
+        Returns:
+            Dict[str, int]: Counters
+                {
+                    'hits': Lookups served from the cache,
+                    'misses': Lookups not found or expired,
+                    'size': Answers currently stored in the file
+                }
+        """
+        try:
+            size = self._connection().execute('SELECT COUNT(*) FROM answers').fetchone()[0]
+        except sqlite3.Error:
+            size = 0
+        return {'hits': self.hits, 'misses': self.misses, 'size': size}
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opened again after a fork."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=_BUSY_TIMEOUT)
+            # Readers never wait for a writer in write-ahead log mode
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            with connection:
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
@@ -1,36 +1,153 @@
-from flask import Flask, render_template, request, jsonify
-from werkzeug.utils import secure_filename
+from flask import Flask, Response, g, render_template, request, jsonify, stream_with_context
+from werkzeug.exceptions import HTTPException
+import json
 import os
-from pdf_processor import PDFProcessor
-from nlp_processor import NLPProcessor
-from response_generator import ResponseGenerator
+import time
+import metrics
+from nlp_processor import analyze_queries, analyze_query, pipeline_version, query_cache_stats, warm_up
+from answer_cache import AnswerCache
+from document_cache import DocumentCache
+from pdf_processor import get_extractor
+from response_generator import generate_batch_responses, generate_corpus_response, stream_corpus_response
+from corpus import Corpus
+from ingestion import DocumentIngestor, IngestionError, IngestionQueue, QueueFullError
+from sessions import SessionStore, set_documents
+from chunked_upload import ChunkedUploads, OffsetMismatchError, UploadError
 
 app = Flask(__name__)
 
 # Configuration
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['SPOOL_THRESHOLD'] = 4 * 1024 * 1024  # Larger uploads are ingested from disk
+app.config['PDF_EXTRACTOR'] = 'pypdf2'  # Text extraction backend (see pdf_processor.EXTRACTORS)
+app.config['PDF_PAGE_TIMEOUT'] = 10  # Seconds before a page's extraction is abandoned
+app.config['CHUNKED_UPLOAD_FOLDER'] = os.path.join('uploads', 'incoming')
+app.config['MAX_UPLOAD_BYTES'] = 512 * 1024 * 1024  # Largest file accepted through /uploads
+app.config['CACHE_FOLDER'] = 'cache'
+app.config['CACHE_MAX_BYTES'] = 256 * 1024 * 1024  # 256MB of cached documents
+app.config['ANSWER_CACHE_ENTRIES'] = 10000  # Chat answers shared by the worker processes
+app.config['ANSWER_CACHE_TTL'] = 3600  # Seconds an answer is served after it was computed
+app.config['INDEX_FOLDER'] = 'indexes'
+app.config['PASSAGE_FIRST_RETRIEVAL'] = False  # Rank large documents through passages; faster, lower recall
+app.config['SEGMENT_GRACE_PERIOD'] = 600  # Seconds a deleted document's index files are kept
+app.config['COMPACTION_INTERVAL'] = 300  # Seconds between removals of deleted documents' files
+app.config['ASYNC_INGESTION'] = False  # Default for uploads without ?async=
+app.config['INGESTION_WORKERS'] = 2
+app.config['INGESTION_QUEUE_SIZE'] = 16  # Pending uploads before 429 responses
+app.config['JOB_FOLDER'] = os.path.join('uploads', 'jobs')  # Job status shared by the worker processes
+app.config['SERVER_TIMING'] = False  # Report stage timings in Server-Timing headers
+app.config['MAX_BATCH_QUERIES'] = 1000  # Queries accepted by one /chat/batch request
+app.config['MAX_SESSIONS'] = 1024  # Conversations held in memory
+app.config['SESSION_TTL'] = 1800  # Seconds a conversation is kept after its last message
+app.config['SESSION_FOLDER'] = os.path.join('cache', 'sessions')  # Conversations shared by the worker processes
 ALLOWED_EXTENSIONS = {'pdf'}
 
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-# Initialize processors
-pdf_processor = PDFProcessor()
-nlp_processor = NLPProcessor()
-response_generator = ResponseGenerator()
+# Extraction and NLP results of previously uploaded documents, by content
+# hash; extracted text differs between backends, so each has its own entries
+document_cache = DocumentCache(
+    app.config['CACHE_FOLDER'],
+    '{}_{}'.format(pipeline_version(), get_extractor(app.config['PDF_EXTRACTOR']).name),
+    app.config['CACHE_MAX_BYTES']
+)
+
+# Answers to the first message of a conversation, by documents and query;
+# an SQLite file next to the document cache shares them between workers
+answer_cache = AnswerCache(
+    os.path.join(app.config['CACHE_FOLDER'], 'answers.sqlite3'),
+    document_cache.version,
+    app.config['ANSWER_CACHE_ENTRIES'],
+    app.config['ANSWER_CACHE_TTL']
+)
+
+# Every processed document, one index shard each, keyed by content hash
+corpus = Corpus(passage_first=app.config['PASSAGE_FIRST_RETRIEVAL'])
+
+# Upload pipeline, run inline or by the background ingestion workers; each
+# document's index files are a segment of INDEX_FOLDER, listed in its manifest
+ingestor = DocumentIngestor(corpus, document_cache, app.config)
+ingestion_queue = IngestionQueue(
+    ingestor.ingest,
+    workers=app.config['INGESTION_WORKERS'],
+    max_pending=app.config['INGESTION_QUEUE_SIZE'],
+    job_folder=app.config['JOB_FOLDER']
+)
+
+# Resumable uploads of files larger than one request; each chunk is a
+# request body of at most MAX_CONTENT_LENGTH bytes
+chunked_uploads = ChunkedUploads(app.config['CHUNKED_UPLOAD_FOLDER'], app.config['MAX_UPLOAD_BYTES'])
+
+# Conversation state of /chat and /chat/stream, by session id; written to
+# SESSION_FOLDER so a follow-up can reach any worker process
+sessions = SessionStore(
+    app.config['MAX_SESSIONS'], app.config['SESSION_TTL'], app.config['SESSION_FOLDER']
+)
+
+# Values read when /metrics is scraped; the shared stores are looked up
+# then, so a replaced store (as in tests) is the one reported
+metrics.registry.add_cache('query', query_cache_stats)
+metrics.registry.add_cache('document', document_cache.stats)
+metrics.registry.add_cache('answer', lambda: answer_cache.stats())
+metrics.registry.add_cache('session', lambda: sessions.stats())
+metrics.registry.add_gauge('ingestion_queue_depth', 'Uploads waiting for an ingestion worker', ingestion_queue.depth)
+metrics.registry.add_gauge('documents', 'Documents available for chat', lambda: len(corpus.documents()))
 
 def allowed_file(filename):
     """Check if the file extension is allowed."""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def _wants_async():
+    """Check whether the current upload should be ingested in the background."""
+    requested = request.args.get('async')
+    if requested is None:
+        return app.config['ASYNC_INGESTION']
+    return requested.lower() in {'1', 'true', 'yes'}
+
+def _sse_stream(events):
+    """Format (event, payload) pairs as Server-Sent Events, ending with 'done'."""
+    try:
+        for event, payload in events:
+            yield f'event: {event}\ndata: {json.dumps(payload)}\n\n'
+    except Exception as e:
+        yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+    yield 'event: done\ndata: {}\n\n'
+
+@app.before_request
+def _begin_request_metrics():
+    """Start collecting the stage timings of this request."""
+    g.metrics_token = metrics.registry.begin_request()
+
+@app.after_request
+def _end_request_metrics(response):
+    """Count the request and optionally report its stage timings."""
+    token = g.pop('metrics_token', None)
+    if token is not None:
+        timings = metrics.registry.end_request(token)
+        if timings and app.config['SERVER_TIMING']:
+            response.headers['Server-Timing'] = metrics.format_server_timing(timings)
+    metrics.increment(
+        'http_requests',
+        help_text='HTTP requests handled',
+        endpoint=request.endpoint or 'unknown',
+        status=str(response.status_code)
+    )
+    return response
+
 @app.route('/')
 def home():
     return render_template('index.html')
 
 @app.route('/upload', methods=['POST'])
 def upload_file():
-    """Handle PDF file upload."""
+    """
+    Handle PDF file upload.
+    
+    With ?replaces=<document id> the upload is a revised version of that
+    document, which is deleted once the new version is searchable.
+    """
     try:
         if 'file' not in request.files:
             return jsonify({'error': 'No file part'}), 400
@@ -42,20 +159,169 @@ def upload_file():
         if not allowed_file(file.filename):
             return jsonify({'error': 'File type not allowed'}), 400
         
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        data = file.read()
         
-        # Process the PDF
-        extracted_text = pdf_processor.extract_text(filepath)
-        if not extracted_text:
-            return jsonify({'error': 'Failed to extract text from PDF'}), 400
+        # Asynchronous uploads return a job id straight away; the job status
+        # is polled through /jobs/<id>
+        if _wants_async():
+            try:
+                job = ingestion_queue.submit(data, file.filename, replaces=request.args.get('replaces'))
+            except QueueFullError:
+                return jsonify({'error': 'Too many uploads in progress, try again later'}), 429
+            return jsonify({
+                'message': 'File accepted for processing',
+                'job_id': job.id,
+                'status_url': f'/jobs/{job.id}'
+            }), 202
         
-        return jsonify({'message': 'File uploaded and processed successfully'}), 200
+        try:
+            result = ingestor.ingest(data, file.filename, replaces=request.args.get('replaces'))
+        except IngestionError as e:
+            return jsonify({'error': str(e)}), 400
         
+        return jsonify(dict(result, message='File uploaded and processed successfully')), 200
+        
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _upload_status(upload):
+    """Describe a chunked upload for API responses, with its Upload-Offset header."""
+    body = {key: upload[key] for key in ('id', 'filename', 'size', 'offset', 'complete', 'document_id')}
+    body['upload_url'] = f"/uploads/{upload['id']}"
+    return body, {'Upload-Offset': str(upload['offset'])}
+
+@app.route('/uploads', methods=['POST'])
+def create_upload():
+    """
+    Start a resumable upload.
+    
+    Takes a JSON body {'filename', 'size'} with an optional 'sha256' of the
+    whole file. The file is then sent in chunks with PATCH /uploads/<id>.
+    """
+    data = request.get_json(silent=True)
+    if not data or not data.get('filename') or 'size' not in data:
+        return jsonify({'error': 'filename and size are required'}), 400
+    if not allowed_file(data['filename']):
+        return jsonify({'error': 'File type not allowed'}), 400
+    try:
+        upload = chunked_uploads.create(data['filename'], data['size'], data.get('sha256'))
+    except UploadError as e:
+        return jsonify({'error': str(e)}), 400
+    body, headers = _upload_status(upload)
+    return jsonify(body), 201, headers
+
+@app.route('/uploads/<upload_id>', methods=['GET'])
+def upload_status(upload_id):
+    """Report how many bytes of an upload have arrived, to resume it from there."""
+    upload = chunked_uploads.status(upload_id)
+    if upload is None:
+        return jsonify({'error': 'Unknown upload'}), 404
+    body, headers = _upload_status(upload)
+    return jsonify(body), 200, headers
+
+@app.route('/uploads/<upload_id>', methods=['PATCH'])
+def append_upload(upload_id):
+    """
+    Append a chunk to an upload.
+    
+    The raw request body is the chunk, and the Upload-Offset header the
+    offset it starts at, which must equal the bytes received so far (409
+    with the current offset otherwise). The chunk is streamed to disk. The
+    last chunk completes the upload and ingests the file as /upload does,
+    in the background with ?async=1 and replacing a document with
+    ?replaces=<document id>; an empty chunk at the final offset repeats the
+    ingestion of a complete upload.
+    """
+    try:
+        offset = int(request.headers['Upload-Offset'])
+    except (KeyError, ValueError):
+        return jsonify({'error': 'Upload-Offset header is required'}), 400
+    if (request.content_length or 0) > app.config['MAX_CONTENT_LENGTH']:
+        return jsonify({'error': 'Chunk is larger than MAX_CONTENT_LENGTH'}), 413
+    
+    upload = chunked_uploads.status(upload_id)
+    if upload is None:
+        return jsonify({'error': 'Unknown upload'}), 404
+    # An empty chunk at the end of a complete upload repeats its ingestion,
+    # for clients that lost the last response or were told to retry
+    if not (upload['complete'] and offset == upload['size']):
+        try:
+            upload = chunked_uploads.append(upload_id, offset, request.stream)
+        except KeyError:
+            return jsonify({'error': 'Unknown upload'}), 404
+        except OffsetMismatchError as e:
+            return jsonify({'error': str(e), 'offset': e.offset}), 409, {'Upload-Offset': str(e.offset)}
+        except UploadError as e:
+            return jsonify({'error': str(e)}), 400
+    
+    body, headers = _upload_status(upload)
+    if not upload['complete']:
+        return jsonify(body), 200, headers
+    
+    # The file is ingested from disk, using the hash computed on the way in
+    if _wants_async():
+        try:
+            job = ingestion_queue.submit(
+                upload['path'], upload['filename'], digest=upload['document_id'], replaces=request.args.get('replaces')
+            )
+        except QueueFullError:
+            return jsonify(dict(body, error='Too many uploads in progress, try again later')), 429, headers
+        return jsonify(dict(body, job_id=job.id, status_url=f'/jobs/{job.id}')), 202, headers
+    try:
+        result = ingestor.ingest(
+            upload['path'], upload['filename'], digest=upload['document_id'], replaces=request.args.get('replaces')
+        )
+    except IngestionError as e:
+        return jsonify(dict(body, error=str(e))), 400, headers
+    return jsonify(dict(body, **result, message='File uploaded and processed successfully')), 200, headers
+
+@app.route('/uploads/<upload_id>', methods=['DELETE'])
+def delete_upload(upload_id):
+    """Cancel an upload and delete the bytes received."""
+    if not chunked_uploads.discard(upload_id):
+        return jsonify({'error': 'Unknown upload'}), 404
+    return '', 204
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Report the stage, page progress and timings of an ingestion job."""
+    job = ingestion_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job.to_dict()), 200
+
+@app.route('/documents', methods=['GET'])
+def list_documents():
+    """List the uploaded documents available for chat."""
+    ingestor.sync()
+    return jsonify({'documents': corpus.documents()}), 200
+
+@app.route('/documents/<document_id>', methods=['DELETE'])
+def delete_document(document_id):
+    """
+    Delete a document from the index and every worker's corpus.
+    
+    Searches already running finish on the documents they started with.
+    """
+    ingestor.sync()
+    if not ingestor.delete(document_id):
+        return jsonify({'error': 'Unknown document'}), 404
+    return '', 204
+
+def _session_for(data):
+    """
+    Look up the conversation of a chat request and apply its document selection.
+    
+    Requests naming documents make them the conversation's documents; later
+    messages without 'documents' keep using them.
+    """
+    session_id, state = sessions.get(data.get('session_id'))
+    if data.get('documents'):
+        set_documents(state, data['documents'])
+    return session_id, state
+
 @app.route('/chat', methods=['POST'])
 def chat():
     """Handle chat interactions."""
@@ -66,16 +332,140 @@ def chat():
         
         user_message = data['message']
         
+        # Pick up documents uploaded through other worker processes
+        ingestor.sync()
+        session_id, state = _session_for(data)
+        
+        # The first answer of a conversation depends only on its documents
+        # and the query, so it is cached with the session state it leaves;
+        # a hit skips query analysis and retrieval
+        cache_key = None
+        if state['turns'] == 0:
+            cache_key = answer_cache.key(corpus.fingerprint(state['documents']), user_message)
+            cached = answer_cache.get(cache_key)
+            if cached is not None:
+                state.update(cached['session'])
+                sessions.save(session_id, state)
+                return jsonify({'response': cached['response'], 'session_id': session_id}), 200
+        
         # Process the user's message
-        processed_query = nlp_processor.process_query(user_message)
+        processed_query = analyze_query(user_message)
+        
+        # Generate response from the conversation's documents, or from all of them
+        response = generate_corpus_response(processed_query, corpus, state['documents'], state)
+        sessions.save(session_id, state)
+        if cache_key is not None:
+            answer_cache.put(cache_key, {
+                'response': response,
+                'session': {field: state[field] for field in ('focus', 'seen', 'candidates', 'turns')}
+            })
+        
+        return jsonify({'response': response, 'session_id': session_id}), 200
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/chat/batch', methods=['POST'])
+def chat_batch():
+    """
+    Answer many independent questions in one request.
+    
+    Takes a JSON body {'queries': [str, ...]} with optional 'documents' ids,
+    as /chat. The queries are parsed together and resolved in one pass over
+    each document; the response lists one result per query, in order, with
+    the time spent on it, and the batch's total stage timings.
+    """
+    try:
+        data = request.get_json()
+        queries = data.get('queries') if isinstance(data, dict) else None
+        if not isinstance(queries, list) or not all(isinstance(query, str) for query in queries):
+            return jsonify({'error': 'queries must be a list of strings'}), 400
+        if len(queries) > app.config['MAX_BATCH_QUERIES']:
+            return jsonify({'error': f"At most {app.config['MAX_BATCH_QUERIES']} queries per batch"}), 400
         
-        # Generate response
-        response = response_generator.generate_response(processed_query)
+        ingestor.sync()
+        start = time.perf_counter()
+        analyses = analyze_queries(queries)
+        analyzed = time.perf_counter()
+        responses = generate_batch_responses(analyses, corpus, data.get('documents'))
+        finished = time.perf_counter()
         
-        return jsonify({'response': response}), 200
+        return jsonify({
+            'results': [
+                {'query': query, 'analysis': analysis, 'response': response}
+                for query, analysis, response in zip(queries, analyses, responses)
+            ],
+            'timings': {
+                'query_analysis': round((analyzed - start) * 1000, 3),
+                'answer': round((finished - analyzed) * 1000, 3),
+                'total': round((finished - start) * 1000, 3)
+            }
+        }), 200
         
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/chat/stream', methods=['GET', 'POST'])
+def chat_stream():
+    """
+    Stream the answer to a chat message as Server-Sent Events.
+
+    GET takes the message, optional session id and document ids as query
+    parameters (?message=...&session_id=...&document=...), so browsers can
+    use EventSource; POST takes the same JSON body as /chat. A 'session'
+    event carries the session id first. Retrieved sentences are sent as
+    'hit' events as soon as each document has been searched, followed by
+    'chunk' events carrying the answer text, an 'answer' event with the
+    complete response and a final 'done' event.
+    """
+    try:
+        if request.method == 'POST':
+            data = request.get_json()
+        else:
+            data = {
+                'message': request.args.get('message'),
+                'session_id': request.args.get('session_id'),
+                'documents': request.args.getlist('document')
+            }
+        if not data or data.get('message') is None:
+            return jsonify({'error': 'No message provided'}), 400
+        
+        ingestor.sync()
+        processed_query = analyze_query(data['message'])
+        session_id, state = _session_for(data)
+        
+        def events():
+            yield 'session', {'session_id': session_id}
+            yield from stream_corpus_response(processed_query, corpus, state['documents'], state)
+            sessions.save(session_id, state)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    return Response(
+        stream_with_context(_sse_stream(events())),
+        mimetype='text/event-stream',
+        # Disable caching and proxy buffering so events arrive as sent
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Expose stage timings, counters and gauges in Prometheus text format."""
+    if not metrics.registry.enabled:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
+    # Load NLP resources before serving so missing ones fail at startup, and
+    # reopen the documents indexed by earlier runs
+    warm_up()
+    ingestor.sync()
+    # Development server; see wsgi.py for production serving
     app.run(debug=True, host='0.0.0.0')
@@ -0,0 +1 @@
+"""Performance benchmarks for the PDF RAG Chatbot (run from pdf_rag_chatbot/)."""
@@ -0,0 +1,140 @@
+"""
+Benchmark text extraction throughput and reading order across backends.
+
+Runs every extraction backend over a fixture corpus and reports pages per
+second. The default corpus is generated locally: plain single-column pages,
+kerned pages (every word split by a kerning adjustment, as in typeset
+documents) and kerned two-column pages whose content stream interleaves the
+columns. For the two-column fixture, 'in_order' is the share of consecutive
+text lines extracted next to each other, as they are read. Backends whose
+library is not installed are reported as unavailable.
+
+Usage:
+    python -m benchmarks.bench_extract [--pages 50] [--repeat 3] [--workers 1]
+        [--corpus DIR]
+"""
+import argparse
+import json
+import os
+import tempfile
+import textwrap
+import time
+from typing import Dict, List, Optional
+from benchmarks.synthetic import build_pdf, make_page_texts
+from pdf_processor import EXTRACTORS, get_extractor, iter_pages
+
+# Characters per line of the two-column fixture, so lines fit in a column
+_COLUMN_LINE_CHARS = 40
+
+def make_fixtures(directory: str, pages: int) -> Dict[str, Dict]:
+    """
+    Write the synthetic fixture corpus.
+
+    Args:
+        directory (str): Directory receiving the PDF files
+        pages (int): Pages per fixture
+
+    Returns:
+        Dict[str, Dict]: {'path', 'lines'} per fixture name, where 'lines'
+            holds the expected text lines of each page for the two-column
+            fixture and None otherwise
+    """
+    texts = make_page_texts(pages)
+    column_texts = [
+        '\n'.join(textwrap.wrap(' '.join(text.split('\n')), _COLUMN_LINE_CHARS))
+        for text in texts
+    ]
+    fixtures = {
+        'plain': (build_pdf(texts), None),
+        'kerned': (build_pdf(texts, kerned=True), None),
+        'two_column': (build_pdf(column_texts, columns=2, kerned=True), column_texts)
+    }
+    corpus = {}
+    for name, (pdf, lines) in fixtures.items():
+        path = os.path.join(directory, f'{name}.pdf')
+        with open(path, 'wb') as output:
+            output.write(pdf)
+        corpus[name] = {'path': path, 'lines': lines and [text.split('\n') for text in lines]}
+    return corpus
+
+def in_order(page_texts: List[str], page_lines: List[List[str]]) -> float:
+    """
+    Measure how much of the extracted text follows the expected line order.
+
+    Args:
+        page_texts (List[str]): Extracted text of each page
+        page_lines (List[List[str]]): Expected lines of each page, in order
+
+    Returns:
+        float: Share of consecutive expected line pairs extracted adjacently
+    """
+    ordered = pairs = 0
+    for text, lines in zip(page_texts, page_lines):
+        # Compare whitespace-insensitively: backends space words differently
+        flat = ' '.join(text.split())
+        for before, after in zip(lines, lines[1:]):
+            pairs += 1
+            ordered += ' '.join((before + ' ' + after).split()) in flat
+    return ordered / pairs if pairs else 1.0
+
+def run(corpus: Dict[str, Dict], repeat: int, workers: int) -> List[Dict]:
+    """
+    Measure every backend on every fixture.
+
+    Args:
+        corpus (Dict[str, Dict]): {'path', 'lines'} per fixture name
+        repeat (int): Timed repetitions per measurement (the best is kept)
+        workers (int): Worker processes used for extraction
+
+    Returns:
+        List[Dict]: One result row per (fixture, backend) pair
+    """
+    results = []
+    for name, fixture in corpus.items():
+        for backend in sorted(EXTRACTORS):
+            row = {'fixture': name, 'backend': backend}
+            try:
+                get_extractor(backend)
+            except ImportError:
+                results.append(dict(row, available=False))
+                continue
+
+            best = float('inf')
+            texts: List[str] = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                texts = [text for _, text in iter_pages(fixture['path'], workers, backend)]
+                best = min(best, time.perf_counter() - start)
+            order: Optional[float] = None
+            if fixture['lines'] is not None:
+                order = round(in_order(texts, fixture['lines']), 3)
+            results.append(dict(
+                row,
+                available=True,
+                pages=len(texts),
+                pages_per_second=round(len(texts) / best, 1),
+                in_order=order
+            ))
+    return results
+
+def main() -> None:
+    """Run the benchmark and print the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--corpus', help='Directory of PDF files to measure instead of the synthetic fixtures')
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = {
+            name: {'path': os.path.join(args.corpus, name), 'lines': None}
+            for name in sorted(os.listdir(args.corpus)) if name.lower().endswith('.pdf')
+        }
+        print(json.dumps(run(corpus, args.repeat, args.workers), indent=2))
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        print(json.dumps(run(make_fixtures(directory, args.pages), args.repeat, args.workers), indent=2))
+
+if __name__ == '__main__':
+    main()
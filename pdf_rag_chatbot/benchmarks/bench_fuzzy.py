@@ -0,0 +1,115 @@
+"""
+Benchmark typo-tolerant relevance search against document size.
+
+Compares the original fallback, which ran an edit-distance comparison for
+every (focus word, sentence word) pair, with the fuzzy index lookup.
+
+Usage:
+    python -m benchmarks.bench_fuzzy [--sizes 100 1000 5000] [--repeat 5]
+"""
+import argparse
+import json
+import random
+import time
+from typing import Dict, List
+from nltk.metrics.distance import edit_distance
+from response_generator import _find_relevant_sentences
+from text_index import build_index
+
+def make_sentences(count: int, seed: int = 0) -> List[str]:
+    """
+    Generate synthetic sentences over a fixed pseudo-word vocabulary.
+
+    Args:
+        count (int): Number of sentences to generate
+        seed (int): Random seed for reproducible output
+
+    Returns:
+        List[str]: Generated sentences
+    """
+    rng = random.Random(seed)
+    vocabulary = [
+        ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 10)))
+        for _ in range(5000)
+    ]
+    return [
+        ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(8, 20))).capitalize() + '.'
+        for _ in range(count)
+    ]
+
+def legacy_fuzzy_match(focus: str, sentences: List[str]) -> List[str]:
+    """
+    Reference implementation of the original edit-distance fallback.
+
+    Args:
+        focus (str): Query focus
+        sentences (List[str]): Document sentences
+
+    Returns:
+        List[str]: Sentences containing a word within distance 2 of the focus
+    """
+    relevant = []
+    focus_words = set(focus.lower().split())
+    for sentence in sentences:
+        sentence_words = set(sentence.lower().split())
+        for focus_word in focus_words:
+            for sentence_word in sentence_words:
+                if edit_distance(focus_word, sentence_word) <= 2:
+                    relevant.append(sentence)
+                    break
+            if sentence in relevant:
+                break
+    return relevant
+
+def _time(func, repeat: int) -> float:
+    """Return the best wall time of repeat calls, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def run(sizes: List[int], repeat: int) -> List[Dict]:
+    """
+    Measure fuzzy query latency for each document size.
+
+    Args:
+        sizes (List[int]): Document sizes in sentences
+        repeat (int): Timed repetitions per measurement
+
+    Returns:
+        List[Dict]: One result row per size
+    """
+    results = []
+    for size in sizes:
+        sentences = make_sentences(size)
+        # A misspelling of a real document word with no exact hit
+        target = sentences[size // 2].split()[1]
+        focus = target[:-1] + ('x' if target[-1] != 'x' else 'y')
+
+        start = time.perf_counter()
+        index = build_index(sentences, fuzzy=True)
+        len(index['fuzzy'])  # Build the lazy fuzzy term index
+        build_ms = (time.perf_counter() - start) * 1000
+
+        results.append({
+            'sentences': size,
+            'index_build_ms': round(build_ms, 2),
+            'legacy_query_ms': round(_time(lambda: legacy_fuzzy_match(focus, sentences), 1), 2),
+            'indexed_query_ms': round(_time(
+                lambda: _find_relevant_sentences(focus, sentences, [], index), repeat
+            ), 3)
+        })
+    return results
+
+def main() -> None:
+    """Run the benchmark and print the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.repeat), indent=2))
+
+if __name__ == '__main__':
+    main()
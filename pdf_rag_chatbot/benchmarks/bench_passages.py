@@ -0,0 +1,128 @@
+"""
+Benchmark passage-first retrieval against sentence-level indexing.
+
+For each document size, reports the number of retrieval units and posting
+entries of the sentence index and the passage index, and the latency of
+ranking queries through each on the memory-mapped packed document, with
+the share of sentence-level top-k hits the passage route also returns.
+Synthetic pages have no topical locality, so that share is a lower bound:
+in real documents the sentences around an answer are about the same thing.
+
+Usage:
+    python -m benchmarks.bench_passages [--pages 100 1000 2500] [--queries 200] [--k 2]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Dict, List
+from benchmarks.synthetic import make_page_texts
+from doc_store import open_packed_document, write_packed_document
+from passages import build_passages
+from retrieval import rank_sentences
+from text_index import build_index, tokenize
+
+# Bytes per posting entry in the packed format: uint32 id and frequency
+_POSTING_BYTES = 8
+
+def make_queries(sentences: List[str], count: int, seed: int = 0) -> List[str]:
+    """
+    Draw query focuses of one to three words from the document's sentences.
+
+    Args:
+        sentences (List[str]): Document sentences
+        count (int): Number of queries
+        seed (int): Random seed for reproducible output
+
+    Returns:
+        List[str]: Query focuses
+    """
+    rng = random.Random(seed)
+    queries = []
+    while len(queries) < count:
+        words = tokenize(rng.choice(sentences))
+        if words:
+            queries.append(' '.join(rng.sample(words, min(len(words), rng.randint(1, 3)))))
+    return queries
+
+def _postings(index: Dict) -> int:
+    """Return the number of posting entries of an index."""
+    return sum(len(postings) for postings in index['postings'].values())
+
+def _mean_ms(func, queries: List[str]) -> float:
+    """Return the mean wall time of func over the queries, in milliseconds."""
+    start = time.perf_counter()
+    for query in queries:
+        func(query)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+def run(page_counts: List[int], query_count: int, k: int) -> List[Dict]:
+    """
+    Compare sentence-level and passage-first retrieval for each document size.
+
+    Args:
+        page_counts (List[int]): Document sizes in pages
+        query_count (int): Queries timed per document
+        k (int): Sentences requested per query
+
+    Returns:
+        List[Dict]: One result row per document size
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for pages in page_counts:
+            sentences = [line for text in make_page_texts(pages) for line in text.split('\n')]
+            index = build_index(sentences)
+            start = time.perf_counter()
+            passages = build_passages(index)
+            passages_ms = (time.perf_counter() - start) * 1000
+
+            path = os.path.join(directory, f'{pages}.pdoc')
+            write_packed_document(path, {
+                'sentences': sentences, 'keywords': [], 'entities': [], 'index': index, 'passages': passages
+            })
+            document = open_packed_document(path)
+            queries = make_queries(sentences, query_count)
+
+            def by_sentence(query):
+                return rank_sentences(query, document['sentences'], document['index'], limit=k)
+
+            def by_passage(query):
+                return rank_sentences(
+                    query, document['sentences'], document['index'], limit=k, passages=document['passages']
+                )
+
+            found = total = 0
+            for query in queries:
+                expected = {sentence_id for sentence_id, _ in by_sentence(query)}
+                found += len(expected & {sentence_id for sentence_id, _ in by_passage(query)})
+                total += len(expected)
+
+            results.append({
+                'pages': pages,
+                'sentences': len(sentences),
+                'passages': len(passages['bounds']),
+                'passage_build_ms': round(passages_ms, 2),
+                'sentence_postings_bytes': _postings(index) * _POSTING_BYTES,
+                'passage_postings_bytes': (
+                    _postings(passages['index']) * _POSTING_BYTES + len(passages['bounds']) * _POSTING_BYTES
+                ),
+                'sentence_query_ms': round(_mean_ms(by_sentence, queries), 3),
+                'passage_query_ms': round(_mean_ms(by_passage, queries), 3),
+                'top_k_overlap': round(found / total, 3) if total else None
+            })
+    return results
+
+def main() -> None:
+    """Run the benchmark and print the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--pages', type=int, nargs='+', default=[100, 1000, 2500])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=2)
+    args = parser.parse_args()
+    print(json.dumps(run(args.pages, args.queries, args.k), indent=2))
+
+if __name__ == '__main__':
+    main()
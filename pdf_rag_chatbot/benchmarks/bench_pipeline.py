@@ -0,0 +1,223 @@
+"""
+Benchmark the document and query pipeline on synthetic PDFs of growing size.
+
+For each page count, measures latency, throughput and peak traced memory of
+extract_text_from_pdf, process_text, analyze_query (uncached and cached) and
+generate_response. Results are printed as JSON and can be saved and passed
+back with --baseline to report the change of every latency run to run.
+
+Peak memory is measured in a separate, untimed call under tracemalloc, so
+it covers Python and NumPy allocations but not memory allocated directly by
+native extensions.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--pages 1 10 100] [--vocabulary 5000]
+        [--queries 20] [--repeat 3] [--output results.json] [--baseline old.json]
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+import nlp_processor
+from benchmarks.synthetic import build_pdf, make_page_texts, make_vocabulary
+from nlp_processor import analyze_query, pipeline_version, process_text, warm_up
+from pdf_processor import extract_text_from_pdf
+from response_generator import generate_response
+from text_index import build_index
+
+# Question templates for generated queries, filled with vocabulary words
+_QUERY_TEMPLATES = [
+    'What is {0}?',
+    'How does {0} relate to {1}?',
+    'Tell me about {0} and {1}',
+    'Where is the {0} {1} mentioned?'
+]
+
+def measure(func: Callable[[], object], repeat: int, units: int = 1) -> Dict:
+    """
+    Time a call and measure its peak traced memory.
+
+    Args:
+        func (Callable[[], object]): Call to measure
+        repeat (int): Timed repetitions
+        units (int): Work items handled per call (pages, sentences or
+            queries), used for throughput
+
+    Returns:
+        Dict: {'best_ms', 'mean_ms', 'per_second', 'peak_kib'}
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        'best_ms': round(best * 1000, 3),
+        'mean_ms': round(statistics.mean(timings) * 1000, 3),
+        'per_second': round(units / best, 1) if best else None,
+        'peak_kib': round(peak / 1024, 1)
+    }
+
+def make_queries(count: int, vocabulary_size: int, seed: int = 0) -> List[str]:
+    """
+    Generate questions about words of the synthetic vocabulary.
+
+    Args:
+        count (int): Number of queries
+        vocabulary_size (int): Vocabulary size used for the documents
+        seed (int): Random seed for reproducible output
+
+    Returns:
+        List[str]: Distinct query texts
+    """
+    rng = random.Random(seed)
+    # Mid-frequency words: present in the documents, but not in every sentence
+    vocabulary = make_vocabulary(vocabulary_size, seed)[10:200]
+    return [
+        rng.choice(_QUERY_TEMPLATES).format(*rng.sample(vocabulary, 2)) + f' ({number})'
+        for number in range(count)
+    ]
+
+def run(
+    page_counts: List[int],
+    vocabulary_size: int,
+    sentences_per_page: int,
+    query_count: int,
+    repeat: int,
+    seed: int = 0
+) -> List[Dict]:
+    """
+    Measure every pipeline stage for each document size.
+
+    Args:
+        page_counts (List[int]): Document sizes in pages
+        vocabulary_size (int): Number of distinct words in the documents
+        sentences_per_page (int): Sentences on each page
+        query_count (int): Queries per query-stage measurement
+        repeat (int): Timed repetitions per measurement
+        seed (int): Random seed for reproducible documents and queries
+
+    Returns:
+        List[Dict]: One result row per document size
+    """
+    queries = make_queries(query_count, vocabulary_size, seed)
+    results = []
+    for pages in page_counts:
+        data = build_pdf(make_page_texts(pages, vocabulary_size, sentences_per_page, seed))
+        text = extract_text_from_pdf(data)
+        processed = process_text(text)
+        # Indexed as at ingestion, so the first timed query does not build it
+        processed['index'] = build_index(processed['sentences'], fuzzy=True)
+        len(processed['index']['fuzzy'])
+        analyses = [analyze_query(query) for query in queries]
+
+        def analyze_uncached() -> None:
+            nlp_processor._query_cache.clear()
+            for query in queries:
+                analyze_query(query)
+
+        results.append({
+            'pages': pages,
+            'pdf_bytes': len(data),
+            'sentences': len(processed['sentences']),
+            'extract_text_from_pdf': measure(lambda: extract_text_from_pdf(data), repeat, pages),
+            'process_text': measure(
+                lambda: process_text(text), repeat, len(processed['sentences'])
+            ),
+            'analyze_query': measure(analyze_uncached, repeat, len(queries)),
+            'analyze_query_cached': measure(
+                lambda: [analyze_query(query) for query in queries], repeat, len(queries)
+            ),
+            'generate_response': measure(
+                lambda: [generate_response(analysis, processed) for analysis in analyses],
+                repeat,
+                len(analyses)
+            )
+        })
+    return results
+
+def compare(results: List[Dict], baseline: List[Dict]) -> List[Dict]:
+    """
+    Compare best latencies with a previous run.
+
+    Args:
+        results (List[Dict]): Rows returned by run
+        baseline (List[Dict]): Rows of an earlier run
+
+    Returns:
+        List[Dict]: Per page count, the ratio of each stage's best latency to
+            the baseline's (above 1.0 is slower)
+    """
+    previous = {row['pages']: row for row in baseline}
+    changes = []
+    for row in results:
+        old = previous.get(row['pages'])
+        if old is None:
+            continue
+        changes.append({
+            'pages': row['pages'],
+            **{
+                stage: round(value['best_ms'] / old[stage]['best_ms'], 3)
+                for stage, value in row.items()
+                if isinstance(value, dict) and stage in old and old[stage]['best_ms']
+            }
+        })
+    return changes
+
+def main() -> None:
+    """Run the benchmark and print the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--vocabulary', type=int, default=5000)
+    parser.add_argument('--sentences-per-page', type=int, default=20)
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Also write the results to this file')
+    parser.add_argument('--baseline', help='Results file of an earlier run to compare with')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    warm_up()
+    report: Dict = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pipeline_version': pipeline_version(),
+        'warm_up_ms': round((time.perf_counter() - start) * 1000, 2),
+        'parameters': {
+            'vocabulary': args.vocabulary,
+            'sentences_per_page': args.sentences_per_page,
+            'queries': args.queries,
+            'repeat': args.repeat,
+            'seed': args.seed
+        },
+        'results': run(
+            args.pages, args.vocabulary, args.sentences_per_page, args.queries, args.repeat, args.seed
+        )
+    }
+    if args.baseline:
+        with open(args.baseline) as handle:
+            report['change'] = compare(report['results'], json.load(handle)['results'])
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            handle.write(output + '\n')
+    print(output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark NLP processor startup cost.
+
+Each measurement runs in a fresh interpreter so module caches do not carry
+over. Importing nlp_processor no longer loads any model; the cost moves to
+warm_up(), which a pre-fork server pays once in its master process.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat 3]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, List
+
+_PROBE = '''
+import json, time
+start = time.perf_counter()
+import nlp_processor
+imported = time.perf_counter()
+nlp_processor.warm_up()
+warmed = time.perf_counter()
+nlp_processor.analyze_query('What is the warranty period?')
+queried = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'warm_up_ms': (warmed - imported) * 1000,
+    'first_query_ms': (queried - warmed) * 1000
+}))
+'''
+
+def run(repeat: int) -> List[Dict]:
+    """
+    Measure import, warm-up and first query latency in fresh interpreters.
+
+    Args:
+        repeat (int): Number of interpreter launches
+
+    Returns:
+        List[Dict]: One timing row per launch
+    """
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE], capture_output=True, text=True, check=True
+        ).stdout
+        row = json.loads(output.strip().splitlines()[-1])
+        results.append({stage: round(ms, 2) for stage, ms in row.items()})
+    return results
+
+def main() -> None:
+    """Run the benchmark and print the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args.repeat), indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""
+Synthetic PDF corpus generator for benchmarks and tests.
+
+Documents are built locally from a seeded pseudo-word vocabulary with a
+Zipf-like word distribution, so runs are reproducible and need no sample
+files or network access.
+
+Usage:
+    python -m benchmarks.synthetic OUTPUT_DIR [--pages 1 10 100] [--vocabulary 5000]
+"""
+import argparse
+import json
+import os
+import random
+from typing import List
+
+# Characters used for pseudo-words
+_ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+
+# Text layout of generated pages, in points
+_FONT_SIZE = 10
+_LEADING = 12
+_TOP = 760
+_MARGIN = 72
+_PAGE_WIDTH = 612
+
+def make_vocabulary(size: int, seed: int = 0) -> List[str]:
+    """
+    Generate distinct pronounceable-length pseudo-words.
+
+    Args:
+        size (int): Number of words
+        seed (int): Random seed for reproducible output
+
+    Returns:
+        List[str]: Words, most frequent first when sampled by make_page_texts
+    """
+    rng = random.Random(seed)
+    words = []
+    seen = set()
+    while len(words) < size:
+        word = ''.join(rng.choice(_ALPHABET) for _ in range(rng.randint(3, 10)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+def make_page_texts(
+    pages: int,
+    vocabulary_size: int = 5000,
+    sentences_per_page: int = 20,
+    seed: int = 0
+) -> List[str]:
+    """
+    Generate page texts of sentences drawn from a synthetic vocabulary.
+
+    Word frequencies follow a 1/rank distribution, like natural text, so
+    posting list lengths and keyword counts resemble a real document. Each
+    sentence is one line of its page.
+
+    Args:
+        pages (int): Number of pages
+        vocabulary_size (int): Number of distinct words
+        sentences_per_page (int): Sentences on each page
+        seed (int): Random seed for reproducible output
+
+    Returns:
+        List[str]: One newline-separated text per page
+    """
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(vocabulary_size, seed)
+    weights = [1.0 / rank for rank in range(1, vocabulary_size + 1)]
+    texts = []
+    for _ in range(pages):
+        lines = []
+        for _ in range(sentences_per_page):
+            words = rng.choices(vocabulary, weights, k=rng.randint(6, 16))
+            lines.append(' '.join(words).capitalize() + '.')
+        texts.append('\n'.join(lines))
+    return texts
+
+def build_pdf(page_texts: List[str], columns: int = 1, kerned: bool = False) -> bytes:
+    """
+    Build a minimal PDF document with the given text on each page.
+
+    Lines of a page text (separated by newlines) become separate text lines,
+    so extraction returns them on separate lines as well. With several
+    columns, a page's lines are split into consecutive groups, one per
+    column, and written row by row across the columns, as some layout tools
+    do: content stream order then interleaves the columns.
+
+    Kerned text writes every word as two pieces with a kerning adjustment
+    between them, as typeset documents do, which makes content streams
+    several times longer to interpret than plain strings.
+
+    Args:
+        page_texts (List[str]): Text to place on each page
+        columns (int): Number of text columns per page
+        kerned (bool): Write kerned text
+
+    Returns:
+        bytes: Encoded PDF document
+    """
+    page_count = len(page_texts)
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        ('<< /Type /Pages /Kids [%s] /Count %d >>' % (
+            ' '.join('%d 0 R' % (4 + 2 * i) for i in range(page_count)), page_count
+        )).encode(),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'
+    ]
+    for i, text in enumerate(page_texts):
+        if columns > 1:
+            stream = _column_stream(text, columns, kerned)
+        else:
+            stream = _line_stream(text, kerned)
+        stream = stream.encode('latin-1')
+        objects.append((
+            '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            '/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (5 + 2 * i)
+        ).encode())
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref_offset = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+        len(objects) + 1, xref_offset
+    )
+    return bytes(output)
+
+def _show(line: str, kerned: bool) -> str:
+    """Text-showing operator for one line."""
+    if not kerned:
+        return '(%s) Tj' % _escape(line)
+    pieces = []
+    for word in line.split(' '):
+        middle = len(word) // 2 or 1
+        pieces.append('(%s)-20(%s)' % (_escape(word[:middle]), _escape(word[middle:] + ' ')))
+    return '[%s] TJ' % ''.join(pieces)
+
+def _escape(line: str) -> str:
+    """Escape a line for use in a PDF string literal."""
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+def _line_stream(text: str, kerned: bool) -> str:
+    """Content stream writing the lines of a text one below the other."""
+    lines = [_show(line, kerned) for line in text.split('\n')]
+    return 'BT /F1 %d Tf %d TL 72 %d Td %s ET' % (_FONT_SIZE, _LEADING, _TOP, ' T* '.join(lines))
+
+def _column_stream(text: str, columns: int, kerned: bool) -> str:
+    """Content stream laying out the lines of a text in columns, row by row."""
+    lines = text.split('\n')
+    per_column = -(-len(lines) // columns)
+    width = (_PAGE_WIDTH - 2 * _MARGIN) / columns
+    operators = []
+    for row in range(per_column):
+        for column in range(columns):
+            position = column * per_column + row
+            if position < len(lines):
+                operators.append('1 0 0 1 %d %d Tm %s' % (
+                    _MARGIN + column * width, _TOP - row * _LEADING, _show(lines[position], kerned)
+                ))
+    return 'BT /F1 %d Tf %s ET' % (_FONT_SIZE, ' '.join(operators))
+
+def main() -> None:
+    """Write one synthetic PDF per page count and print their paths as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('output_dir')
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--vocabulary', type=int, default=5000)
+    parser.add_argument('--sentences-per-page', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    paths = []
+    for pages in args.pages:
+        path = os.path.join(args.output_dir, f'synthetic_{pages}p.pdf')
+        with open(path, 'wb') as output:
+            output.write(build_pdf(make_page_texts(
+                pages, args.vocabulary, args.sentences_per_page, args.seed
+            )))
+        paths.append(path)
+    print(json.dumps(paths, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""In-memory caching utilities shared by the chatbot's processing stages."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# PUBLIC_INTERFACE
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with optional time-to-live.
+
+    Entries beyond maxsize evict the least recently used entry; entries older
+    than ttl seconds are treated as missing. Hit and miss counts are kept for
+    monitoring.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries
+            ttl (Optional[float]): Entry lifetime in seconds, or None to keep
+                entries until evicted
+            on_evict (Optional[Callable[[Hashable, Any], None]]): Called with
+                the key and value of each entry evicted to make room, outside
+                the cache lock; not called for expired or popped entries
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up an entry and mark it as recently used.
+
+        Args:
+            key (Hashable): Entry key
+            default (Any): Value returned on a miss
+
+        Returns:
+            Any: The cached value, or default if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store an entry, evicting the least recently used ones if full.
+
+        Args:
+            key (Hashable): Entry key
+            value (Any): Value to cache
+        """
+        evicted = []
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                evicted.append(self._entries.popitem(last=False))
+        if self.on_evict is not None:
+            for evicted_key, (evicted_value, _) in evicted:
+                self.on_evict(evicted_key, evicted_value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove an entry.
+
+        Args:
+            key (Hashable): Entry key
+            default (Any): Value returned if the entry is missing
+
+        Returns:
+            Any: The removed value, or default
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        """Remove every entry and reset the hit and miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report cache usage.
+
+        Returns:
+            Dict[str, int]: Counters
+                {
+                    'hits': Number of lookups served from the cache,
+                    'misses': Number of lookups not found or expired,
+                    'size': Number of entries currently held
+                }
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+    def __len__(self) -> int:
+        """Return the number of entries currently held."""
+        return len(self._entries)
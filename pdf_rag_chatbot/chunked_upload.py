@@ -0,0 +1,349 @@
+"""Resumable chunked uploads streamed to disk with incremental hashing."""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, BinaryIO, Dict, Optional, Set, Tuple
+
+# Default upper bound on the size of one uploaded file
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Incomplete uploads and completed files are deleted this long after creation
+DEFAULT_UPLOAD_TTL = 24 * 3600.0  # seconds
+
+# Request bodies are copied to disk in blocks of this size
+BLOCK_SIZE = 1024 * 1024
+
+# Every accepted upload must start with the PDF header
+PDF_HEADER = b'%PDF-'
+
+_UPLOAD_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+class UploadError(Exception):
+    """Raised when an upload request cannot be accepted."""
+
+class OffsetMismatchError(UploadError):
+    """Raised when a chunk does not start where the upload left off."""
+
+    def __init__(self, offset: int):
+        """
+        Initialize the error.
+
+        Args:
+            offset (int): Number of bytes the server holds, where the next
+                chunk has to start
+        """
+        super().__init__(f'Upload continues at offset {offset}')
+        self.offset = offset
+
+# PUBLIC_INTERFACE
+class ChunkedUploads:
+    """
+    Store of resumable uploads, each written to disk as its chunks arrive.
+
+    An upload is created with its declared size, then filled by appending
+    chunks at the current offset; the received byte count is the size of
+    the partial file, so after a dropped connection the client asks for the
+    offset and resends from there, through any worker process sharing the
+    directory. Bytes are hashed as they are written, so the SHA-256 content
+    address is ready as soon as the last chunk arrives; a worker that did
+    not receive the earlier chunks re-hashes the partial file once instead.
+    Chunks of one upload are expected one at a time; a concurrent chunk in
+    the same process is rejected.
+
+    Files in the directory, per upload id:
+        <id>.json: Upload metadata
+        <id>.part: Bytes received so far
+        <id>.pdf: The complete file, renamed from <id>.part
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = DEFAULT_UPLOAD_TTL
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            directory (str): Directory holding partial and completed uploads
+            max_bytes (int): Largest accepted file size
+            ttl (float): Seconds after creation before an upload is deleted
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._hashers: Dict[str, Tuple[int, Any]] = {}
+        self._busy: Set[str] = set()
+        os.makedirs(directory, exist_ok=True)
+
+    def create(self, filename: str, size: int, sha256: Optional[str] = None) -> Dict:
+        """
+        Start an upload.
+
+        Args:
+            filename (str): Name of the uploaded file
+            size (int): Size of the complete file in bytes
+            sha256 (Optional[str]): Expected hex digest, checked on completion
+
+        Returns:
+            Dict: Upload status (see status)
+
+        Raises:
+            UploadError: If the size is out of range or the digest malformed
+        """
+        if not isinstance(size, int) or size <= 0:
+            raise UploadError('Upload size must be a positive number of bytes')
+        if size > self.max_bytes:
+            raise UploadError(f'Upload size exceeds the limit of {self.max_bytes} bytes')
+        if sha256 is not None and not re.match(r'^[0-9a-fA-F]{64}$', sha256):
+            raise UploadError('sha256 must be a hex-encoded SHA-256 digest')
+
+        self._purge_expired()
+        upload_id = uuid.uuid4().hex
+        metadata = {
+            'id': upload_id,
+            'filename': filename,
+            'size': size,
+            'sha256': sha256.lower() if sha256 else None,
+            'created': time.time(),
+            'document_id': None
+        }
+        open(self._path(upload_id, '.part'), 'wb').close()
+        self._write_metadata(metadata)
+        return self.status(upload_id)
+
+    def status(self, upload_id: str) -> Optional[Dict]:
+        """
+        Describe an upload.
+
+        Args:
+            upload_id (str): Id returned by create
+
+        Returns:
+            Optional[Dict]: None if unknown or expired, otherwise
+                {
+                    'id', 'filename', 'size', 'sha256', 'created': As created,
+                    'offset': Bytes received, where the next chunk starts,
+                    'complete': Whether every byte has been received,
+                    'document_id': Content hash once complete,
+                    'path': Path of the complete file once complete
+                }
+        """
+        metadata = self._read_metadata(upload_id)
+        if metadata is None:
+            return None
+        complete = metadata['document_id'] is not None
+        if complete:
+            offset = metadata['size']
+        else:
+            try:
+                offset = os.path.getsize(self._path(upload_id, '.part'))
+            except OSError:
+                return None
+        return dict(
+            metadata,
+            offset=offset,
+            complete=complete,
+            path=self._path(upload_id, '.pdf') if complete else None
+        )
+
+    def append(self, upload_id: str, offset: int, stream: BinaryIO) -> Dict:
+        """
+        Write a chunk read from a stream at the end of an upload.
+
+        The stream is copied to disk in blocks, so a chunk is never held in
+        memory whole; if the stream breaks off, the bytes already written
+        stay and the upload resumes after them. The file is completed and
+        its digest checked once the declared size is reached.
+
+        Args:
+            upload_id (str): Id returned by create
+            offset (int): Offset the chunk starts at, which must be the
+                current offset of the upload
+            stream (BinaryIO): Chunk contents
+
+        Returns:
+            Dict: Upload status after the chunk (see status)
+
+        Raises:
+            KeyError: If the upload is unknown or expired
+            OffsetMismatchError: If offset is not the current offset
+            UploadError: If the chunk runs past the declared size, the file
+                is not a PDF, the digest does not match or another request
+                is writing to the upload
+        """
+        with self._lock:
+            if upload_id in self._busy:
+                raise UploadError('Another chunk of this upload is being received')
+            self._busy.add(upload_id)
+        try:
+            return self._append(upload_id, offset, stream)
+        finally:
+            with self._lock:
+                self._busy.discard(upload_id)
+
+    def discard(self, upload_id: str) -> bool:
+        """
+        Delete an upload and its files.
+
+        Args:
+            upload_id (str): Id returned by create
+
+        Returns:
+            bool: True if the upload existed
+        """
+        if self._read_metadata(upload_id) is None:
+            return False
+        with self._lock:
+            self._hashers.pop(upload_id, None)
+        for suffix in ('.part', '.pdf', '.json'):
+            try:
+                os.remove(self._path(upload_id, suffix))
+            except OSError:
+                pass
+        return True
+
+    def _append(self, upload_id: str, offset: int, stream: BinaryIO) -> Dict:
+        """Write a chunk while holding the upload (see append)."""
+        status = self.status(upload_id)
+        if status is None:
+            raise KeyError(upload_id)
+        if status['complete'] or offset != status['offset']:
+            raise OffsetMismatchError(status['offset'])
+
+        received, hasher = self._hasher(upload_id, offset)
+        remaining = status['size'] - offset
+        try:
+            with open(self._path(upload_id, '.part'), 'ab') as output:
+                while True:
+                    block = stream.read(BLOCK_SIZE)
+                    if not block:
+                        break
+                    if len(block) > remaining:
+                        raise UploadError('Chunk runs past the declared upload size')
+                    if received < len(PDF_HEADER):
+                        head = (bytes(self._head(upload_id, received)) + block)[:len(PDF_HEADER)]
+                        if not PDF_HEADER.startswith(head):
+                            self.discard(upload_id)
+                            raise UploadError('File is not a PDF')
+                    output.write(block)
+                    hasher.update(block)
+                    received += len(block)
+                    remaining -= len(block)
+        finally:
+            with self._lock:
+                if os.path.exists(self._path(upload_id, '.json')):
+                    self._hashers[upload_id] = (received, hasher)
+
+        if remaining == 0:
+            self._complete(status, hasher.hexdigest())
+        return self.status(upload_id)
+
+    def _complete(self, metadata: Dict, digest: str) -> None:
+        """
+        Finish an upload whose last byte has arrived.
+
+        Args:
+            metadata (Dict): Upload status
+            digest (str): SHA-256 of the received bytes
+
+        Raises:
+            UploadError: If the digest differs from the declared one
+        """
+        upload_id = metadata['id']
+        with self._lock:
+            self._hashers.pop(upload_id, None)
+        if metadata['sha256'] and metadata['sha256'] != digest:
+            self.discard(upload_id)
+            raise UploadError('Uploaded bytes do not match the declared sha256')
+        os.replace(self._path(upload_id, '.part'), self._path(upload_id, '.pdf'))
+        self._write_metadata(dict(
+            {key: metadata[key] for key in ('id', 'filename', 'size', 'sha256', 'created')},
+            document_id=digest
+        ))
+
+    def _hasher(self, upload_id: str, offset: int) -> Tuple[int, Any]:
+        """
+        Get the running hash of an upload's first offset bytes.
+
+        Args:
+            upload_id (str): Upload id
+            offset (int): Bytes received so far
+
+        Returns:
+            Tuple[int, Any]: offset and the hash covering those bytes;
+                rebuilt from the partial file when this process's hash is
+                missing or out of step
+        """
+        with self._lock:
+            cached = self._hashers.pop(upload_id, None)
+        if cached is not None and cached[0] == offset:
+            return cached
+        hasher = hashlib.sha256()
+        with open(self._path(upload_id, '.part'), 'rb') as handle:
+            remaining = offset
+            while remaining:
+                block = handle.read(min(BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                hasher.update(block)
+                remaining -= len(block)
+        return offset, hasher
+
+    def _head(self, upload_id: str, received: int) -> bytes:
+        """Read the first bytes of a partial upload."""
+        if not received:
+            return b''
+        with open(self._path(upload_id, '.part'), 'rb') as handle:
+            return handle.read(received)
+
+    def _path(self, upload_id: str, suffix: str) -> str:
+        """
+        Return the path of one of an upload's files.
+
+        Raises:
+            KeyError: If upload_id is not an id made by create
+        """
+        if not _UPLOAD_ID_PATTERN.match(upload_id):
+            raise KeyError(upload_id)
+        return os.path.join(self.directory, upload_id + suffix)
+
+    def _read_metadata(self, upload_id: str) -> Optional[Dict]:
+        """Load an upload's metadata, or None if unknown, malformed or expired."""
+        try:
+            with open(self._path(upload_id, '.json')) as handle:
+                metadata = json.load(handle)
+        except (KeyError, OSError, ValueError):
+            return None
+        if time.time() - metadata['created'] > self.ttl:
+            return None
+        return metadata
+
+    def _write_metadata(self, metadata: Dict) -> None:
+        """Atomically write an upload's metadata."""
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(handle, 'w') as temp_file:
+            json.dump(metadata, temp_file)
+        os.replace(temp_path, self._path(metadata['id'], '.json'))
+
+    def _purge_expired(self) -> None:
+        """Delete the files of uploads created more than ttl seconds ago."""
+        cutoff = time.time() - self.ttl
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff and os.path.splitext(name)[1] in {'.json', '.part', '.pdf', '.tmp'}:
+                    os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,393 @@
+"""Compact columnar storage for processed documents, loadable via mmap."""
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from passages import build_passages
+from text_index import build_index
+
+# File layout: magic, format version, header length, JSON header, then
+# 8-byte aligned sections described by the header
+_MAGIC = b'PDOC'
+_FORMAT_VERSION = 2
+# Version 1 files lack sentence offsets and passages, which are then
+# computed when the document is loaded
+_READABLE_VERSIONS = (1, 2)
+_PREAMBLE = struct.Struct('<4sII')
+_ALIGNMENT = 8
+
+# PUBLIC_INTERFACE
+def write_packed_document(
+    path: str,
+    processed: Dict,
+    metadata: Optional[Dict] = None
+) -> None:
+    """
+    Write a processed document in the packed columnar format.
+
+    Sentences and entities become one concatenated UTF-8 buffer each with an
+    offsets array; keywords and index terms are interned into one sorted term
+    table and referenced by integer id; the sentence and passage indexes are
+    stored as flat posting arrays over that table, and passages as sentence
+    id ranges, so nothing needs rebuilding when the file is reopened.
+
+    Args:
+        path (str): Destination file path
+        processed (Dict): Processed document with 'sentences', 'keywords' and
+            'entities', and optionally 'pages', 'offsets', an inverted
+            'index' and 'passages'
+        metadata (Optional[Dict]): JSON-serialisable values stored in the
+            header, such as the document name
+    """
+    sentences = list(processed['sentences'])
+    index = processed.get('index') or build_index(sentences)
+    passages = processed.get('passages') or build_passages(index)
+    pages = list(processed.get('pages') or [])
+    offsets = list(processed.get('offsets') or [])
+    postings = index['postings']
+
+    terms = sorted(set(postings) | set(processed['keywords']))
+    term_ids = {term: term_id for term_id, term in enumerate(terms)}
+    posting_offsets, posting_ids, posting_frequencies = _encode_postings(terms, postings)
+    passage_offsets, passage_ids, passage_frequencies = _encode_postings(terms, passages['index']['postings'])
+
+    sentence_data, sentence_offsets = _encode_strings(sentences)
+    term_data, term_offsets = _encode_strings(terms)
+    entity_data, entity_offsets = _encode_strings(processed['entities'])
+    sections = [
+        ('sentence_data', sentence_data, 'B'),
+        ('sentence_offsets', sentence_offsets, 'Q'),
+        ('sentence_pages', array('I', (page or 0 for page in pages)), 'I'),
+        ('sentence_starts', array('I', (0 if offset is None else offset + 1 for offset in offsets)), 'I'),
+        ('sentence_lengths', array('I', index['lengths']), 'I'),
+        ('term_data', term_data, 'B'),
+        ('term_offsets', term_offsets, 'Q'),
+        ('keyword_ids', array('I', (term_ids[keyword] for keyword in processed['keywords'])), 'I'),
+        ('posting_offsets', posting_offsets, 'Q'),
+        ('posting_ids', posting_ids, 'I'),
+        ('posting_frequencies', posting_frequencies, 'I'),
+        ('passage_bounds', array('I', (bound for bounds in passages['bounds'] for bound in bounds)), 'I'),
+        ('passage_lengths', array('I', passages['index']['lengths']), 'I'),
+        ('passage_posting_offsets', passage_offsets, 'Q'),
+        ('passage_posting_ids', passage_ids, 'I'),
+        ('passage_posting_frequencies', passage_frequencies, 'I'),
+        ('entity_data', entity_data, 'B'),
+        ('entity_offsets', entity_offsets, 'Q')
+    ]
+
+    # Section offsets are relative to the aligned end of the header
+    header = {
+        'metadata': metadata or {},
+        'size': index['size'],
+        'avg_length': index['avg_length'],
+        'passages': {
+            'size': passages['index']['size'],
+            'avg_length': passages['index']['avg_length']
+        },
+        'sections': {}
+    }
+    payloads = []
+    position = 0
+    for name, values, typecode in sections:
+        payload = bytes(values) if typecode == 'B' else values.tobytes()
+        header['sections'][name] = [position, len(payload), typecode]
+        payloads.append((position, payload))
+        position = _align(position + len(payload))
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    body_start = _align(_PREAMBLE.size + len(header_bytes))
+    # A temporary file of its own, so processes writing the same document
+    # at once never interleave their bytes
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as temp_file:
+            temp_file.write(_PREAMBLE.pack(_MAGIC, _FORMAT_VERSION, len(header_bytes)))
+            temp_file.write(header_bytes)
+            for offset, payload in payloads:
+                temp_file.write(b'\0' * (body_start + offset - temp_file.tell()))
+                temp_file.write(payload)
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+# PUBLIC_INTERFACE
+def open_packed_document(path: str) -> Optional['PackedDocument']:
+    """
+    Open a packed document with its file memory-mapped.
+
+    Args:
+        path (str): Path written by write_packed_document
+
+    Returns:
+        Optional[PackedDocument]: The document, or None if the file is
+            missing or not in the packed format
+    """
+    try:
+        with open(path, 'rb') as handle:
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(buffer) < _PREAMBLE.size:
+        return None
+    magic, version, header_length = _PREAMBLE.unpack_from(buffer)
+    if magic != _MAGIC or version not in _READABLE_VERSIONS:
+        return None
+    try:
+        header = json.loads(buffer[_PREAMBLE.size:_PREAMBLE.size + header_length])
+    except ValueError:
+        return None
+    return PackedDocument(buffer, header, _align(_PREAMBLE.size + header_length))
+
+# PUBLIC_INTERFACE
+class PackedDocument(Mapping):
+    """
+    Read-only, memory-mapped view of a packed processed document.
+
+    Behaves as the processed-document mapping used elsewhere ('sentences',
+    'keywords', 'entities', 'pages', 'index', and 'offsets' and 'passages'
+    unless written in version 1 of the format), so generate_response, the
+    retrieval stages and the corpus can use it directly. Columns decode
+    individual strings on access from zero-copy slices of the mapped file.
+    """
+
+    def __init__(self, buffer, header: Dict, body_start: int):
+        """
+        Initialize the view.
+
+        Args:
+            buffer: Mapped file contents
+            header (Dict): Parsed file header
+            body_start (int): File position the section offsets are relative to
+        """
+        self.metadata = header['metadata']
+        self._buffer = buffer
+        view = memoryview(buffer)[body_start:]
+        columns = {
+            name: view[offset:offset + length].cast(typecode)
+            for name, (offset, length, typecode) in header['sections'].items()
+        }
+        self._terms = _StringColumn(columns['term_data'], columns['term_offsets'])
+        self._fields = {
+            'sentences': _StringColumn(columns['sentence_data'], columns['sentence_offsets']),
+            'keywords': _TermColumn(self._terms, columns['keyword_ids']),
+            'entities': _StringColumn(columns['entity_data'], columns['entity_offsets']),
+            'pages': _PageColumn(columns['sentence_pages']),
+            'index': {
+                'postings': _PostingsView(
+                    self._terms,
+                    columns['posting_offsets'],
+                    columns['posting_ids'],
+                    columns['posting_frequencies']
+                ),
+                'lengths': columns['sentence_lengths'],
+                'avg_length': header['avg_length'],
+                'size': header['size']
+            }
+        }
+        if 'passages' in header:
+            self._fields['offsets'] = _OffsetColumn(columns['sentence_starts'])
+            self._fields['passages'] = {
+                'bounds': _BoundsColumn(columns['passage_bounds']),
+                'index': {
+                    'postings': _PostingsView(
+                        self._terms,
+                        columns['passage_posting_offsets'],
+                        columns['passage_posting_ids'],
+                        columns['passage_posting_frequencies']
+                    ),
+                    'lengths': columns['passage_lengths'],
+                    'avg_length': header['passages']['avg_length'],
+                    'size': header['passages']['size']
+                }
+            }
+
+    def __getitem__(self, key: str):
+        """Return a document field."""
+        return self._fields[key]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the field names."""
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        """Return the number of fields."""
+        return len(self._fields)
+
+class _StringColumn(Sequence):
+    """Sequence of strings stored as one UTF-8 buffer and an offsets array."""
+
+    def __init__(self, data: memoryview, offsets: memoryview):
+        self._data = data
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return max(len(self._offsets) - 1, 0)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError('string column index out of range')
+        return str(self._data[self._offsets[position]:self._offsets[position + 1]], 'utf-8')
+
+    def find(self, value: str) -> int:
+        """
+        Binary-search a sorted column for a value.
+
+        Args:
+            value (str): String to find
+
+        Returns:
+            int: Position of the value, or -1 if absent
+        """
+        target = value.encode('utf-8')
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            probe = self._data[self._offsets[middle]:self._offsets[middle + 1]]
+            if probe == target:
+                return middle
+            if bytes(probe) < target:
+                low = middle + 1
+            else:
+                high = middle
+        return -1
+
+class _TermColumn(Sequence):
+    """Sequence of interned terms referenced by id."""
+
+    def __init__(self, terms: _StringColumn, term_ids: memoryview):
+        self._terms = terms
+        self._term_ids = term_ids
+
+    def __len__(self) -> int:
+        return len(self._term_ids)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        return self._terms[self._term_ids[position]]
+
+class _PageColumn(Sequence):
+    """Sentence page numbers, with 0 stored for unknown pages."""
+
+    def __init__(self, pages: memoryview):
+        self._pages = pages
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        return self._pages[position] or None
+
+class _OffsetColumn(Sequence):
+    """Sentence character offsets, stored plus one with 0 for unknown offsets."""
+
+    def __init__(self, offsets: memoryview):
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        value = self._offsets[position]
+        return value - 1 if value else None
+
+class _BoundsColumn(Sequence):
+    """Passage sentence ranges stored as flat (start, stop) pairs."""
+
+    def __init__(self, bounds: memoryview):
+        self._bounds = bounds
+
+    def __len__(self) -> int:
+        return len(self._bounds) // 2
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError('bounds column index out of range')
+        return self._bounds[2 * position], self._bounds[2 * position + 1]
+
+class _PostingsView(Mapping):
+    """Term to posting-list mapping over the flat posting arrays."""
+
+    def __init__(self, terms: _StringColumn, offsets: memoryview, ids: memoryview, frequencies: memoryview):
+        self._terms = terms
+        self._offsets = offsets
+        self._ids = ids
+        self._frequencies = frequencies
+
+    def __getitem__(self, term: str) -> List[Tuple[int, int]]:
+        term_id = self._terms.find(term)
+        if term_id < 0:
+            raise KeyError(term)
+        start, stop = self._offsets[term_id], self._offsets[term_id + 1]
+        if start == stop:
+            raise KeyError(term)  # a keyword that never occurs in a sentence
+        return list(zip(self._ids[start:stop], self._frequencies[start:stop]))
+
+    def __iter__(self) -> Iterator[str]:
+        for term_id, term in enumerate(self._terms):
+            if self._offsets[term_id] != self._offsets[term_id + 1]:
+                yield term
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+def _encode_postings(terms: List[str], postings: Mapping) -> Tuple[array, array, array]:
+    """
+    Flatten posting lists in term table order.
+
+    Args:
+        terms (List[str]): Sorted term table
+        postings (Mapping): Term to list of (id, term frequency)
+
+    Returns:
+        Tuple[array, array, array]: len(terms) + 1 offsets into the id and
+            frequency arrays, the ids and the frequencies
+    """
+    offsets = array('Q', [0])
+    ids = array('I')
+    frequencies = array('I')
+    for term in terms:
+        for posting_id, frequency in postings.get(term, ()):
+            ids.append(posting_id)
+            frequencies.append(frequency)
+        offsets.append(len(ids))
+    return offsets, ids, frequencies
+
+def _encode_strings(values: Iterable[str]) -> Tuple[bytearray, array]:
+    """
+    Concatenate strings into one UTF-8 buffer with an offsets array.
+
+    Args:
+        values (Iterable[str]): Strings to encode
+
+    Returns:
+        Tuple[bytearray, array]: The buffer and len(values) + 1 byte offsets
+    """
+    data = bytearray()
+    offsets = array('Q', [0])
+    for value in values:
+        data += value.encode('utf-8')
+        offsets.append(len(data))
+    return data, offsets
+
+def _align(position: int) -> int:
+    """Round a file position up to the section alignment."""
+    return -(-position // _ALIGNMENT) * _ALIGNMENT
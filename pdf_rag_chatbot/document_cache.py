@@ -0,0 +1,166 @@
+"""Content-addressed on-disk cache for extracted and processed PDF documents."""
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from typing import Dict, Optional
+
+# Default upper bound on the total size of cached entries
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_ENTRY_SUFFIX = '.json.z'
+
+# PUBLIC_INTERFACE
+def hash_bytes(data: bytes) -> str:
+    """
+    Compute the content address of an uploaded document.
+
+    Args:
+        data (bytes): Raw document bytes
+
+    Returns:
+        str: Hex-encoded SHA-256 digest
+    """
+    return hashlib.sha256(data).hexdigest()
+
+# PUBLIC_INTERFACE
+def hash_file(path: str, block_size: int = 1024 * 1024) -> str:
+    """
+    Compute the content address of an uploaded document stored on disk.
+
+    Args:
+        path (str): Path of the document
+        block_size (int): Bytes read at a time
+
+    Returns:
+        str: Hex-encoded SHA-256 digest, equal to hash_bytes of the contents
+    """
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(block_size), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+# PUBLIC_INTERFACE
+class DocumentCache:
+    """
+    Size-bounded LRU cache of extraction and NLP results keyed by content hash.
+
+    Entries are zlib-compressed JSON files stored under a subdirectory named
+    after the processing version, so a change of spaCy model or NLTK version
+    never serves stale results. A file's modification time records its last
+    use; the least recently used files are evicted once the total size
+    exceeds max_bytes. Writes go through a temporary file and an atomic
+    rename so several worker processes can share one cache directory.
+    """
+
+    def __init__(self, directory: str, version: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            directory (str): Root directory of the cache
+            version (str): Processing version key (see nlp_processor.pipeline_version)
+            max_bytes (int): Upper bound on the total size of cached entries
+        """
+        self.directory = directory
+        self.version = version
+        self.version_dir = os.path.join(directory, hashlib.sha256(version.encode()).hexdigest()[:16])
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.version_dir, exist_ok=True)
+
+    def get(self, digest: str) -> Optional[Dict]:
+        """
+        Look up a cached document.
+
+        Args:
+            digest (str): Content hash of the document
+
+        Returns:
+            Optional[Dict]: Cached entry ({'text': str, 'processed': Dict}),
+                or None on a miss
+        """
+        path = self._path(digest)
+        try:
+            with open(path, 'rb') as handle:
+                entry = json.loads(zlib.decompress(handle.read()))
+            os.utime(path)
+        except (OSError, ValueError, zlib.error):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, digest: str, text: str, processed: Dict) -> None:
+        """
+        Store a document's extracted text and processed form.
+
+        Args:
+            digest (str): Content hash of the document
+            text (str): Extracted document text
+            processed (Dict): Output of nlp_processor.process_text
+        """
+        payload = zlib.compress(json.dumps(
+            {'text': text, 'processed': processed},
+            separators=(',', ':')
+        ).encode('utf-8'))
+
+        handle, temp_path = tempfile.mkstemp(dir=self.version_dir, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as temp_file:
+                temp_file.write(payload)
+            os.replace(temp_path, self._path(digest))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report cache usage by this process.
+
+        Returns:
+            Dict[str, int]: Counters
+                {
+                    'hits': Lookups served from the cache,
+                    'misses': Lookups not found,
+                    'size': Entries currently stored for this version
+                }
+        """
+        try:
+            size = sum(1 for name in os.listdir(self.version_dir) if name.endswith(_ENTRY_SUFFIX))
+        except OSError:
+            size = 0
+        return {'hits': self.hits, 'misses': self.misses, 'size': size}
+
+    def _path(self, digest: str) -> str:
+        """Return the file path of a cache entry."""
+        return os.path.join(self.version_dir, digest + _ENTRY_SUFFIX)
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits max_bytes."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(_ENTRY_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
@@ -0,0 +1,174 @@
+"""Fuzzy term index module for typo-tolerant matching against a document vocabulary."""
+import threading
+from collections.abc import Mapping
+from itertools import combinations
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+import metrics
+
+# Default maximum edit distance for a fuzzy match
+MAX_EDIT_DISTANCE = 2
+
+# PUBLIC_INTERFACE
+def bounded_edit_distance(source: str, target: str, max_distance: int = MAX_EDIT_DISTANCE) -> int:
+    """
+    Compute the Levenshtein distance between two strings, giving up early.
+
+    The dynamic programme stops as soon as every cell of a row exceeds
+    max_distance, since the final distance can then only be larger.
+
+    Args:
+        source (str): First string
+        target (str): Second string
+        max_distance (int): Largest distance of interest
+
+    Returns:
+        int: The edit distance, or max_distance + 1 if it exceeds max_distance
+    """
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+    if source == target:
+        return 0
+
+    previous = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, 1):
+        current = [i]
+        for j, target_char in enumerate(target, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (source_char != target_char)
+            ))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+
+    return previous[-1] if previous[-1] <= max_distance else max_distance + 1
+
+# PUBLIC_INTERFACE
+def build_fuzzy_index(vocabulary: Iterable[str], max_distance: int = MAX_EDIT_DISTANCE) -> Dict:
+    """
+    Build a SymSpell-style deletion dictionary over a vocabulary.
+
+    Every term is stored under each variant obtained by deleting up to
+    max_distance characters. Two terms within max_distance of each other
+    always share at least one such variant, so a lookup only has to verify
+    the few terms found under the query's own deletion variants.
+
+    Args:
+        vocabulary (Iterable[str]): Distinct terms of the document
+        max_distance (int): Largest edit distance supported by lookups
+
+    Returns:
+        Dict: Fuzzy index
+            {
+                'deletes': Mapping of deletion variant to vocabulary terms,
+                'max_distance': Largest supported edit distance
+            }
+    """
+    deletes: Dict[str, List[str]] = {}
+    for term in vocabulary:
+        for variant in _deletion_variants(term, max_distance):
+            deletes.setdefault(variant, []).append(term)
+
+    return {
+        'deletes': deletes,
+        'max_distance': max_distance
+    }
+
+# PUBLIC_INTERFACE
+class LazyFuzzyIndex(Mapping):
+    """
+    Fuzzy index over a vocabulary, built by the first lookup.
+
+    The deletion dictionary of a large vocabulary takes seconds to build
+    and holds many variants per term, while only queries without an exact
+    term match need it. Documents are therefore loaded without it, and the
+    first typo-tolerant lookup builds it once for every index holding this
+    object (a document's sentence and passage indexes, and their copies).
+    The build is timed as the 'fuzzy_index' stage of the request that
+    triggers it.
+
+    Reads as the dict returned by build_fuzzy_index.
+    """
+
+    def __init__(self, vocabulary: Iterable[str], max_distance: int = MAX_EDIT_DISTANCE):
+        """
+        Initialize the index without building it.
+
+        Args:
+            vocabulary (Iterable[str]): Distinct terms of the document, read
+                when the index is built
+            max_distance (int): Largest edit distance supported by lookups
+        """
+        self._vocabulary: Optional[Iterable[str]] = vocabulary
+        self._max_distance = max_distance
+        self._index: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self) -> bool:
+        """Whether the deletion dictionary has been built."""
+        return self._index is not None
+
+    def __getitem__(self, key: str):
+        return self._build()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._build())
+
+    def __len__(self) -> int:
+        return len(self._build())
+
+    def _build(self) -> Dict:
+        """Build the index on first use; concurrent callers wait for one build."""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    with metrics.stage('fuzzy_index'):
+                        self._index = build_fuzzy_index(self._vocabulary, self._max_distance)
+                    self._vocabulary = None
+        return self._index
+
+# PUBLIC_INTERFACE
+def fuzzy_lookup(fuzzy_index: Mapping, term: str, max_distance: int = MAX_EDIT_DISTANCE) -> List[str]:
+    """
+    Find vocabulary terms within an edit distance of a query term.
+
+    Args:
+        fuzzy_index (Mapping): Index produced by build_fuzzy_index, or a
+            LazyFuzzyIndex
+        term (str): Query term (already lowercased)
+        max_distance (int): Largest edit distance to accept; capped at the
+            distance the index was built for
+
+    Returns:
+        List[str]: Matching vocabulary terms, sorted alphabetically
+    """
+    max_distance = min(max_distance, fuzzy_index['max_distance'])
+    candidates: Set[str] = set()
+    for variant in _deletion_variants(term, max_distance):
+        candidates.update(fuzzy_index['deletes'].get(variant, ()))
+
+    return sorted(
+        candidate for candidate in candidates
+        if bounded_edit_distance(term, candidate, max_distance) <= max_distance
+    )
+
+def _deletion_variants(term: str, max_distance: int) -> Set[str]:
+    """
+    Generate every string obtained by deleting up to max_distance characters.
+
+    Args:
+        term (str): Term to derive variants from
+        max_distance (int): Maximum number of deleted characters
+
+    Returns:
+        Set[str]: Deletion variants, including the term itself
+    """
+    variants = {term}
+    for count in range(1, min(max_distance, len(term)) + 1):
+        for positions in combinations(range(len(term)), count):
+            variants.add(''.join(
+                char for position, char in enumerate(term) if position not in positions
+            ))
+    return variants
@@ -0,0 +1,24 @@
+"""
+Gunicorn settings for production serving.
+
+Worker processes and threads per worker are read from PDF_RAG_WORKERS and
+PDF_RAG_THREADS; the listen address from PDF_RAG_BIND.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('PDF_RAG_BIND', '0.0.0.0:5000')
+
+# Workers share the preloaded model copy-on-write, so each one mostly adds
+# its own request-time memory
+workers = int(os.environ.get('PDF_RAG_WORKERS', min(4, multiprocessing.cpu_count())))
+
+# Threads overlap requests waiting on I/O, such as uploads and event streams
+worker_class = 'gthread'
+threads = int(os.environ.get('PDF_RAG_THREADS', 4))
+
+# Import wsgi.py (loading the model and documents) once, before forking
+preload_app = True
+
+# Large synchronous uploads are parsed within the request
+timeout = int(os.environ.get('PDF_RAG_TIMEOUT', 120))
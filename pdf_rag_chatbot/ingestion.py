@@ -0,0 +1,708 @@
+"""Ingestion module running the upload pipeline inline or on a bounded worker pool."""
+import json
+import os
+import queue
+import re
+import tempfile
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Mapping, Optional, Set, Tuple
+from werkzeug.utils import secure_filename
+import metrics
+from caching import LRUCache
+from corpus import Corpus
+from doc_store import PackedDocument, open_packed_document, write_packed_document
+from document_cache import DocumentCache, hash_bytes, hash_file
+from fuzzy_index import LazyFuzzyIndex
+from nlp_processor import process_pages
+from pdf_processor import PdfSource, stream_pdf
+from segments import SegmentManifest, add_segment, delete_segment
+from vector_index import build_vector_index, load_vector_index, save_vector_index
+
+# Job status values
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# Packed document file written into each document's index directory
+PACKED_DOCUMENT_FILE = 'document.pdoc'
+
+# Job records shared through a job folder are deleted this long after creation
+DEFAULT_JOB_TTL = 24 * 3600.0  # seconds
+
+# Page progress of a shared job record is written at most this often
+_PROGRESS_INTERVAL = 0.25  # seconds
+
+_JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+_JOB_RECORD_ERROR_HELP = 'Job status records that could not be written to the job folder'
+
+class IngestionError(Exception):
+    """Raised when an uploaded document cannot be ingested."""
+
+class QueueFullError(Exception):
+    """Raised when the ingestion queue has no room for another job."""
+
+# PUBLIC_INTERFACE
+class IngestionJob:
+    """Status record of one document's ingestion."""
+
+    def __init__(self, filename: str, on_change: Optional[Callable[['IngestionJob'], None]] = None):
+        """
+        Initialize a queued job.
+
+        Args:
+            filename (str): Name of the uploaded file
+            on_change (Optional[Callable[[IngestionJob], None]]): Called
+                with the job when its status, stage or progress changes, as
+                by IngestionQueue to share the record with other processes
+        """
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.status = QUEUED
+        self.stage = QUEUED
+        self.pages_done = 0
+        self.pages_total = 0
+        self.timings: Dict[str, float] = {}
+        self.result: Optional[Dict] = None
+        self.error = ''
+        self.created = time.time()
+        self.on_change = on_change
+        self._published = 0.0
+
+    def set_stage(self, stage: str) -> None:
+        """
+        Record the pipeline stage the job has reached.
+
+        Args:
+            stage (str): Stage name
+        """
+        self.stage = stage
+        self.publish()
+
+    def set_progress(self, pages_done: int, pages_total: int) -> None:
+        """
+        Record page extraction progress.
+
+        Args:
+            pages_done (int): Pages extracted so far
+            pages_total (int): Pages in the document
+        """
+        self.pages_done = pages_done
+        self.pages_total = pages_total
+        if pages_done >= pages_total or time.monotonic() - self._published >= _PROGRESS_INTERVAL:
+            self.publish()
+
+    def publish(self) -> None:
+        """Pass the job's current state to on_change, if set."""
+        if self.on_change is not None:
+            self._published = time.monotonic()
+            self.on_change(self)
+
+    def to_dict(self) -> Dict:
+        """
+        Describe the job for the status endpoint.
+
+        Returns:
+            Dict: Job id, status, stage, page progress, timings, and the
+                ingestion result or error once finished
+        """
+        return {
+            'id': self.id,
+            'filename': self.filename,
+            'status': self.status,
+            'stage': self.stage,
+            'pages_done': self.pages_done,
+            'pages_total': self.pages_total,
+            'timings': {stage: round(ms, 2) for stage, ms in self.timings.items()},
+            'result': self.result,
+            'error': self.error
+        }
+
+    @classmethod
+    def from_dict(cls, record: Dict) -> 'IngestionJob':
+        """
+        Rebuild a job from its to_dict record, as shared by another process.
+
+        Args:
+            record (Dict): Record returned by to_dict, plus 'created'
+
+        Returns:
+            IngestionJob: Job reporting the same status
+        """
+        job = cls(record['filename'])
+        for field in ('id', 'status', 'stage', 'pages_done', 'pages_total', 'timings', 'result', 'error', 'created'):
+            setattr(job, field, record[field])
+        return job
+
+# PUBLIC_INTERFACE
+class DocumentIngestor:
+    """
+    Upload pipeline: hash, cache lookup, PDF ingestion, NLP and indexing.
+
+    Each document's packed index files form an immutable segment of
+    INDEX_FOLDER, listed in its SegmentManifest once complete. Adding,
+    replacing or deleting a document publishes a new manifest generation
+    without rewriting other segments, and worker processes apply the
+    changes to their corpus in sync.
+
+    Settings are read from the config mapping on every call, so changes to
+    the application config (as in tests) take effect immediately.
+    """
+
+    def __init__(self, corpus: Corpus, document_cache: DocumentCache, config: Mapping):
+        """
+        Initialize the pipeline.
+
+        Args:
+            corpus (Corpus): Corpus receiving ingested documents
+            document_cache (DocumentCache): Cache of extraction and NLP results
+            config (Mapping): Settings providing UPLOAD_FOLDER, SPOOL_THRESHOLD,
+                INDEX_FOLDER, PDF_EXTRACTOR, PDF_PAGE_TIMEOUT,
+                SEGMENT_GRACE_PERIOD and COMPACTION_INTERVAL
+        """
+        self.corpus = corpus
+        self.document_cache = document_cache
+        self.config = config
+        self._sync_lock = threading.Lock()
+        self._synced_stamp: Optional[Tuple[int, int]] = None
+        # Documents this ingestor added to the corpus from the index folder,
+        # which sync removes once they are no longer live
+        self._published: Set[str] = set()
+        self._compacted = 0.0
+
+    def ingest(
+        self,
+        data: PdfSource,
+        filename: str,
+        job: Optional[IngestionJob] = None,
+        digest: Optional[str] = None,
+        replaces: Optional[str] = None
+    ) -> Dict:
+        """
+        Ingest an uploaded PDF and add it to the corpus.
+
+        Args:
+            data (PdfSource): Raw PDF bytes, or the path of an upload already
+                on disk, which is read from there without loading it whole
+            filename (str): Name of the uploaded file
+            job (Optional[IngestionJob]): Job to report stages, progress and
+                timings to
+            digest (Optional[str]): Content hash of the upload when already
+                known, as for chunked uploads hashed while received
+            replaces (Optional[str]): Id of a document this upload is a
+                revised version of, deleted when the upload is added
+
+        Returns:
+            Dict: {'document_id': content hash, 'cached': bool, 'timings': Dict,
+                'replaced': id of the document replaced, or None}
+
+        Raises:
+            IngestionError: If the PDF is invalid or contains no text
+        """
+        job = job or IngestionJob(filename)
+        timings = job.timings
+        filename = secure_filename(filename)
+        if digest is None:
+            digest = hash_bytes(data) if isinstance(data, bytes) else hash_file(data)
+
+        # Repeat uploads of the same bytes skip parsing and NLP entirely, and
+        # skip indexing too when the packed document is already on disk
+        index_dir = os.path.join(self.config['INDEX_FOLDER'], digest)
+        document = self._open_document(index_dir)
+        cached = document is not None
+        if document is None:
+            entry = self.document_cache.get(digest)
+            cached = entry is not None
+            if cached:
+                processed_text = entry['processed']
+            else:
+                processed_text = self._process(data, job)
+                # Pages are never held together, so the cached text is the
+                # document's sentences
+                self.document_cache.put(digest, '\n'.join(processed_text['sentences']), processed_text)
+
+            # Store the sentences, keywords and inverted index in the packed
+            # columnar format and serve them memory-mapped from there
+            job.set_stage('index')
+            start = time.perf_counter()
+            os.makedirs(index_dir, exist_ok=True)
+            write_packed_document(
+                os.path.join(index_dir, PACKED_DOCUMENT_FILE),
+                processed_text,
+                {'name': filename, 'version': self.document_cache.version}
+            )
+            document = self._open_document(index_dir)
+            timings['index'] = (time.perf_counter() - start) * 1000
+            metrics.observe('index', timings['index'] / 1000)
+
+        start = time.perf_counter()
+        shard = self._load_shard(document, index_dir)
+        timings['load'] = (time.perf_counter() - start) * 1000
+        metrics.observe('load', timings['load'] / 1000)
+        with self._sync_lock:
+            replaced = self._publish(digest, filename, document, replaces)
+            # The new version and the removal of the old one become visible
+            # to searches together
+            removed = self.corpus.update(
+                [(digest, filename, shard)],
+                [replaces] if replaces not in (None, digest) else []
+            )
+            self._published.add(digest)
+            self._published.difference_update(removed)
+        return {
+            'document_id': digest,
+            'cached': cached,
+            'timings': {stage: round(ms, 2) for stage, ms in timings.items()},
+            'replaced': replaced or (removed[0] if removed else None)
+        }
+
+    def delete(self, document_id: str) -> bool:
+        """
+        Delete a document from the index folder and the corpus.
+
+        Only a tombstone is written; the document's files are removed by a
+        later compaction, once readers in other processes had time to
+        apply the deletion.
+
+        Args:
+            document_id (str): Id of the document to delete
+
+        Returns:
+            bool: True if the document was present
+        """
+        with self._sync_lock:
+            with self._segments().transaction() as manifest:
+                deleted = delete_segment(manifest, document_id)
+            removed = self.corpus.update(removed=[document_id])
+            self._published.discard(document_id)
+        return deleted or bool(removed)
+
+    def compact(self) -> List[str]:
+        """
+        Remove the files of documents deleted more than SEGMENT_GRACE_PERIOD ago.
+
+        Returns:
+            List[str]: Ids of the documents whose files were removed
+        """
+        removed = self._segments().compact()
+        if removed:
+            metrics.increment('index_segments_compacted', len(removed), 'Deleted index segments removed from disk')
+        return removed
+
+    def sync(self) -> int:
+        """
+        Apply the changes published in INDEX_FOLDER's manifest to the corpus.
+
+        All worker processes of a server ingest into the same index folder,
+        so calling this before serving a request makes documents uploaded,
+        replaced or deleted through any worker take effect in this one; at
+        startup it restores the documents indexed by earlier runs. The
+        manifest is only read again when it changes, and each change is
+        applied to the corpus in one step. An index folder written before
+        the manifest existed gets one listing its document directories.
+
+        Documents written under another processing version are skipped.
+        Calls also start a background compaction every COMPACTION_INTERVAL
+        seconds.
+
+        Returns:
+            int: Number of documents added to or removed from the corpus
+        """
+        segments = self._segments()
+        if segments.stamp() is None:
+            self._create_manifest(segments)
+        self._schedule_compaction()
+
+        with self._sync_lock:
+            stamp = segments.stamp()
+            if stamp == self._synced_stamp:
+                return 0
+            manifest = segments.read()
+            self._synced_stamp = stamp
+
+            live = manifest['segments']
+            added = []
+            for digest in sorted(live):
+                if self.corpus.get_document(digest) is not None:
+                    continue
+                index_dir = os.path.join(segments.directory, digest)
+                document = self._open_document(index_dir)
+                if document is not None:
+                    added.append((digest, live[digest]['name'], self._load_shard(document, index_dir)))
+            removed = self.corpus.update(added, [digest for digest in self._published if digest not in live])
+            self._published.difference_update(removed)
+            self._published.update(digest for digest, _, _ in added)
+            return len(added) + len(removed)
+
+    def _segments(self) -> SegmentManifest:
+        """Return the segment manifest of the configured index folder."""
+        return SegmentManifest(self.config['INDEX_FOLDER'], self.config['SEGMENT_GRACE_PERIOD'])
+
+    def _create_manifest(self, segments: SegmentManifest) -> None:
+        """
+        Publish the first manifest of an index folder.
+
+        Lists the readable document directories already in the folder, as
+        written before manifests existed.
+
+        Args:
+            segments (SegmentManifest): Manifest of the index folder
+        """
+        with segments.transaction() as manifest:
+            if manifest['generation']:
+                return  # Created by another process meanwhile
+            for digest in sorted(os.listdir(segments.directory)):
+                document = self._open_document(os.path.join(segments.directory, digest))
+                if document is not None:
+                    add_segment(manifest, digest, document.metadata['name'])
+
+    def _publish(
+        self,
+        digest: str,
+        filename: str,
+        document: PackedDocument,
+        replaces: Optional[str]
+    ) -> Optional[str]:
+        """
+        List a document's segment as live in the manifest.
+
+        Args:
+            digest (str): Content hash of the document
+            filename (str): Sanitised name of the uploaded file
+            document (PackedDocument): The document's open packed file
+            replaces (Optional[str]): Id of a document to delete with it
+
+        Returns:
+            Optional[str]: Id of the document deleted, or None
+        """
+        segments = self._segments()
+        with segments.transaction() as manifest:
+            # A segment deleted earlier may have been compacted since its
+            # file was opened; the open mapping still holds its contents
+            path = os.path.join(segments.directory, digest, PACKED_DOCUMENT_FILE)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                write_packed_document(path, document, document.metadata)
+            return add_segment(manifest, digest, filename, replaces)
+
+    def _schedule_compaction(self) -> None:
+        """Start a background compaction if none ran for COMPACTION_INTERVAL seconds."""
+        now = time.time()
+        if now - self._compacted < self.config['COMPACTION_INTERVAL']:
+            return
+        self._compacted = now
+        threading.Thread(target=self.compact, name='index-compaction', daemon=True).start()
+
+    def _process(self, data: PdfSource, job: IngestionJob) -> Dict:
+        """
+        Extract and analyse an uploaded PDF.
+
+        Args:
+            data (PdfSource): Raw PDF bytes, or the path of the upload on disk
+            job (IngestionJob): Job to report stages, progress and timings to
+
+        Returns:
+            Dict: Processed document as returned by process_pages
+
+        Raises:
+            IngestionError: If the PDF is invalid or contains no text
+        """
+        # Small uploads are validated and extracted straight from memory;
+        # large ones go to a file of their own on disk so extraction workers
+        # can read it, removed once the document is processed
+        spool_path = None
+        if isinstance(data, bytes) and len(data) > self.config['SPOOL_THRESHOLD']:
+            os.makedirs(self.config['UPLOAD_FOLDER'], exist_ok=True)
+            handle, spool_path = tempfile.mkstemp(dir=self.config['UPLOAD_FOLDER'], suffix='.pdf')
+        try:
+            if spool_path is not None:
+                with os.fdopen(handle, 'wb') as output:
+                    output.write(data)
+            return self._extract_and_analyse(data if spool_path is None else spool_path, job)
+        finally:
+            if spool_path is not None and os.path.exists(spool_path):
+                os.remove(spool_path)
+
+    def _extract_and_analyse(self, source: PdfSource, job: IngestionJob) -> Dict:
+        """
+        Extract an upload's pages and run them through NLP (see _process).
+
+        Args:
+            source (PdfSource): Raw PDF bytes, or the path of the PDF on disk
+            job (IngestionJob): Job to report stages, progress and timings to
+
+        Returns:
+            Dict: Processed document as returned by process_pages
+
+        Raises:
+            IngestionError: If the PDF is invalid, its extraction fails part
+                way, or it contains no text
+        """
+        def progress(pages_done: int, pages_total: int) -> None:
+            job.set_progress(pages_done, pages_total)
+            if pages_done == pages_total:
+                job.set_stage('nlp')
+
+        job.set_stage('extract')
+        stream = stream_pdf(
+            source,
+            progress=progress,
+            extractor=self.config['PDF_EXTRACTOR'],
+            page_timeout=self.config['PDF_PAGE_TIMEOUT']
+        )
+        job.timings.update(stream['timings'])
+        if not stream['valid']:
+            raise IngestionError(stream['error'])
+
+        # Pages go from extraction through segmentation and spaCy a batch at
+        # a time, so peak memory is bounded by a batch of pages plus the
+        # results; each sentence keeps the page it starts on
+        start = time.perf_counter()
+        processed_text = process_pages(stream['pages'])
+        elapsed = (time.perf_counter() - start) * 1000
+        job.timings.update(stream['timings'])
+        job.timings['nlp'] = elapsed - stream['timings']['extract']
+        metrics.observe('nlp', job.timings['nlp'] / 1000)
+        # A document whose extraction broke off is rejected rather than
+        # cached and indexed, truncated, under its content hash
+        if stream['error']:
+            raise IngestionError(stream['error'])
+        if not processed_text['sentences']:
+            raise IngestionError('Failed to extract text from PDF')
+        return processed_text
+
+    def _open_document(self, index_dir: str) -> Optional[PackedDocument]:
+        """
+        Open the packed document in an index directory.
+
+        Args:
+            index_dir (str): Index directory of one document
+
+        Returns:
+            Optional[PackedDocument]: The document, or None if it is missing
+                or was written under another processing version
+        """
+        document = open_packed_document(os.path.join(index_dir, PACKED_DOCUMENT_FILE))
+        if document is None or document.metadata.get('version') != self.document_cache.version:
+            return None
+        return document
+
+    @staticmethod
+    def _load_shard(document: PackedDocument, index_dir: str) -> Dict:
+        """
+        Attach the fuzzy term index and sentence vectors to a packed document.
+
+        The fuzzy term index is only built by the first typo-tolerant
+        lookup, so loading a document costs opening its files.
+
+        Args:
+            document (PackedDocument): Packed document
+            index_dir (str): Index directory of the document
+
+        Returns:
+            Dict: Processed document fields for Corpus.add_document
+        """
+        document['index']['fuzzy'] = LazyFuzzyIndex(document['index']['postings'])
+        if 'passages' in document:
+            # Passages share the vocabulary, and so the fuzzy term index
+            document['passages']['index']['fuzzy'] = document['index']['fuzzy']
+
+        # Sentence vectors are stored per content hash and memory-mapped, so
+        # worker processes serving the same document share one copy
+        vectors = load_vector_index(index_dir)
+        if vectors is None or vectors['matrix'].shape[0] != len(document['sentences']):
+            save_vector_index(build_vector_index(document['sentences']), index_dir)
+            vectors = load_vector_index(index_dir)
+        return dict(document, vectors=vectors)
+
+# PUBLIC_INTERFACE
+class IngestionQueue:
+    """
+    Bounded queue of ingestion jobs executed by a pool of worker threads.
+
+    At most max_pending jobs wait at once; further submissions are rejected
+    rather than buffered, so memory held by queued uploads stays bounded.
+    Finished job records are kept in an LRU cache for status lookups. With
+    a job folder, every job's record is also written there as it changes,
+    so any worker process of a server can report any job's status.
+
+    Worker threads start on the first submission in each process, so a
+    queue created before a pre-fork server forks gets live workers in
+    every child rather than threads that only existed in the parent.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[..., Dict],
+        workers: int = 2,
+        max_pending: int = 16,
+        max_jobs: int = 1024,
+        job_folder: Optional[str] = None,
+        job_ttl: float = DEFAULT_JOB_TTL
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            handler (Callable[..., Dict]): Function called with an upload,
+                its file name, its job and any options given to submit, such
+                as DocumentIngestor.ingest
+            workers (int): Number of worker threads
+            max_pending (int): Maximum number of jobs waiting to run
+            max_jobs (int): Number of job records kept for status lookups
+            job_folder (Optional[str]): Directory sharing job records between
+                processes, or None to keep them in this process only
+            job_ttl (float): Seconds a shared job record is kept after the
+                job was created
+        """
+        self.handler = handler
+        self.workers = workers
+        self.job_folder = job_folder
+        self.job_ttl = job_ttl
+        if job_folder is not None:
+            os.makedirs(job_folder, exist_ok=True)
+        self._pending: 'queue.Queue' = queue.Queue(maxsize=max_pending)
+        self._jobs = LRUCache(max_jobs)
+        self._workers: List[threading.Thread] = []
+        self._workers_pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, data: PdfSource, filename: str, **options) -> IngestionJob:
+        """
+        Enqueue an upload for ingestion.
+
+        Args:
+            data (PdfSource): Raw PDF bytes, or the path of the upload on disk
+            filename (str): Name of the uploaded file
+            **options: Keyword arguments passed on to the handler
+
+        Returns:
+            IngestionJob: The queued job
+
+        Raises:
+            QueueFullError: If max_pending jobs are already waiting
+        """
+        self._ensure_workers()
+        job = IngestionJob(filename, self._write_job if self.job_folder is not None else None)
+        self._jobs.put(job.id, job)
+        # Published before a worker can pick the job up and publish its own changes
+        if self.job_folder is not None:
+            self._purge_expired()
+            job.publish()
+        try:
+            self._pending.put_nowait((job, data, options))
+        except queue.Full:
+            self._jobs.pop(job.id)
+            if self.job_folder is not None and os.path.exists(self._job_path(job.id)):
+                os.remove(self._job_path(job.id))
+            raise QueueFullError('Ingestion queue is full')
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        """
+        Look up a job.
+
+        Args:
+            job_id (str): Job id returned by submit
+
+        Returns:
+            Optional[IngestionJob]: The job, or None if unknown or expired;
+                jobs of other processes are read from the job folder
+        """
+        job = self._jobs.get(job_id)
+        if job is not None or self.job_folder is None or not _JOB_ID_PATTERN.match(job_id):
+            return job
+        try:
+            with open(self._job_path(job_id)) as handle:
+                record = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if time.time() - record['created'] > self.job_ttl:
+            return None
+        return IngestionJob.from_dict(record)
+
+    def depth(self) -> int:
+        """
+        Report the number of jobs waiting to run.
+
+        Returns:
+            int: Queue depth
+        """
+        return self._pending.qsize()
+
+    def _ensure_workers(self) -> None:
+        """Start the worker threads if this process has none yet."""
+        if self._workers_pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._workers_pid == os.getpid():
+                return
+            self._workers = [
+                threading.Thread(target=self._work, name=f'ingestion-{number}', daemon=True)
+                for number in range(self.workers)
+            ]
+            for worker in self._workers:
+                worker.start()
+            self._workers_pid = os.getpid()
+
+    def _work(self) -> None:
+        """Run queued jobs until the process exits."""
+        while True:
+            job, data, options = self._pending.get()
+            try:
+                job.status = RUNNING
+                job.publish()
+                job.result = self.handler(data, job.filename, job, **options)
+                job.status = DONE
+            except Exception as e:
+                job.error = str(e)
+                job.status = FAILED
+            finally:
+                # Nothing raised while reporting the outcome may end this
+                # worker thread and so shrink the pool
+                try:
+                    job.set_stage(job.status)
+                except Exception:
+                    metrics.increment('job_record_errors', help_text=_JOB_RECORD_ERROR_HELP)
+                metrics.increment('ingestion_jobs', help_text='Finished ingestion jobs', status=job.status)
+                self._pending.task_done()
+
+    def _job_path(self, job_id: str) -> str:
+        """Return the path of a job's shared record."""
+        return os.path.join(self.job_folder, job_id + '.json')
+
+    def _write_job(self, job: IngestionJob) -> None:
+        """
+        Atomically write a job's shared record.
+
+        A record that cannot be written (a full or read-only disk) is only
+        counted: the job itself runs on, and this process still reports it.
+        """
+        temp_path = None
+        try:
+            handle, temp_path = tempfile.mkstemp(dir=self.job_folder, suffix='.tmp')
+            with os.fdopen(handle, 'w') as temp_file:
+                json.dump(dict(job.to_dict(), created=job.created), temp_file)
+            os.replace(temp_path, self._job_path(job.id))
+        except OSError:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+            metrics.increment('job_record_errors', help_text=_JOB_RECORD_ERROR_HELP)
+
+    def _purge_expired(self) -> None:
+        """Delete the shared records of jobs created more than job_ttl seconds ago."""
+        cutoff = time.time() - self.job_ttl
+        try:
+            names = os.listdir(self.job_folder)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.job_folder, name)
+            try:
+                if os.path.getmtime(path) < cutoff and os.path.splitext(name)[1] in {'.json', '.tmp'}:
+                    os.remove(path)
+            except OSError:
+                pass
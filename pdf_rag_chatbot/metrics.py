@@ -0,0 +1,287 @@
+"""Lightweight stage timers, counters and gauges exposed in Prometheus text format."""
+import contextvars
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Environment variable disabling instrumentation when set to 0, false or no
+ENABLED_ENV_VAR = 'PDF_RAG_METRICS'
+
+# Prefix of every exported metric name
+PREFIX = 'pdf_rag_'
+
+# Upper bounds of the stage latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_Labels = Tuple[Tuple[str, str], ...]
+
+# PUBLIC_INTERFACE
+class Registry:
+    """
+    Thread-safe store of stage latency histograms, counters and gauges.
+
+    Stage timings are also accumulated per request (see begin_request), for
+    Server-Timing headers. When disabled, stage() returns a shared no-op
+    context manager and increment() returns immediately, so instrumented
+    code pays one attribute check per call.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Initialize an empty registry.
+
+        Args:
+            enabled (bool): Record measurements
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # stage -> [bucket counts..., total count, sum of seconds]
+        self._stages: Dict[str, List[float]] = {}
+        self._counters: Dict[Tuple[str, _Labels], float] = {}
+        self._counter_help: Dict[str, str] = {}
+        self._gauges: List[Tuple[str, str, Callable[[], float], _Labels]] = []
+        self._request: 'contextvars.ContextVar[Optional[Dict[str, float]]]' = contextvars.ContextVar(
+            'request_timings', default=None
+        )
+
+    def stage(self, name: str):
+        """
+        Time a pipeline stage.
+
+        Usage:
+            with registry.stage('retrieval'):
+                ...
+
+        Args:
+            name (str): Stage name
+
+        Returns:
+            ContextManager: Timer recording the block's duration on exit
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def observe(self, name: str, seconds: float) -> None:
+        """
+        Record the duration of a stage measured by the caller.
+
+        Args:
+            name (str): Stage name
+            seconds (float): Duration in seconds
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            series = self._stages.get(name)
+            if series is None:
+                series = self._stages[name] = [0.0] * (len(LATENCY_BUCKETS) + 2)
+            for position, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    series[position] += 1
+            series[-2] += 1
+            series[-1] += seconds
+        timings = self._request.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + seconds
+
+    def increment(self, name: str, amount: float = 1.0, help_text: str = '', **labels: str) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name (str): Counter name, exported with a _total suffix
+            amount (float): Amount to add
+            help_text (str): Description exported with the counter
+            **labels (str): Label values of the counter series
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+            if help_text:
+                self._counter_help.setdefault(name, help_text)
+
+    def add_gauge(self, name: str, help_text: str, callback: Callable[[], float], **labels: str) -> None:
+        """
+        Register a gauge read when metrics are rendered.
+
+        Args:
+            name (str): Gauge name
+            help_text (str): Description exported with the gauge
+            callback (Callable[[], float]): Returns the current value
+            **labels (str): Label values of the gauge series
+        """
+        with self._lock:
+            self._gauges.append((name, help_text, callback, tuple(sorted(labels.items()))))
+
+    def add_cache(self, cache: str, stats: Callable[[], Dict[str, int]]) -> None:
+        """
+        Export the hit, miss and size counters of a cache as gauges.
+
+        Args:
+            cache (str): Cache name, used as the 'cache' label
+            stats (Callable[[], Dict[str, int]]): Returns the cache's
+                {'hits', 'misses', 'size'} counters (see LRUCache.stats)
+        """
+        def hit_ratio() -> float:
+            counts = stats()
+            lookups = counts['hits'] + counts['misses']
+            return counts['hits'] / lookups if lookups else 0.0
+
+        self.add_gauge('cache_hits', 'Cache lookups served from the cache', lambda: stats()['hits'], cache=cache)
+        self.add_gauge('cache_misses', 'Cache lookups not found in the cache', lambda: stats()['misses'], cache=cache)
+        self.add_gauge('cache_entries', 'Entries held by the cache', lambda: stats()['size'], cache=cache)
+        self.add_gauge('cache_hit_ratio', 'Fraction of cache lookups that hit', hit_ratio, cache=cache)
+
+    def begin_request(self) -> contextvars.Token:
+        """
+        Start accumulating stage timings for the current request.
+
+        Returns:
+            contextvars.Token: Token to pass to end_request
+        """
+        return self._request.set({} if self.enabled else None)
+
+    def end_request(self, token: contextvars.Token) -> Dict[str, float]:
+        """
+        Stop accumulating stage timings for the current request.
+
+        Args:
+            token (contextvars.Token): Token returned by begin_request
+
+        Returns:
+            Dict[str, float]: Total seconds spent in each stage during the request
+        """
+        timings = self._request.get() or {}
+        self._request.reset(token)
+        return timings
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: Metrics text
+        """
+        with self._lock:
+            stages = {name: list(series) for name, series in self._stages.items()}
+            counters = dict(self._counters)
+            counter_help = dict(self._counter_help)
+            gauges = list(self._gauges)
+
+        lines = []
+        if stages:
+            name = PREFIX + 'stage_seconds'
+            lines.append(f'# HELP {name} Time spent in each pipeline stage')
+            lines.append(f'# TYPE {name} histogram')
+            bounds = [repr(bound) for bound in LATENCY_BUCKETS] + ['+Inf']
+            for stage, series in sorted(stages.items()):
+                labels = (('stage', stage),)
+                for bound, count in zip(bounds, series[:-2] + series[-2:-1]):
+                    lines.append(f'{name}_bucket{_format_labels(labels + (("le", bound),))} {_format_value(count)}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(series[-1])}')
+                lines.append(f'{name}_count{_format_labels(labels)} {_format_value(series[-2])}')
+
+        for counter in sorted({name for name, _ in counters}):
+            name = PREFIX + counter + '_total'
+            if counter in counter_help:
+                lines.append(f'# HELP {name} {counter_help[counter]}')
+            lines.append(f'# TYPE {name} counter')
+            for (series_name, labels), value in sorted(counters.items()):
+                if series_name == counter:
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+
+        # Samples of one metric family must be contiguous
+        families: Dict[str, List[Tuple[str, Callable[[], float], _Labels]]] = {}
+        for gauge, help_text, callback, labels in gauges:
+            families.setdefault(PREFIX + gauge, []).append((help_text, callback, labels))
+        for name, series in families.items():
+            lines.append(f'# HELP {name} {series[0][0]}')
+            lines.append(f'# TYPE {name} gauge')
+            for _, callback, labels in series:
+                try:
+                    value = float(callback())
+                except Exception:
+                    continue
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+class _Timer:
+    """Context manager recording the duration of its block as a stage."""
+
+    __slots__ = ('registry', 'name', 'start')
+
+    def __init__(self, registry: Registry, name: str):
+        self.registry = registry
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> bool:
+        self.registry.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+class _NullTimer:
+    """Reusable context manager doing nothing, returned while disabled."""
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+# PUBLIC_INTERFACE
+def format_server_timing(timings: Dict[str, float]) -> str:
+    """
+    Format per-request stage timings as a Server-Timing header value.
+
+    Args:
+        timings (Dict[str, float]): Seconds per stage (see Registry.end_request)
+
+    Returns:
+        str: Header value such as 'query_analysis;dur=4.21, retrieval;dur=0.35'
+    """
+    return ', '.join(f'{stage};dur={seconds * 1000:.2f}' for stage, seconds in timings.items())
+
+def _format_labels(labels: _Labels) -> str:
+    """Format label pairs as a Prometheus label set."""
+    if not labels:
+        return ''
+    pairs = (
+        '%s="%s"' % (key, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels
+    )
+    return '{' + ','.join(pairs) + '}'
+
+def _format_value(value: float) -> str:
+    """Format a sample value, without a fraction for whole numbers."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+def _enabled_from_env() -> bool:
+    """Read whether instrumentation is enabled from the environment."""
+    return os.environ.get(ENABLED_ENV_VAR, '1').strip().lower() not in {'0', 'false', 'no'}
+
+# Process-wide registry used by the pipeline modules
+registry = Registry(_enabled_from_env())
+
+# PUBLIC_INTERFACE
+def stage(name: str):
+    """Time a pipeline stage in the process-wide registry (see Registry.stage)."""
+    return registry.stage(name)
+
+# PUBLIC_INTERFACE
+def observe(name: str, seconds: float) -> None:
+    """Record a stage duration in the process-wide registry (see Registry.observe)."""
+    registry.observe(name, seconds)
+
+# PUBLIC_INTERFACE
+def increment(name: str, amount: float = 1.0, help_text: str = '', **labels: str) -> None:
+    """Add to a counter in the process-wide registry (see Registry.increment)."""
+    registry.increment(name, amount, help_text, **labels)
@@ -1,28 +1,231 @@
 """NLP processing module for text analysis using SpaCy and NLTK."""
-from typing import List, Dict
-import spacy
+import os
+import re
+import threading
+from importlib import metadata
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
 import nltk
-from nltk.tokenize import sent_tokenize
 from nltk.corpus import stopwords
+import metrics
+from caching import LRUCache
 
-# Download required NLTK data
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
+# SpaCy model used for keyword, entity and query analysis
+SPACY_MODEL = 'en_core_web_sm'
 
-# Load SpaCy model
-try:
-    nlp = spacy.load('en_core_web_sm')
-except OSError:
-    spacy.cli.download('en_core_web_sm')
-    nlp = spacy.load('en_core_web_sm')
+# Set to a true value to forbid downloads and fail fast on missing resources
+OFFLINE_ENV_VAR = 'PDF_RAG_OFFLINE'
+
+class ResourceUnavailableError(RuntimeError):
+    """Raised when an NLP resource is missing and may not be downloaded."""
+
+# Loaded resources by name, populated on first use
+_resources: Dict[str, Any] = {}
+_resource_lock = threading.Lock()
+
+# PUBLIC_INTERFACE
+def is_offline() -> bool:
+    """
+    Check whether NLP resource downloads are disabled.
+    
+    Returns:
+        bool: True if OFFLINE_ENV_VAR is set to a true value
+    """
+    return os.environ.get(OFFLINE_ENV_VAR, '').strip().lower() in {'1', 'true', 'yes', 'on'}
+
+# PUBLIC_INTERFACE
+def get_nlp():
+    """
+    Get the shared SpaCy pipeline, loading it on first use.
+    
+    Returns:
+        spacy.language.Language: The loaded SpaCy pipeline
+        
+    Raises:
+        ResourceUnavailableError: If the model is missing in offline mode
+    """
+    return _get_resource('nlp', _load_spacy_model)
+
+# PUBLIC_INTERFACE
+def get_stopwords() -> frozenset:
+    """
+    Get the English stopword set, loading it on first use.
+    
+    Returns:
+        frozenset: NLTK English stopwords
+        
+    Raises:
+        ResourceUnavailableError: If the corpus is missing in offline mode
+    """
+    return _get_resource('stopwords', _load_stopwords)
+
+# PUBLIC_INTERFACE
+def get_sentence_tokenizer():
+    """
+    Get the NLTK punkt sentence tokenizer, loading it on first use.
+    
+    Returns:
+        nltk.tokenize.PunktSentenceTokenizer: English punkt tokenizer
+        
+    Raises:
+        ResourceUnavailableError: If the model is missing in offline mode
+    """
+    return _get_resource('punkt', _load_sentence_tokenizer)
+
+# PUBLIC_INTERFACE
+def warm_up() -> None:
+    """
+    Load every NLP resource now rather than on the first request.
+    
+    Call this in a pre-fork server's master process so that workers share the
+    loaded model, or at startup to surface missing resources immediately.
+    
+    Raises:
+        ResourceUnavailableError: If a resource is missing in offline mode
+    """
+    get_nlp()
+    get_stopwords()
+    get_sentence_tokenizer()
+
+def _get_resource(name: str, loader: Callable[[], Any]) -> Any:
+    """
+    Return a loaded resource, loading it exactly once across threads.
+    
+    Args:
+        name (str): Resource name
+        loader (Callable[[], Any]): Function loading the resource
+        
+    Returns:
+        Any: The loaded resource
+    """
+    resource = _resources.get(name)
+    if resource is None:
+        with _resource_lock:
+            resource = _resources.get(name)
+            if resource is None:
+                resource = _resources[name] = loader()
+    return resource
+
+def _load_spacy_model():
+    """Load the SpaCy model, downloading it first unless offline."""
+    import spacy
+    try:
+        return spacy.load(SPACY_MODEL)
+    except OSError:
+        if is_offline():
+            raise ResourceUnavailableError(
+                f'SpaCy model {SPACY_MODEL!r} is not installed and {OFFLINE_ENV_VAR} is set'
+            )
+        spacy.cli.download(SPACY_MODEL)
+        return spacy.load(SPACY_MODEL)
+
+def _load_stopwords() -> frozenset:
+    """Load the NLTK English stopwords, downloading them first unless offline."""
+    _ensure_nltk_data('corpora/stopwords', 'stopwords')
+    return frozenset(stopwords.words('english'))
+
+def _load_sentence_tokenizer():
+    """Load the NLTK punkt tokenizer, downloading it first unless offline."""
+    _ensure_nltk_data('tokenizers/punkt', 'punkt')
+    return nltk.data.load('tokenizers/punkt/english.pickle')
+
+def _ensure_nltk_data(path: str, package: str) -> None:
+    """
+    Make sure an NLTK data package is available.
+    
+    Args:
+        path (str): Resource path looked up with nltk.data.find
+        package (str): Package name passed to nltk.download
+        
+    Raises:
+        ResourceUnavailableError: If the package is missing in offline mode
+    """
+    try:
+        nltk.data.find(path)
+    except LookupError:
+        if is_offline():
+            raise ResourceUnavailableError(
+                f'NLTK data {package!r} is not installed and {OFFLINE_ENV_VAR} is set'
+            )
+        nltk.download(package, quiet=True)
+
+# Words marking a query as a question
+QUESTION_WORDS = frozenset({'what', 'why', 'how', 'when', 'where', 'who'})
+
+# Queries of at most this many words, none of them stopwords, are keyword
+# queries: their words are the focus, without parsing
+KEYWORD_QUERY_MAX_WORDS = 3
+
+# Bounds of the analyze_query result cache
+QUERY_CACHE_SIZE = 1024
+QUERY_CACHE_TTL = 3600.0  # seconds
+QUERY_BATCH_SIZE = 64  # Queries spaCy parses per batch in analyze_queries
+
+_WORD_PATTERN = re.compile(r'\w+')
+_query_cache = LRUCache(QUERY_CACHE_SIZE, QUERY_CACHE_TTL)
+
+# Elements process_text can compute
+ALL_OUTPUTS = ('sentences', 'keywords', 'entities')
+
+# Sentence-ending punctuation followed by whitespace, used to place chunk cuts
+_SENTENCE_END = re.compile(r'[.!?]\s')
+
+# Sentence ending with terminal punctuation, possibly followed by closing quotes
+_SENTENCE_TERMINAL = re.compile(r'[.!?][\'"\)\]\u2019\u201d]*$')
+
+# Longest unfinished sentence carried over to the next page
+MAX_CARRY_CHARS = 2000
+
+# Chunking defaults for process_text
+DEFAULT_CHUNK_CHARS = 20000
+DEFAULT_BATCH_SIZE = 8
+
+# PUBLIC_INTERFACE
+def pipeline_version() -> str:
+    """
+    Describe the versions of the NLP resources that shape process_text output.
+    
+    Versions are read from installed package metadata, so this neither imports
+    SpaCy nor loads the model.
+    
+    Returns:
+        str: Version key combining the spaCy, model and NLTK versions
+    """
+    return 'spacy-{}_{}-{}_nltk-{}'.format(
+        _package_version('spacy'), SPACY_MODEL, _package_version(SPACY_MODEL), nltk.__version__
+    )
+
+def _package_version(name: str) -> str:
+    """Return the installed version of a package, or '' if it is missing."""
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return ''
 
 # PUBLIC_INTERFACE
-def process_text(text: str) -> Dict[str, List[str]]:
+def process_text(
+    text: str,
+    outputs: Iterable[str] = ALL_OUTPUTS,
+    chunk_chars: int = DEFAULT_CHUNK_CHARS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    n_process: int = 1
+) -> Dict[str, List[str]]:
     """
     Process text using NLP techniques.
     
+    The text is split into paragraph-sized chunks that are streamed through
+    nlp.pipe, so memory stays bounded by a batch of chunks rather than the
+    whole document and spaCy's max_length never applies to the document as
+    a whole. Pipeline components not needed for the requested outputs are
+    disabled.
+    
     Args:
         text (str): Input text to process
+        outputs (Iterable[str]): Elements to compute, any of 'sentences',
+            'keywords' and 'entities'; the others are returned empty
+        chunk_chars (int): Target maximum size of a chunk in characters
+        batch_size (int): Number of chunks spaCy processes per batch
+        n_process (int): Number of processes spaCy uses for the pipeline
         
     Returns:
         Dict[str, List[str]]: Dictionary containing processed text elements
@@ -32,31 +235,328 @@ def process_text(text: str) -> Dict[str, List[str]]:
                 'entities': List of named entities
             }
     """
-    # Process with SpaCy
-    doc = nlp(text)
+    outputs = set(outputs)
+    chunks = _split_chunks(text, chunk_chars)
     
     # Extract sentences using NLTK for better sentence boundary detection
-    sentences = sent_tokenize(text)
+    sentences = []
+    if 'sentences' in outputs:
+        tokenizer = get_sentence_tokenizer()
+        for chunk in chunks:
+            sentences.extend(tokenizer.tokenize(chunk))
+    
+    keywords = set()
+    entities = set()
+    if outputs & {'keywords', 'entities'}:
+        stop_words = get_stopwords()
+        docs = get_nlp().pipe(
+            chunks,
+            batch_size=batch_size,
+            n_process=n_process,
+            disable=_unused_components(outputs)
+        )
+        for doc in docs:
+            # Extract keywords (excluding stopwords)
+            if 'keywords' in outputs:
+                keywords.update(_keywords(doc, stop_words))
+            
+            # Extract named entities
+            if 'entities' in outputs:
+                entities.update(ent.text for ent in doc.ents)
+    
+    return {
+        'sentences': sentences,
+        'keywords': list(keywords),
+        'entities': list(entities)
+    }
+
+# PUBLIC_INTERFACE
+def iter_processed_pages(
+    pages: Iterable[Tuple[int, str]],
+    outputs: Iterable[str] = ALL_OUTPUTS,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[Dict]:
+    """
+    Process page texts in a single streaming pass, emitting results as they go.
     
-    # Extract keywords (excluding stopwords)
-    stop_words = set(stopwords.words('english'))
-    keywords = [token.text.lower() for token in doc
-               if not token.is_stop and not token.is_punct and token.text.lower() not in stop_words]
+    Pages are consumed one at a time (for example straight from
+    pdf_processor.iter_pages), so peak memory is bounded by a page rather than
+    the document. A sentence running over a page break is held back until the
+    next page completes it and is attributed to the page it starts on.
     
-    # Extract named entities
-    entities = [ent.text for ent in doc.ents]
+    Args:
+        pages (Iterable[Tuple[int, str]]): (page number, page text) pairs in
+            document order
+        outputs (Iterable[str]): Elements to compute (see process_text)
+        batch_size (int): Number of pages spaCy processes per batch
+        
+    Yields:
+        Dict: One event per result, with a 'type' of
+            'sentence': {'text': sentence, 'page': page it starts on,
+                'offset': character offset of its start in that page's text},
+            'keywords': {'page': page, 'counts': keyword occurrence counts},
+            'entities': {'page': page, 'entities': entity texts}
+    """
+    outputs = set(outputs)
+    if outputs & {'keywords', 'entities'}:
+        stop_words = get_stopwords()
+        docs = get_nlp().pipe(
+            ((text, number) for number, text in pages),
+            as_tuples=True,
+            batch_size=batch_size,
+            disable=_unused_components(outputs)
+        )
+        stream = ((number, doc.text, doc) for doc, number in docs)
+    else:
+        stream = ((number, text, None) for number, text in pages)
+    
+    segmenter = _SentenceSegmenter(get_sentence_tokenizer()) if 'sentences' in outputs else None
+    for number, text, doc in stream:
+        if segmenter is not None:
+            for sentence, page, offset in segmenter.feed(text, number):
+                yield {'type': 'sentence', 'text': sentence, 'page': page, 'offset': offset}
+        if doc is not None and 'keywords' in outputs:
+            yield {'type': 'keywords', 'page': number, 'counts': Counter(_keywords(doc, stop_words))}
+        if doc is not None and 'entities' in outputs:
+            yield {'type': 'entities', 'page': number, 'entities': [ent.text for ent in doc.ents]}
+    
+    if segmenter is not None:
+        for sentence, page, offset in segmenter.flush():
+            yield {'type': 'sentence', 'text': sentence, 'page': page, 'offset': offset}
+
+# PUBLIC_INTERFACE
+def process_pages(
+    pages: Iterable[Tuple[int, str]],
+    outputs: Iterable[str] = ALL_OUTPUTS,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Dict[str, List]:
+    """
+    Process a document page by page (see iter_processed_pages).
+    
+    Args:
+        pages (Iterable[Tuple[int, str]]): (page number, page text) pairs in
+            document order
+        outputs (Iterable[str]): Elements to compute (see process_text)
+        batch_size (int): Number of pages spaCy processes per batch
+        
+    Returns:
+        Dict[str, List]: The process_text elements, plus 'pages' holding the
+            page number each sentence starts on and 'offsets' holding its
+            character offset in that page's text
+    """
+    sentences = []
+    sentence_pages = []
+    sentence_offsets = []
+    keywords = set()
+    entities = set()
+    for event in iter_processed_pages(pages, outputs, batch_size):
+        if event['type'] == 'sentence':
+            sentences.append(event['text'])
+            sentence_pages.append(event['page'])
+            sentence_offsets.append(event['offset'])
+        elif event['type'] == 'keywords':
+            keywords.update(event['counts'])
+        else:
+            entities.update(event['entities'])
     
     return {
         'sentences': sentences,
-        'keywords': list(set(keywords)),  # Remove duplicates
-        'entities': list(set(entities))   # Remove duplicates
+        'keywords': list(keywords),
+        'entities': list(entities),
+        'pages': sentence_pages,
+        'offsets': sentence_offsets
     }
 
+class _SentenceSegmenter:
+    """Incremental punkt segmentation carrying unfinished sentences across pages."""
+    
+    def __init__(self, tokenizer):
+        """
+        Initialize the segmenter.
+        
+        Args:
+            tokenizer: Punkt tokenizer providing span_tokenize
+        """
+        self._tokenizer = tokenizer
+        self._carry = ''
+        self._carry_page = 0
+        self._carry_offset = 0
+    
+    def feed(self, text: str, page: int) -> List[Tuple[str, int, int]]:
+        """
+        Segment the next page, returning the sentences it completes.
+        
+        Args:
+            text (str): Page text
+            page (int): Page number
+            
+        Returns:
+            List[Tuple[str, int, int]]: (sentence, page it starts on,
+                character offset of its start in that page's text) triples
+        """
+        carry_length = len(self._carry)
+        pending = self._carry + '\n' + text if self._carry else text
+        # Offset of the page text within pending
+        base = carry_length + 1 if self._carry else 0
+        spans = list(self._tokenizer.span_tokenize(pending))
+        if not spans:
+            return []
+        
+        # The last sentence may continue on the next page unless it ends
+        # with terminal punctuation; bound how much text is held back
+        start, end = spans[-1]
+        held = None
+        if not _SENTENCE_TERMINAL.search(pending[start:end]) and end - start <= MAX_CARRY_CHARS:
+            held = spans.pop()
+        
+        sentences = [
+            (pending[start:end],) + self._origin(start, base, page)
+            for start, end in spans
+        ]
+        if held is None:
+            self._carry = ''
+        else:
+            self._carry_page, self._carry_offset = self._origin(held[0], base, page)
+            self._carry = pending[held[0]:held[1]]
+        return sentences
+    
+    def flush(self) -> List[Tuple[str, int, int]]:
+        """
+        Emit the sentence still held back at the end of the document.
+        
+        Returns:
+            List[Tuple[str, int, int]]: The final (sentence, page, offset)
+                triple, if any
+        """
+        sentences = [(self._carry, self._carry_page, self._carry_offset)] if self._carry else []
+        self._carry = ''
+        return sentences
+    
+    def _origin(self, start: int, base: int, page: int) -> Tuple[int, int]:
+        """
+        Locate a sentence starting at a position of the pending text.
+        
+        Args:
+            start (int): Start of the sentence in the pending text
+            base (int): Start of the current page's text in the pending text
+            page (int): Current page number
+            
+        Returns:
+            Tuple[int, int]: Page the sentence starts on and its offset there
+        """
+        if start < base:
+            return self._carry_page, self._carry_offset + start
+        return page, start - base
+
+def _keywords(doc, stop_words: frozenset) -> Iterator[str]:
+    """
+    Yield the lowercase keywords of a SpaCy Doc (excluding stopwords).
+    
+    Args:
+        doc (spacy.tokens.Doc): Processed text
+        stop_words (frozenset): Stopwords to exclude
+        
+    Yields:
+        str: Each keyword occurrence
+    """
+    for token in doc:
+        if token.is_stop or token.is_punct or token.is_space:
+            continue
+        word = token.text.lower()
+        if word not in stop_words:
+            yield word
+
+def _unused_components(outputs: Set[str]) -> List[str]:
+    """
+    List the pipeline components not needed for the requested outputs.
+    
+    Keywords only use lexical token attributes, so they need no component;
+    entities need the NER component and any shared tok2vec it listens to.
+    
+    Args:
+        outputs (Set[str]): Requested process_text outputs
+        
+    Returns:
+        List[str]: Names of the components to disable
+    """
+    nlp = get_nlp()
+    required = set()
+    if 'entities' in outputs and 'ner' in nlp.pipe_names:
+        required.add('ner')
+        for name in nlp.pipe_names:
+            listeners = getattr(nlp.get_pipe(name), 'listening_components', [])
+            if 'ner' in listeners:
+                required.add(name)
+    return [name for name in nlp.pipe_names if name not in required]
+
+def _split_chunks(text: str, chunk_chars: int) -> List[str]:
+    """
+    Split text into chunks of at most about chunk_chars characters.
+    
+    Paragraphs (separated by blank lines) are packed together; a paragraph
+    longer than chunk_chars is cut after the last sentence end, or failing
+    that the last whitespace, before the limit.
+    
+    Args:
+        text (str): Text to split
+        chunk_chars (int): Target maximum size of a chunk in characters
+        
+    Returns:
+        List[str]: Non-empty chunks in document order
+    """
+    chunks = []
+    current = ''
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = paragraph.strip()
+        while len(paragraph) > chunk_chars:
+            ends = [match.end() for match in _SENTENCE_END.finditer(paragraph, 0, chunk_chars)]
+            cut = ends[-1] if ends else 0
+            if cut <= 0:
+                cut = paragraph.rfind(' ', 0, chunk_chars)
+            if cut <= 0:
+                cut = chunk_chars
+            if current:
+                chunks.append(current)
+                current = ''
+            chunks.append(paragraph[:cut].strip())
+            paragraph = paragraph[cut:].strip()
+        if not paragraph:
+            continue
+        if current and len(current) + len(paragraph) + 2 > chunk_chars:
+            chunks.append(current)
+            current = ''
+        current = current + '\n\n' + paragraph if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+# PUBLIC_INTERFACE
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for cache lookups.
+    
+    Case, surrounding whitespace, runs of internal whitespace and trailing
+    punctuation do not change the analysis key.
+    
+    Args:
+        query (str): User's query text
+        
+    Returns:
+        str: Normalized query text
+    """
+    return ' '.join(query.lower().split()).rstrip('?!. ')
+
 # PUBLIC_INTERFACE
 def analyze_query(query: str) -> Dict[str, str]:
     """
     Analyze a user query to understand its intent and key components.
     
+    Results are cached on the normalized query text, so repeated queries
+    skip the SpaCy parse entirely. Keyword queries (a few words without
+    stopwords, such as "warranty period") are never parsed: their words
+    are the focus. Other queries are parsed for their first subject or
+    object noun chunk.
+    
     Args:
         query (str): User's query text
         
@@ -67,24 +567,124 @@ def analyze_query(query: str) -> Dict[str, str]:
                 'focus': Main focus/subject of the query
             }
     """
-    doc = nlp(query)
+    key = normalize_query(query)
+    analysis = _query_cache.get(key)
+    if analysis is None:
+        with metrics.stage('query_analysis'):
+            analysis = _analyze_query(query)
+        _query_cache.put(key, analysis)
+    return dict(analysis)
+
+# PUBLIC_INTERFACE
+def analyze_queries(queries: Sequence[str]) -> List[Dict[str, str]]:
+    """
+    Analyze many queries at once.
     
-    # Simple intent detection based on question words
-    question_words = {'what', 'why', 'how', 'when', 'where', 'who'}
-    intent = 'statement'
-    for token in doc:
-        if token.text.lower() in question_words:
-            intent = 'question'
-            break
+    Queries are looked up in the analyze_query cache by their normalized
+    text; the distinct ones missing from it are parsed together through
+    nlp.pipe, which is much cheaper than parsing them one by one.
+    
+    Args:
+        queries (Sequence[str]): Users' query texts
+        
+    Returns:
+        List[Dict[str, str]]: Query analysis of each query, in order (see
+            analyze_query)
+    """
+    keys = [normalize_query(query) for query in queries]
+    analyses: Dict[str, Dict[str, str]] = {}
+    missing: Dict[str, str] = {}
+    for key, query in zip(keys, queries):
+        if key in analyses or key in missing:
+            continue
+        analysis = _query_cache.get(key)
+        if analysis is None:
+            missing[key] = query
+        else:
+            analyses[key] = analysis
     
-    # Extract the main focus (subject) of the query
-    focus = ''
-    for chunk in doc.noun_chunks:
-        if chunk.root.dep_ in {'nsubj', 'dobj', 'pobj'}:
-            focus = chunk.text
-            break
+    if missing:
+        with metrics.stage('query_analysis'):
+            parsed = _analyze_query_batch(list(missing.values()))
+        for key, analysis in zip(missing, parsed):
+            _query_cache.put(key, analysis)
+            analyses[key] = analysis
+    return [dict(analyses[key]) for key in keys]
+
+# PUBLIC_INTERFACE
+def query_cache_stats() -> Dict[str, int]:
+    """
+    Report usage of the analyze_query cache.
     
-    return {
-        'intent': intent,
-        'focus': focus
-    }
\ No newline at end of file
+    Returns:
+        Dict[str, int]: Hit, miss and size counters (see LRUCache.stats)
+    """
+    return _query_cache.stats()
+
+def _analyze_query(query: str) -> Dict[str, str]:
+    """
+    Analyze a query without consulting the cache.
+    
+    Intent comes from a plain scan for question words; the dependency
+    parser only runs for queries with words that are not keyword queries.
+    
+    Args:
+        query (str): User's query text
+        
+    Returns:
+        Dict[str, str]: Query analysis (see analyze_query)
+    """
+    return _analyze_query_batch([query])[0]
+
+def _analyze_query_batch(queries: List[str], batch_size: int = QUERY_BATCH_SIZE) -> List[Dict[str, str]]:
+    """
+    Analyze queries without consulting the cache, parsing them together.
+    
+    Args:
+        queries (List[str]): Users' query texts
+        batch_size (int): Number of queries spaCy parses per batch
+        
+    Returns:
+        List[Dict[str, str]]: Query analysis of each query (see analyze_query)
+    """
+    analyses = []
+    parse = []
+    for query in queries:
+        # Simple intent detection based on question words
+        words = _WORD_PATTERN.findall(query.lower())
+        intent = 'question' if QUESTION_WORDS.intersection(words) else 'statement'
+        analyses.append({'intent': intent, 'focus': ''})
+        if _is_keyword_query(words):
+            # Nothing for the parser to find but the words themselves
+            analyses[-1]['focus'] = ' '.join(_WORD_PATTERN.findall(query))
+        elif words:
+            parse.append(len(analyses) - 1)
+    
+    # Extract the main focus (subject) of the other queries with words in them
+    if parse:
+        nlp = get_nlp()
+        docs = nlp.pipe(
+            (queries[position] for position in parse),
+            batch_size=batch_size,
+            disable=[name for name in ('ner', 'lemmatizer') if name in nlp.pipe_names]
+        )
+        for position, doc in zip(parse, docs):
+            for chunk in doc.noun_chunks:
+                if chunk.root.dep_ in {'nsubj', 'dobj', 'pobj'}:
+                    analyses[position]['focus'] = chunk.text
+                    break
+    
+    return analyses
+
+def _is_keyword_query(words: List[str]) -> bool:
+    """
+    Check whether a query's words are all focus words.
+    
+    Args:
+        words (List[str]): Lowercase words of the query
+        
+    Returns:
+        bool: True for one to KEYWORD_QUERY_MAX_WORDS words, none of them
+            stopwords (question words included)
+    """
+    return 0 < len(words) <= KEYWORD_QUERY_MAX_WORDS and get_stopwords().isdisjoint(words)
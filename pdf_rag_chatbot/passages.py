@@ -0,0 +1,120 @@
+"""Passage chunking of a document's sentences for coarse-to-fine retrieval."""
+from typing import Dict, List, Sequence, Tuple
+
+# Token budget of a passage, and how many of its tokens it may share with
+# the previous passage (always whole sentences)
+PASSAGE_TOKENS = 128
+PASSAGE_OVERLAP = 32
+
+# PUBLIC_INTERFACE
+def chunk_sentences(
+    lengths: Sequence[int],
+    max_tokens: int = PASSAGE_TOKENS,
+    overlap: int = PASSAGE_OVERLAP
+) -> List[Tuple[int, int]]:
+    """
+    Group consecutive sentences into overlapping, token-budgeted passages.
+
+    Each passage takes whole sentences while they fit in max_tokens (a
+    longer sentence forms a passage on its own). The next passage starts
+    with the trailing sentences of the previous one that fit in overlap
+    tokens, as long as its first new sentence still fits as well, so every
+    passage adds at least one sentence and passage starts and stops both
+    increase strictly.
+
+    Args:
+        lengths (Sequence[int]): Number of index terms in each sentence
+        max_tokens (int): Token budget of a passage
+        overlap (int): Token budget of the sentences shared with the
+            previous passage
+
+    Returns:
+        List[Tuple[int, int]]: (first sentence id, stop sentence id) range
+            of each passage, in document order
+    """
+    bounds = []
+    count = len(lengths)
+    start = 0
+    while start < count:
+        stop = start + 1
+        total = lengths[start]
+        while stop < count and total + lengths[stop] <= max_tokens:
+            total += lengths[stop]
+            stop += 1
+        bounds.append((start, stop))
+        if stop >= count:
+            break
+
+        next_start = stop
+        shared = 0
+        while (
+            next_start - 1 > start
+            and shared + lengths[next_start - 1] <= overlap
+            and shared + lengths[next_start - 1] + lengths[stop] <= max_tokens
+        ):
+            next_start -= 1
+            shared += lengths[next_start]
+        start = next_start
+    return bounds
+
+# PUBLIC_INTERFACE
+def build_passages(
+    index: Dict,
+    max_tokens: int = PASSAGE_TOKENS,
+    overlap: int = PASSAGE_OVERLAP
+) -> Dict:
+    """
+    Chunk a document into passages and index them for retrieval.
+
+    Passages are stored as sentence ranges only: their text, pages and
+    character offsets are those of their sentences, so nothing is copied.
+    The passage index is derived from the sentence index by summing the
+    term frequencies of each passage's sentences, without tokenizing the
+    document again; it shares the sentence index's fuzzy term index, as
+    both have the same vocabulary.
+
+    Args:
+        index (Dict): Sentence index produced by text_index.build_index
+        max_tokens (int): Token budget of a passage
+        overlap (int): Tokens a passage may share with the previous one
+
+    Returns:
+        Dict: Passages of the document
+            {
+                'bounds': (first sentence id, stop sentence id) per passage,
+                'index': Inverted index over the passages, in the format of
+                    text_index.build_index
+            }
+    """
+    sentence_lengths = index['lengths']
+    bounds = chunk_sentences(sentence_lengths, max_tokens, overlap)
+
+    # Passages containing each sentence form a contiguous id range
+    first_passage = [0] * len(sentence_lengths)
+    stop_passage = [0] * len(sentence_lengths)
+    for passage_id, (start, stop) in enumerate(bounds):
+        for sentence_id in range(start, stop):
+            if stop_passage[sentence_id] == 0:
+                first_passage[sentence_id] = passage_id
+            stop_passage[sentence_id] = passage_id + 1
+
+    # Sentence ids ascend in a posting list, and so do their passage ids
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+    for term, sentence_postings in index['postings'].items():
+        frequencies: Dict[int, int] = {}
+        for sentence_id, frequency in sentence_postings:
+            for passage_id in range(first_passage[sentence_id], stop_passage[sentence_id]):
+                frequencies[passage_id] = frequencies.get(passage_id, 0) + frequency
+        postings[term] = list(frequencies.items())
+
+    lengths = [sum(sentence_lengths[start:stop]) for start, stop in bounds]
+    size = len(bounds)
+    passage_index = {
+        'postings': postings,
+        'lengths': lengths,
+        'avg_length': (sum(lengths) / size) if size else 0.0,
+        'size': size
+    }
+    if 'fuzzy' in index:
+        passage_index['fuzzy'] = index['fuzzy']
+    return {'bounds': bounds, 'index': passage_index}
@@ -1,29 +1,800 @@
 """PDF processing module for handling PDF uploads and text extraction."""
+import multiprocessing
 import os
-from typing import Dict, Optional
+import threading
+import time
+from io import BytesIO
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
 from PyPDF2 import PdfReader
+import metrics
+
+# A PDF given either as a file path or as the raw bytes of an in-memory upload
+PdfSource = Union[str, bytes]
+
+# Documents with at least this many pages are split across worker processes
+PARALLEL_PAGE_THRESHOLD = 32
+
+# Seconds an extraction helper process may take to start
+_HELPER_START_TIMEOUT = 60.0
+
+# Idle extraction helpers kept for later documents, per process
+_MAX_IDLE_HELPERS = os.cpu_count() or 1
+_idle_helpers: List['_ExtractionHelper'] = []
+_helpers_pid: Optional[int] = None
+_helpers_lock = threading.Lock()
+
+# Backend used unless another is selected, and as the fallback of the others
+DEFAULT_EXTRACTOR = 'pypdf2'
+
+# PUBLIC_INTERFACE
+class PdfExtractor:
+    """
+    Text extraction backend.
+
+    A backend opens a document once and extracts its pages by index, so the
+    pipeline can spread pages over worker processes and time out or fall
+    back page by page. Backends are registered by name in EXTRACTORS.
+    """
+
+    name = ''
+
+    def open(self, source: PdfSource) -> Any:
+        """
+        Open a document.
+
+        Args:
+            source (PdfSource): Path to the PDF file, or its raw bytes
+
+        Returns:
+            Any: Backend-specific document handle
+
+        Raises:
+            Exception: If the file cannot be parsed as a PDF
+        """
+        raise NotImplementedError
+
+    def page_count(self, document: Any) -> int:
+        """
+        Count the pages of an opened document.
+
+        Args:
+            document (Any): Handle returned by open
+
+        Returns:
+            int: Number of pages
+        """
+        raise NotImplementedError
+
+    def page_text(self, document: Any, index: int) -> str:
+        """
+        Extract the text of one page.
+
+        Args:
+            document (Any): Handle returned by open
+            index (int): 0-based page index
+
+        Returns:
+            str: Page text, one line per text line
+        """
+        raise NotImplementedError
+
+# PUBLIC_INTERFACE
+class PyPDF2Extractor(PdfExtractor):
+    """Pure-Python extraction through PyPDF2, reading text in content stream order."""
+
+    name = 'pypdf2'
+
+    def open(self, source: PdfSource) -> PdfReader:
+        """Open a PdfReader (see PdfExtractor.open)."""
+        return _open_reader(source)
+
+    def page_count(self, document: PdfReader) -> int:
+        """Count the pages (see PdfExtractor.page_count)."""
+        return len(document.pages)
+
+    def page_text(self, document: PdfReader, index: int) -> str:
+        """Extract a page's text (see PdfExtractor.page_text)."""
+        return document.pages[index].extract_text()
+
+# PUBLIC_INTERFACE
+class PyMuPDFExtractor(PdfExtractor):
+    """
+    Extraction through MuPDF, several times faster than PyPDF2 on typeset pages.
+
+    Layout-aware: text lines are read column by column (see
+    _reading_order) rather than in content stream order, which interleaves
+    the columns of some multi-column documents. PyMuPDF is an optional,
+    AGPL-licensed dependency (pip install pymupdf), imported on first use.
+    """
+
+    name = 'pymupdf'
+
+    def __init__(self):
+        """
+        Initialize the backend.
+
+        Raises:
+            ImportError: If PyMuPDF is not installed
+        """
+        try:
+            import pymupdf
+        except ImportError:
+            import fitz as pymupdf  # releases before 1.24 only ship the fitz name
+        self._pymupdf = pymupdf
+
+    def open(self, source: PdfSource) -> Any:
+        """Open a MuPDF document (see PdfExtractor.open)."""
+        if isinstance(source, bytes):
+            return self._pymupdf.open(stream=source, filetype='pdf')
+        return self._pymupdf.open(source, filetype='pdf')
+
+    def page_count(self, document: Any) -> int:
+        """Count the pages (see PdfExtractor.page_count)."""
+        return document.page_count
+
+    def page_text(self, document: Any, index: int) -> str:
+        """Extract a page's text in reading order (see PdfExtractor.page_text)."""
+        page = document[index]
+        # Text-only flags: images are neither decoded nor copied into the dict
+        content = page.get_text('dict', flags=self._pymupdf.TEXTFLAGS_TEXT)
+        lines = [
+            (*line['bbox'], ''.join(span['text'] for span in line['spans']))
+            for block in content['blocks']
+            for line in block['lines']
+        ]
+        return '\n'.join(line[4] for line in _reading_order(lines, page.rect.width))
+
+# Extraction backends by name, for get_extractor and the PDF_EXTRACTOR setting
+EXTRACTORS: Dict[str, Type[PdfExtractor]] = {
+    PyPDF2Extractor.name: PyPDF2Extractor,
+    PyMuPDFExtractor.name: PyMuPDFExtractor
+}
+
+# PUBLIC_INTERFACE
+def get_extractor(name: str = DEFAULT_EXTRACTOR) -> PdfExtractor:
+    """
+    Create an extraction backend by name.
+
+    Args:
+        name (str): Key of EXTRACTORS
+
+    Returns:
+        PdfExtractor: The backend
+
+    Raises:
+        ValueError: If no backend has that name
+        ImportError: If the backend's library is not installed
+    """
+    try:
+        extractor_class = EXTRACTORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown PDF extractor '{name}'; expected one of {sorted(EXTRACTORS)}") from None
+    return extractor_class()
+
+# PUBLIC_INTERFACE
+def iter_pages(
+    source: PdfSource,
+    workers: Optional[int] = None,
+    extractor: str = DEFAULT_EXTRACTOR,
+    page_timeout: Optional[float] = None
+) -> Iterator[Tuple[int, str]]:
+    """
+    Extract text from a PDF file page by page.
+    
+    Pages are yielded in order as soon as they are extracted. Large documents
+    are split into contiguous page ranges extracted by worker processes,
+    each parsing the file independently. With a page timeout, every
+    document is extracted in worker processes, which are kept between
+    documents, so a page running past it can be abandoned by killing its
+    process, from any thread and whatever code the page is stuck in.
+    
+    A page whose extraction fails or runs past page_timeout is extracted
+    again with the default backend when another one was selected, and is
+    otherwise left empty, so one pathological page cannot stall or fail
+    the document.
+    
+    Args:
+        source (PdfSource): Path to the PDF file, or its raw bytes
+        workers (Optional[int]): Number of worker processes; defaults to the
+            CPU count for documents of PARALLEL_PAGE_THRESHOLD pages or more,
+            and to one (or a single in-process pass without a page timeout)
+            otherwise
+        extractor (str): Name of the extraction backend (see EXTRACTORS)
+        page_timeout (Optional[float]): Seconds allowed per page, or None
+            for no limit
+        
+    Yields:
+        Tuple[int, str]: 1-based page number and the text of that page
+        
+    Raises:
+        Exception: If the file cannot be parsed as a PDF
+    """
+    backend = get_extractor(extractor)
+    for number, text, _ in _iter_page_results(backend, backend.open(source), source, workers, page_timeout):
+        yield number, text
 
 # PUBLIC_INTERFACE
-def extract_text_from_pdf(file_path: str) -> Optional[str]:
+def extract_text_from_pdf(
+    source: PdfSource,
+    workers: Optional[int] = None,
+    extractor: str = DEFAULT_EXTRACTOR,
+    page_timeout: Optional[float] = None
+) -> Optional[str]:
     """
     Extract text content from a PDF file.
     
     Args:
-        file_path (str): Path to the PDF file
+        source (PdfSource): Path to the PDF file, or its raw bytes
+        workers (Optional[int]): Number of worker processes (see iter_pages)
+        extractor (str): Name of the extraction backend (see EXTRACTORS)
+        page_timeout (Optional[float]): Seconds allowed per page (see iter_pages)
         
     Returns:
         Optional[str]: Extracted text content or None if extraction fails
     """
     try:
-        reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
+        return "\n".join(text for _, text in iter_pages(source, workers, extractor, page_timeout)).strip()
     except Exception as e:
         print(f"Error extracting text from PDF: {e}")
         return None
 
+# PUBLIC_INTERFACE
+def stream_pdf(
+    source: PdfSource,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    extractor: str = DEFAULT_EXTRACTOR,
+    page_timeout: Optional[float] = None
+) -> Dict:
+    """
+    Validate a PDF, then extract its pages lazily as they are consumed.
+    
+    The document is opened and its page tree resolved up front, so invalid
+    uploads are rejected before any page is read. Pages are then extracted
+    one at a time as the caller iterates over them (for example straight
+    into nlp_processor.iter_processed_pages), so nothing accumulates here.
+    
+    Args:
+        source (PdfSource): Path to the PDF file, or its raw bytes
+        workers (Optional[int]): Number of worker processes (see iter_pages)
+        progress (Optional[Callable[[int, int], None]]): Called with the
+            number of pages extracted so far and the page count after each page
+        extractor (str): Name of the extraction backend (see EXTRACTORS)
+        page_timeout (Optional[float]): Seconds allowed per page (see iter_pages)
+        
+    Returns:
+        Dict: Extraction state
+            {
+                'valid': bool,
+                'error': str (if any); set during iteration if extraction
+                    fails part way, which ends the pages,
+                'pages': Iterator of (page number, page text) pairs, empty
+                    for an invalid PDF,
+                'fallbacks': {'page', 'reason'} for each page whose extraction
+                    hit a 'timeout' or an 'error' (see iter_pages), filled
+                    during iteration,
+                'timings': Milliseconds spent in 'parse', and in 'extract'
+                    once the pages are consumed (time spent producing pages
+                    only, not in the caller)
+            }
+        
+    Raises:
+        ValueError: If the extraction backend is unknown
+        ImportError: If the extraction backend's library is not installed
+    """
+    timings = {}
+    result = {'valid': False, 'error': '', 'pages': iter(()), 'fallbacks': [], 'timings': timings}
+    backend = get_extractor(extractor)
+    
+    start = time.perf_counter()
+    try:
+        document = backend.open(source)
+        # Resolving the page tree surfaces structural errors up front
+        page_count = backend.page_count(document)
+    except Exception as e:
+        result['error'] = f'Invalid PDF file: {str(e)}'
+        return result
+    finally:
+        timings['parse'] = (time.perf_counter() - start) * 1000
+        metrics.observe('parse', timings['parse'] / 1000)
+    result['valid'] = True
+    result['pages'] = _stream_pages(backend, document, source, workers, page_timeout, page_count, progress, result)
+    return result
+
+# PUBLIC_INTERFACE
+def ingest_pdf(
+    source: PdfSource,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    extractor: str = DEFAULT_EXTRACTOR,
+    page_timeout: Optional[float] = None
+) -> Dict:
+    """
+    Validate a PDF and extract its text in a single pass.
+    
+    The document is opened once for both validation and extraction, so the
+    xref table and trailer are parsed once. Uploads can be ingested straight
+    from memory without being written to disk first. Use stream_pdf to
+    process pages without holding the whole document.
+    
+    Args:
+        source (PdfSource): Path to the PDF file, or its raw bytes
+        workers (Optional[int]): Number of worker processes (see iter_pages)
+        progress (Optional[Callable[[int, int], None]]): Called with the
+            number of pages extracted so far and the page count after each page
+        extractor (str): Name of the extraction backend (see EXTRACTORS)
+        page_timeout (Optional[float]): Seconds allowed per page (see iter_pages)
+        
+    Returns:
+        Dict: Ingestion results
+            {
+                'valid': bool,
+                'error': str (if any),
+                'pages': List of page texts,
+                'text': Extracted text content,
+                'fallbacks': {'page', 'reason'} for each page whose extraction
+                    hit a 'timeout' or an 'error' (see iter_pages),
+                'timings': Milliseconds spent in each stage ('parse', 'extract')
+            }
+        
+    Raises:
+        ValueError: If the extraction backend is unknown
+        ImportError: If the extraction backend's library is not installed
+    """
+    result = stream_pdf(source, workers, progress, extractor, page_timeout)
+    result['pages'] = [text for _, text in result['pages']]
+    result['text'] = "\n".join(result['pages']).strip()
+    return result
+
+def _stream_pages(
+    backend: PdfExtractor,
+    document: Any,
+    source: PdfSource,
+    workers: Optional[int],
+    page_timeout: Optional[float],
+    page_count: int,
+    progress: Optional[Callable[[int, int], None]],
+    result: Dict
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yield the pages of an opened document for stream_pdf, recording its state.
+    
+    Args:
+        backend (PdfExtractor): Extraction backend
+        document (Any): Document opened by the backend
+        source (PdfSource): Path to the PDF file, or its raw bytes
+        workers (Optional[int]): Number of worker processes (see iter_pages)
+        page_timeout (Optional[float]): Seconds allowed per page
+        page_count (int): Number of pages in the document
+        progress (Optional[Callable[[int, int], None]]): Progress callback
+        result (Dict): State returned by stream_pdf, updated in place
+        
+    Yields:
+        Tuple[int, str]: 1-based page number and the text of that page
+    """
+    timings = result['timings']
+    timings['extract'] = 0.0
+    start = time.perf_counter()
+    try:
+        for number, text, fallback in _iter_page_results(backend, document, source, workers, page_timeout):
+            elapsed = time.perf_counter() - start
+            metrics.observe('extract_page', elapsed)
+            timings['extract'] += elapsed * 1000
+            if fallback is not None:
+                result['fallbacks'].append({'page': number, 'reason': fallback})
+            if progress is not None:
+                progress(number, page_count)
+            yield number, text
+            start = time.perf_counter()
+    except Exception as e:
+        timings['extract'] += (time.perf_counter() - start) * 1000
+        result['error'] = f'Failed to extract text from PDF: {str(e)}'
+
+def _open_reader(source: PdfSource) -> PdfReader:
+    """
+    Create a PdfReader over a file path or in-memory bytes.
+    
+    Args:
+        source (PdfSource): Path to the PDF file, or its raw bytes
+        
+    Returns:
+        PdfReader: Reader over the document
+    """
+    return PdfReader(BytesIO(source) if isinstance(source, bytes) else source)
+
+def _iter_page_results(
+    extractor: PdfExtractor,
+    document: Any,
+    source: PdfSource,
+    workers: Optional[int],
+    page_timeout: Optional[float]
+) -> Iterator[Tuple[int, str, Optional[str]]]:
+    """
+    Yield the page texts of an opened document (see iter_pages).
+    
+    Args:
+        extractor (PdfExtractor): Backend the document was opened with
+        document (Any): Document handle opened over source
+        source (PdfSource): Path or bytes the document was opened from,
+            passed to worker processes in parallel mode
+        workers (Optional[int]): Number of worker processes
+        page_timeout (Optional[float]): Seconds allowed per page
+        
+    Yields:
+        Tuple[int, str, Optional[str]]: 1-based page number, the text of
+            that page, and 'timeout' or 'error' if it needed the fallback
+    """
+    for number, (text, fallback) in enumerate(_extract_pages(extractor, document, source, workers, page_timeout), 1):
+        if fallback is not None:
+            metrics.increment(
+                'extract_page_fallbacks',
+                help_text='Pages whose extraction timed out or failed',
+                reason=fallback
+            )
+        yield number, text, fallback
+
+def _extract_pages(
+    extractor: PdfExtractor,
+    document: Any,
+    source: PdfSource,
+    workers: Optional[int],
+    page_timeout: Optional[float]
+) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Yield the extraction result of every page, in order.
+    
+    Args:
+        extractor (PdfExtractor): Backend the document was opened with
+        document (Any): Document handle opened over source
+        source (PdfSource): Path or bytes the document was opened from
+        workers (Optional[int]): Number of worker processes
+        page_timeout (Optional[float]): Seconds allowed per page
+        
+    Yields:
+        Tuple[str, Optional[str]]: Page text and fallback reason (see
+            _PageReader.read)
+    """
+    page_count = extractor.page_count(document)
+    if workers is None:
+        workers = (os.cpu_count() or 1) if page_count >= PARALLEL_PAGE_THRESHOLD else 1
+    workers = max(1, min(workers, page_count))
+    
+    if workers == 1 and not page_timeout:
+        reader = _PageReader(source, extractor, document)
+        for index in range(page_count):
+            yield reader.read(index)
+        return
+    yield from _extract_in_helpers(extractor, source, page_count, workers, page_timeout)
+
+def _extract_in_helpers(
+    extractor: PdfExtractor,
+    source: PdfSource,
+    page_count: int,
+    workers: int,
+    page_timeout: Optional[float]
+) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Extract pages in extraction helper processes, enforcing the page timeout.
+    
+    Each helper is given a contiguous range of pages, which keeps its page
+    access sequential, and is asked for one page at a time. A helper that
+    runs past page_timeout (or dies) is killed, whatever code it is stuck
+    in, and replaced: the page is then extracted with the default backend
+    when another one was selected, and is otherwise left empty.
+    
+    Args:
+        extractor (PdfExtractor): Backend selected for the document
+        source (PdfSource): Path to the PDF file, or its raw bytes
+        page_count (int): Number of pages in the document
+        workers (int): Number of helpers to extract with
+        page_timeout (Optional[float]): Seconds allowed per page, or None
+        
+    Yields:
+        Tuple[str, Optional[str]]: Page text and fallback reason (see
+            _PageReader.read)
+    """
+    step = -(-page_count // workers)
+    ranges = [iter(range(start, min(start + step, page_count))) for start in range(0, page_count, step)]
+    helpers: List[_ExtractionHelper] = []
+    # Helper slot -> (page index, fallback reason of a retry, deadline)
+    pending: Dict[int, Tuple[int, Optional[str], Optional[float]]] = {}
+    results: Dict[int, Tuple[str, Optional[str]]] = {}
+    
+    def request(slot: int, index: int, reason: Optional[str] = None) -> None:
+        helpers[slot].request(index, reason)
+        pending[slot] = (index, reason, None if not page_timeout else time.monotonic() + page_timeout)
+    
+    def request_next(slot: int) -> None:
+        index = next(ranges[slot], None)
+        if index is not None:
+            request(slot, index)
+    
+    try:
+        # Helpers open the document in parallel before any page is timed
+        for slot in range(len(ranges)):
+            helpers.append(_acquire_helper())
+            helpers[slot].load(source, type(extractor))
+        for slot, helper in enumerate(helpers):
+            helper.wait_ready()
+            request_next(slot)
+        
+        next_index = 0
+        while next_index < page_count:
+            if next_index in results:
+                yield results.pop(next_index)
+                next_index += 1
+                continue
+            
+            deadlines = [deadline for _, _, deadline in pending.values() if deadline is not None]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            ready = wait([helpers[slot].connection for slot in pending], timeout)
+            now = time.monotonic()
+            for slot in list(pending):
+                index, reason, deadline = pending[slot]
+                if helpers[slot].connection in ready:
+                    try:
+                        results[index] = helpers[slot].connection.recv()
+                        del pending[slot]
+                        request_next(slot)
+                        continue
+                    except (EOFError, OSError):
+                        failure = 'error'
+                elif deadline is not None and now >= deadline:
+                    failure = 'timeout'
+                else:
+                    continue
+                
+                # The helper is stuck or gone: replace it, then retry the
+                # page with the default backend or leave it empty
+                del pending[slot]
+                helpers[slot].kill()
+                helpers[slot] = _ExtractionHelper()
+                helpers[slot].load(source, type(extractor))
+                helpers[slot].wait_ready()
+                if reason is None and extractor.name != DEFAULT_EXTRACTOR:
+                    request(slot, index, failure)
+                else:
+                    results[index] = ('', reason or failure)
+                    request_next(slot)
+    finally:
+        # Helpers still working on an abandoned page are not reused
+        for slot, helper in enumerate(helpers):
+            if slot in pending:
+                helper.kill()
+            else:
+                _release_helper(helper)
+
+class _ExtractionHelper:
+    """
+    Long-lived child process extracting the pages it is asked for.
+    
+    Helpers are started with the spawn method, so they do not inherit the
+    threads and loaded models of a server process, and are reused across
+    documents (see _acquire_helper). Killing a helper is the only way to
+    stop a page stuck in native code, which no signal interrupts.
+    """
+    
+    def __init__(self):
+        """
+        Start the process and wait until it serves requests.
+        
+        Raises:
+            RuntimeError: If the process does not start
+        """
+        context = multiprocessing.get_context('spawn')
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_serve_pages, args=(child_connection,), name='pdf-extraction', daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+        self.wait_ready()
+    
+    def load(self, source: PdfSource, extractor_class: Type[PdfExtractor]) -> None:
+        """
+        Start opening the document later page requests are about.
+        
+        Args:
+            source (PdfSource): Path to the PDF file, or its raw bytes
+            extractor_class (Type[PdfExtractor]): Backend to extract with,
+                imported by the helper
+        """
+        self.connection.send(('load', source, extractor_class))
+    
+    def wait_ready(self) -> None:
+        """
+        Wait until the process has started, or has opened the loaded document.
+        
+        Raises:
+            RuntimeError: If it does not get there within _HELPER_START_TIMEOUT
+        """
+        try:
+            if self.connection.poll(_HELPER_START_TIMEOUT):
+                self.connection.recv()
+                return
+        except (EOFError, OSError):
+            pass
+        self.kill()
+        raise RuntimeError('PDF extraction process did not start')
+    
+    def request(self, index: int, reason: Optional[str] = None) -> None:
+        """
+        Ask for a page; its (text, fallback reason) pair arrives on connection.
+        
+        Args:
+            index (int): 0-based page index
+            reason (Optional[str]): None to extract with the loaded backend,
+                or the reason that failed, to extract with the default one
+        """
+        self.connection.send(('page', index, reason))
+    
+    def alive(self) -> bool:
+        """Check whether the process is running."""
+        return self.process.is_alive()
+    
+    def kill(self) -> None:
+        """Stop the process, whatever it is doing."""
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+def _acquire_helper() -> _ExtractionHelper:
+    """
+    Take an idle extraction helper of this process, or start one.
+    
+    Returns:
+        _ExtractionHelper: Helper reserved for the caller
+    """
+    global _helpers_pid
+    with _helpers_lock:
+        # Helpers of a parent process cannot be used after a fork
+        if _helpers_pid != os.getpid():
+            _idle_helpers.clear()
+            _helpers_pid = os.getpid()
+        while _idle_helpers:
+            helper = _idle_helpers.pop()
+            if helper.alive():
+                return helper
+    return _ExtractionHelper()
+
+def _release_helper(helper: _ExtractionHelper) -> None:
+    """
+    Return a helper to the idle helpers, or stop it if enough are idle.
+    
+    Args:
+        helper (_ExtractionHelper): Helper taken with _acquire_helper
+    """
+    with _helpers_lock:
+        if helper.alive() and _helpers_pid == os.getpid() and len(_idle_helpers) < _MAX_IDLE_HELPERS:
+            _idle_helpers.append(helper)
+            return
+    helper.kill()
+
+def _serve_pages(connection: Connection) -> None:
+    """
+    Extract pages on request until the parent process closes the connection.
+    
+    Runs in an extraction helper process (see _ExtractionHelper).
+    
+    Args:
+        connection (Connection): Helper's end of the pipe to its parent
+    """
+    connection.send('ready')
+    reader = None
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError):
+            return
+        if message[0] == 'load':
+            _, source, extractor_class = message
+            try:
+                extractor = extractor_class()
+                reader = _PageReader(source, extractor, extractor.open(source))
+            except Exception:
+                reader = None
+            connection.send('ready')
+            continue
+        
+        _, index, reason = message
+        if reader is None:
+            result = ('', reason or 'error')
+        elif reason is None:
+            result = reader.read(index)
+        else:
+            result = reader.fallback(index, reason)
+        connection.send(result)
+
+class _PageReader:
+    """Page extraction with a fallback backend."""
+    
+    def __init__(self, source: PdfSource, extractor: PdfExtractor, document: Any):
+        """
+        Initialize the reader.
+        
+        Args:
+            source (PdfSource): Path or bytes the document was opened from
+            extractor (PdfExtractor): Backend the document was opened with
+            document (Any): Document handle
+        """
+        self._source = source
+        self._extractor = extractor
+        self._document = document
+        self._fallback: Optional[Tuple[PdfExtractor, Any]] = None
+    
+    def read(self, index: int) -> Tuple[str, Optional[str]]:
+        """
+        Extract one page, falling back to the default backend on failure.
+        
+        Args:
+            index (int): 0-based page index
+            
+        Returns:
+            Tuple[str, Optional[str]]: The page text, and None, or 'timeout'
+                or 'error' when the selected backend failed and the text
+                comes from the default backend (empty if it failed as well)
+        """
+        try:
+            return self._extractor.page_text(self._document, index), None
+        except Exception:
+            return self.fallback(index, 'error')
+    
+    def fallback(self, index: int, reason: str) -> Tuple[str, Optional[str]]:
+        """
+        Extract one page with the default backend after the selected one failed.
+        
+        Args:
+            index (int): 0-based page index
+            reason (str): 'timeout' or 'error', how the selected backend failed
+            
+        Returns:
+            Tuple[str, Optional[str]]: The page text (empty if the default
+                backend failed as well, or is the selected one), and reason
+        """
+        if self._extractor.name != DEFAULT_EXTRACTOR:
+            try:
+                if self._fallback is None:
+                    fallback = get_extractor(DEFAULT_EXTRACTOR)
+                    self._fallback = (fallback, fallback.open(self._source))
+                return self._fallback[0].page_text(self._fallback[1], index), reason
+            except Exception:
+                pass
+        return '', reason
+
+def _reading_order(
+    lines: List[Tuple[float, float, float, float, str]],
+    width: float
+) -> List[Tuple[float, float, float, float, str]]:
+    """
+    Order text lines for reading, one column after the other.
+    
+    Lines are taken top to bottom. A line crossing the middle of the page
+    (body text of a single-column layout, a title, a footer) is read in
+    place and closes the current band; within a band, the lines in the
+    left half are read before those in the right half, each top to bottom.
+    
+    Args:
+        lines (List[Tuple[float, float, float, float, str]]): (x0, y0, x1,
+            y1, text) per line, y growing downwards
+        width (float): Page width
+        
+    Returns:
+        List[Tuple[float, float, float, float, str]]: The lines in reading order
+    """
+    middle = width / 2
+    ordered = []
+    band = []
+    for line in sorted(lines, key=lambda line: (line[1], line[0])):
+        if line[0] < middle < line[2]:
+            ordered.extend(sorted(band, key=lambda line: line[0] >= middle))
+            ordered.append(line)
+            band = []
+        else:
+            band.append(line)
+    ordered.extend(sorted(band, key=lambda line: line[0] >= middle))
+    return ordered
+
 # PUBLIC_INTERFACE
 def validate_pdf(file_path: str) -> Dict[str, bool | str]:
     """
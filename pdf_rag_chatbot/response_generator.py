@@ -1,7 +1,17 @@
 """Response generation module for the chatbot."""
-from typing import Dict, List, Optional
-from nltk.tokenize import sent_tokenize
-from nltk.metrics.distance import edit_distance
+import heapq
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import metrics
+import sessions
+from corpus import Corpus
+from retrieval import rank_sentences
+
+# Number of sentences _construct_response uses from the ranked results
+RESPONSE_SENTENCES = 2
+
+# Smallest relevance (see retrieval.rank_sentences) a sentence needs to be used
+MIN_RELEVANCE = 0.1
 
 # PUBLIC_INTERFACE
 def generate_response(
@@ -14,8 +24,12 @@ def generate_response(
     
     Args:
         query_analysis (Dict[str, str]): Analysis of the user's query
-        processed_text (Dict[str, List[str]]): Processed document text
-        context (Optional[Dict]): Additional context for response generation
+        processed_text (Dict[str, List[str]]): Processed document text, optionally
+            carrying a prebuilt inverted index under 'index', a sentence
+            vector index under 'vectors' and its passages under 'passages'
+        context (Optional[Dict]): Conversation state (see
+            sessions.new_session_state), updated in place; follow-up messages
+            continue its last focus and sentences it already used are skipped
         
     Returns:
         Dict[str, str]: Generated response
@@ -32,12 +46,22 @@ def generate_response(
             'source': 'none'
         }
     
-    # Find most relevant sentences based on keyword matching
-    relevant_sentences = _find_relevant_sentences(
-        query_analysis['focus'],
-        processed_text['sentences'],
-        processed_text['keywords']
-    )
+    # Find most relevant sentences using the document's inverted index
+    with metrics.stage('retrieval'):
+        if context is None:
+            relevant_sentences = _find_relevant_sentences(
+                query_analysis['focus'],
+                processed_text['sentences'],
+                processed_text['keywords'],
+                processed_text.get('index'),
+                processed_text.get('vectors'),
+                passages=processed_text.get('passages')
+            )
+        else:
+            relevant_sentences = [
+                (hit['sentence'], hit['score'])
+                for hit in _find_session_hits(query_analysis['focus'], processed_text, context)
+            ]
     
     if not relevant_sentences:
         return {
@@ -47,46 +71,323 @@ def generate_response(
         }
     
     # Construct response based on query intent
-    response = _construct_response(query_analysis['intent'], relevant_sentences)
+    with metrics.stage('response'):
+        response = _construct_response(
+            query_analysis['intent'],
+            [sentence for sentence, _ in relevant_sentences]
+        )
     
     return {
         'response': response,
-        'confidence': '0.8',  # Simplified confidence scoring
+        'confidence': _format_confidence(relevant_sentences[0][1]),
         'source': 'document'
     }
 
-def _find_relevant_sentences(focus: str, sentences: List[str], keywords: List[str]) -> List[str]:
+# PUBLIC_INTERFACE
+def generate_corpus_response(
+    query_analysis: Dict[str, str],
+    corpus: Corpus,
+    document_ids: Optional[Iterable[str]] = None,
+    context: Optional[Dict] = None
+) -> Dict[str, str]:
+    """
+    Generate a response from the documents of a corpus.
+    
+    Args:
+        query_analysis (Dict[str, str]): Analysis of the user's query
+        corpus (Corpus): Corpus of processed documents
+        document_ids (Optional[Iterable[str]]): Documents to answer from;
+            all documents when None
+        context (Optional[Dict]): Conversation state (see generate_response);
+            a follow-up is answered from the candidates kept by the previous
+            turn without searching again when any are left
+        
+    Returns:
+        Dict[str, str]: Generated response (see generate_response), with the
+            source naming the document and page of each sentence used
+    """
+    if not corpus.documents():
+        return {
+            'response': "I couldn't find any relevant information in the document.",
+            'confidence': '0.0',
+            'source': 'none'
+        }
+    
+    if context is None:
+        hits = corpus.search(
+            query_analysis['focus'],
+            document_ids,
+            k=RESPONSE_SENTENCES,
+            min_score=MIN_RELEVANCE
+        )
+    else:
+        focus, hits = _corpus_follow_up(context, query_analysis['focus'], corpus)
+        if not hits:
+            hits = corpus.search(
+                focus,
+                document_ids,
+                k=sessions.search_size(context, RESPONSE_SENTENCES),
+                min_score=MIN_RELEVANCE
+            )
+        hits = sessions.record_turn(context, focus, hits, RESPONSE_SENTENCES)
+    if not hits:
+        return {
+            'response': "I couldn't find a specific answer to your question.",
+            'confidence': '0.0',
+            'source': 'none'
+        }
+    
+    with metrics.stage('response'):
+        response = _construct_response(query_analysis['intent'], [hit['sentence'] for hit in hits])
+    
+    return {
+        'response': response,
+        'confidence': _format_confidence(hits[0]['score']),
+        'source': _format_source(hits)
+    }
+
+# PUBLIC_INTERFACE
+def generate_batch_responses(
+    query_analyses: Sequence[Dict[str, str]],
+    corpus: Corpus,
+    document_ids: Optional[Iterable[str]] = None
+) -> List[Dict]:
     """
-    Find sentences relevant to the query focus.
+    Generate responses to many queries over the same documents.
+    
+    All queries are resolved in one pass over each document (see
+    Corpus.search_batch) rather than one corpus search per query.
+    
+    Args:
+        query_analyses (Sequence[Dict[str, str]]): Analysis of each query,
+            such as returned by nlp_processor.analyze_queries
+        corpus (Corpus): Corpus of processed documents
+        document_ids (Optional[Iterable[str]]): Documents to answer from;
+            all documents when None
+        
+    Returns:
+        List[Dict]: Response of each query, in order (see
+            generate_corpus_response), with 'timings' giving the
+            milliseconds spent on its 'retrieval' and 'response'
+    """
+    if not corpus.documents():
+        return [
+            {
+                'response': "I couldn't find any relevant information in the document.",
+                'confidence': '0.0',
+                'source': 'none',
+                'timings': {}
+            }
+            for _ in query_analyses
+        ]
+    
+    hits_per_query, seconds = corpus.search_batch(
+        [analysis['focus'] for analysis in query_analyses],
+        document_ids,
+        k=RESPONSE_SENTENCES,
+        min_score=MIN_RELEVANCE
+    )
+    
+    responses = []
+    for analysis, hits, retrieval in zip(query_analyses, hits_per_query, seconds):
+        start = time.perf_counter()
+        if hits:
+            response = {
+                'response': _construct_response(analysis['intent'], [hit['sentence'] for hit in hits]),
+                'confidence': _format_confidence(hits[0]['score']),
+                'source': _format_source(hits)
+            }
+        else:
+            response = {
+                'response': "I couldn't find a specific answer to your question.",
+                'confidence': '0.0',
+                'source': 'none'
+            }
+        response['timings'] = {
+            'retrieval': round(retrieval * 1000, 3),
+            'response': round((time.perf_counter() - start) * 1000, 3)
+        }
+        responses.append(response)
+    return responses
+
+# PUBLIC_INTERFACE
+def stream_corpus_response(
+    query_analysis: Dict[str, str],
+    corpus: Corpus,
+    document_ids: Optional[Iterable[str]] = None,
+    context: Optional[Dict] = None
+) -> Iterator[Tuple[str, Dict]]:
+    """
+    Generate a corpus response incrementally, as a sequence of events.
+    
+    Each document's hits are emitted as soon as that document has been
+    searched, then the answer text is emitted piece by piece, and finally
+    the complete response.
+    
+    Args:
+        query_analysis (Dict[str, str]): Analysis of the user's query
+        corpus (Corpus): Corpus of processed documents
+        document_ids (Optional[Iterable[str]]): Documents to answer from;
+            all documents when None
+        context (Optional[Dict]): Conversation state (see
+            generate_corpus_response), updated before the answer event
+        
+    Yields:
+        Tuple[str, Dict]: (event name, payload) pairs
+            ('hit', corpus search hit) for each retrieved sentence,
+            ('chunk', {'text': next piece of the answer}),
+            ('answer', response as returned by generate_corpus_response)
+    """
+    focus, hits = query_analysis['focus'], []
+    k = RESPONSE_SENTENCES
+    if context is not None:
+        focus, hits = _corpus_follow_up(context, focus, corpus)
+        k = sessions.search_size(context, RESPONSE_SENTENCES)
+    
+    if hits:
+        for hit in hits:
+            yield 'hit', hit
+    else:
+        for document_hits in corpus.iter_search(focus, document_ids, k=k, min_score=MIN_RELEVANCE):
+            for hit in document_hits:
+                yield 'hit', hit
+            hits.extend(document_hits)
+        hits = heapq.nlargest(k, hits, key=lambda hit: hit['score'])
+    
+    if context is not None:
+        hits = sessions.record_turn(context, focus, hits, RESPONSE_SENTENCES)
+    if not hits:
+        message = (
+            "I couldn't find a specific answer to your question." if corpus.documents()
+            else "I couldn't find any relevant information in the document."
+        )
+        yield 'chunk', {'text': message}
+        yield 'answer', {'response': message, 'confidence': '0.0', 'source': 'none'}
+        return
+    
+    sentences = [hit['sentence'] for hit in hits]
+    for piece in _iter_response_parts(query_analysis['intent'], sentences):
+        yield 'chunk', {'text': piece}
+    yield 'answer', {
+        'response': _construct_response(query_analysis['intent'], sentences),
+        'confidence': _format_confidence(hits[0]['score']),
+        'source': _format_source(hits)
+    }
+
+def _format_confidence(score: float) -> str:
+    """
+    Express the relevance of the best sentence as a confidence.
+    
+    Args:
+        score (float): Relevance of the best sentence used in the response
+        
+    Returns:
+        str: Relevance capped at 1.0, with two decimals
+    """
+    return f'{min(score, 1.0):.2f}'
+
+def _format_source(hits: List[Dict]) -> str:
+    """
+    Describe where the sentences of a response come from.
+    
+    Args:
+        hits (List[Dict]): Corpus search hits used in the response
+        
+    Returns:
+        str: Distinct 'name, page N' citations separated by semicolons
+    """
+    citations = []
+    for hit in hits:
+        citation = hit['name'] if hit['page'] is None else f"{hit['name']}, page {hit['page']}"
+        if citation not in citations:
+            citations.append(citation)
+    return '; '.join(citations)
+
+def _find_relevant_sentences(
+    focus: str,
+    sentences: List[str],
+    keywords: List[str],
+    index: Optional[Dict] = None,
+    vectors: Optional[Dict] = None,
+    k: int = RESPONSE_SENTENCES,
+    min_score: float = MIN_RELEVANCE,
+    passages: Optional[Dict] = None
+) -> List[Tuple[str, float]]:
+    """
+    Find the top-k sentences relevant to the query focus.
     
     Args:
         focus (str): Main focus of the query
         sentences (List[str]): List of sentences from the document
         keywords (List[str]): List of important keywords
+        index (Optional[Dict]): Inverted index over the sentences; built on
+            the fly when not provided
+        vectors (Optional[Dict]): Vector index over the sentences, searched
+            when no indexed term matches the focus
+        k (int): Maximum number of sentences
+        min_score (float): Smallest relevance a sentence needs
+        passages (Optional[Dict]): Passages of the document to rank through
         
     Returns:
-        List[str]: List of relevant sentences
-    """
-    relevant = []
-    focus_words = set(focus.lower().split())
-    
-    for sentence in sentences:
-        # Check for direct matches with focus
-        if any(word.lower() in sentence.lower() for word in focus_words):
-            relevant.append(sentence)
-            continue
-            
-        # Check for semantic similarity using edit distance
-        sentence_words = set(sentence.lower().split())
-        for focus_word in focus_words:
-            for sentence_word in sentence_words:
-                if edit_distance(focus_word, sentence_word) <= 2:  # Allow for minor variations
-                    relevant.append(sentence)
-                    break
-            if sentence in relevant:
-                break
-    
-    return relevant
+        List[Tuple[str, float]]: (sentence, relevance) pairs, most relevant first
+    """
+    ranked = rank_sentences(focus, sentences, index, vectors, k, min_score, passages)
+    return [(sentences[sentence_id], score) for sentence_id, score in ranked]
+
+def _corpus_follow_up(context: Dict, focus: str, corpus: Corpus) -> Tuple[str, List[Dict]]:
+    """
+    Resolve a message of a conversation over a corpus (see sessions.follow_up).
+    
+    Stored candidates of documents deleted or replaced since the previous
+    turn are dropped.
+    
+    Args:
+        context (Dict): Conversation state
+        focus (str): Focus of the new message
+        corpus (Corpus): Corpus answered from
+        
+    Returns:
+        Tuple[str, List[Dict]]: Focus to search for, and the stored hits
+            answering a follow-up without a new search
+    """
+    focus, hits = sessions.follow_up(context, focus)
+    return focus, [hit for hit in hits if corpus.get_document(hit['document']) is not None]
+
+def _find_session_hits(focus: str, processed_text: Dict, context: Dict) -> List[Dict]:
+    """
+    Find the sentences answering a message of a conversation.
+    
+    Args:
+        focus (str): Main focus of the query
+        processed_text (Dict): Processed document (see generate_response);
+            its 'id', when present, tells documents apart in the context
+        context (Dict): Conversation state, updated in place
+        
+    Returns:
+        List[Dict]: Hits in the format of Corpus.search to answer with
+    """
+    focus, hits = sessions.follow_up(context, focus)
+    if not hits:
+        sentences = processed_text['sentences']
+        ranked = rank_sentences(
+            focus,
+            sentences,
+            processed_text.get('index'),
+            processed_text.get('vectors'),
+            sessions.search_size(context, RESPONSE_SENTENCES),
+            MIN_RELEVANCE,
+            processed_text.get('passages')
+        )
+        hits = [
+            {
+                'document': processed_text.get('id'),
+                'sentence_id': sentence_id,
+                'sentence': sentences[sentence_id],
+                'score': score
+            }
+            for sentence_id, score in ranked
+        ]
+    return sessions.record_turn(context, focus, hits, RESPONSE_SENTENCES)
 
 def _construct_response(intent: str, relevant_sentences: List[str]) -> str:
     """
@@ -102,13 +403,24 @@ def _construct_response(intent: str, relevant_sentences: List[str]) -> str:
     if not relevant_sentences:
         return "I couldn't find specific information about that."
     
+    return ''.join(_iter_response_parts(intent, relevant_sentences)).strip()
+
+def _iter_response_parts(intent: str, relevant_sentences: List[str]) -> Iterator[str]:
+    """
+    Yield the pieces of a response, one per relevant sentence used.
+    
+    Args:
+        intent (str): Query intent (question or statement)
+        relevant_sentences (List[str]): Relevant sentences from the document
+        
+    Yields:
+        str: Consecutive pieces of the response text
+    """
     if intent == 'question':
-        response = "Based on the document, " + relevant_sentences[0]
+        yield "Based on the document, " + relevant_sentences[0]
         if len(relevant_sentences) > 1:
-            response += " Additionally, " + relevant_sentences[1]
+            yield " Additionally, " + relevant_sentences[1]
     else:
-        response = relevant_sentences[0]
+        yield relevant_sentences[0]
         if len(relevant_sentences) > 1:
-            response += " " + relevant_sentences[1]
-    
-    return response.strip()
\ No newline at end of file
+            yield " " + relevant_sentences[1]
@@ -0,0 +1,126 @@
+"""Retrieval module ranking a document's sentences against a query focus."""
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from text_index import build_index, expand_terms, query_weight, score_texts, search_index, tokenize
+from vector_index import search_vectors
+
+# Vector retrieval settings for queries without any term match
+VECTOR_TOP_K = 10
+MIN_VECTOR_SCORE = 0.1
+
+# Passages whose sentences are scored when ranking through passages: this
+# many per requested result, and never fewer than MIN_PASSAGES
+PASSAGES_PER_RESULT = 2
+MIN_PASSAGES = 4
+
+# PUBLIC_INTERFACE
+def rank_sentences(
+    focus: str,
+    sentences: Sequence[str],
+    index: Optional[Dict] = None,
+    vectors: Optional[Dict] = None,
+    limit: Optional[int] = None,
+    min_score: float = 0.0,
+    passages: Optional[Dict] = None
+) -> List[Tuple[int, float]]:
+    """
+    Rank a document's sentences against a query focus.
+    
+    Stages run in order until one finds matches: exact term matches through
+    the inverted index, typo-tolerant matches through the fuzzy term index,
+    then nearest neighbours in the sentence embedding space.
+    
+    With passages, the term stages search the much smaller passage index
+    and only the sentences of the best passages are scored, with the
+    passage index's term weights. Documents with too few passages for this
+    to skip any, and unlimited rankings, use the sentence index directly.
+    
+    Scores are relevance values comparable across stages and documents:
+    BM25 scores are divided by the score of an ideal match (a sentence of
+    average length containing every focus word once), and vector scores are
+    cosine similarities. Both are 1.0 for a full match, though a BM25 score
+    can exceed it for short sentences or repeated terms.
+    
+    Args:
+        focus (str): Main focus of the query
+        sentences (Sequence[str]): Sentences of the document
+        index (Optional[Dict]): Inverted index over the sentences; built on
+            the fly when not provided
+        vectors (Optional[Dict]): Vector index over the sentences, searched
+            when no indexed term matches the focus
+        limit (Optional[int]): Maximum number of results
+        min_score (float): Only return sentences with a relevance above this
+        passages (Optional[Dict]): Passages of the document (see
+            passages.build_passages) to rank through
+        
+    Returns:
+        List[Tuple[int, float]]: (sentence id, score) pairs, best first
+    """
+    if index is None:
+        index = build_index(sentences)
+    focus_words = set(tokenize(focus))
+    count = None if limit is None else max(MIN_PASSAGES, limit * PASSAGES_PER_RESULT)
+    
+    if passages is not None and count is not None and passages['index']['size'] > count:
+        # Find the best passages, then score only their sentences
+        weight = query_weight(passages['index'], focus_words)
+        ranked = _rank_through_passages(focus_words, sentences, index, passages, count, limit, min_score * weight)
+    else:
+        # Rank direct matches with the focus through the index
+        weight = query_weight(index, focus_words)
+        ranked = search_index(index, focus_words, limit, min_score * weight)
+        
+        # Fall back to typo-tolerant matching: only the vocabulary terms
+        # within a small edit distance of the focus words are looked up
+        if not ranked:
+            ranked = search_index(index, expand_terms(index, focus_words), limit, min_score * weight)
+    if ranked:
+        return [(sentence_id, score / weight) for sentence_id, score in ranked]
+    
+    if vectors is not None and focus_words:
+        # Last resort: nearest sentences in embedding space
+        k = VECTOR_TOP_K if limit is None else min(limit, VECTOR_TOP_K)
+        ranked = search_vectors(vectors, focus, k, max(min_score, MIN_VECTOR_SCORE))
+    return ranked
+
+def _rank_through_passages(
+    focus_words: Set[str],
+    sentences: Sequence[str],
+    index: Dict,
+    passages: Dict,
+    count: int,
+    limit: int,
+    min_score: float
+) -> List[Tuple[int, float]]:
+    """
+    Rank sentences by scoring only those of the best-matching passages.
+    
+    Args:
+        focus_words (Set[str]): Terms of the query focus
+        sentences (Sequence[str]): Sentences of the document
+        index (Dict): Inverted index over the sentences
+        passages (Dict): Passages of the document
+        count (int): Number of passages whose sentences are scored
+        limit (int): Maximum number of results
+        min_score (float): Only return sentences with a BM25 score above this
+        
+    Returns:
+        List[Tuple[int, float]]: (sentence id, BM25 score) pairs, best first
+    """
+    passage_index = passages['index']
+    terms = list(focus_words)
+    top = search_index(passage_index, terms, count)
+    if not top:
+        terms = expand_terms(passage_index, focus_words)
+        top = search_index(passage_index, terms, count)
+    
+    bounds = passages['bounds']
+    sentence_ids = sorted({
+        sentence_id for passage_id, _ in top for sentence_id in range(*bounds[passage_id])
+    })
+    scored = score_texts(
+        passage_index,
+        terms,
+        ((sentence_id, sentences[sentence_id]) for sentence_id in sentence_ids),
+        index['avg_length']
+    )
+    return [(sentence_id, score) for sentence_id, score in scored if score > min_score][:limit]
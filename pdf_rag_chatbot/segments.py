@@ -0,0 +1,198 @@
+"""Manifest of the live index segments, with tombstones and compaction."""
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Only threads of one process are serialised then
+    fcntl = None
+
+# Manifest and lock files written into the index folder
+MANIFEST_FILE = 'manifest.json'
+_LOCK_FILE = 'manifest.lock'
+
+# Files of a deleted segment are kept this long, so readers still searching
+# the snapshot they started with can finish
+DEFAULT_GRACE_PERIOD = 600.0  # seconds
+
+_thread_lock = threading.Lock()
+
+def _empty_manifest() -> Dict:
+    """Return the manifest of an index folder without segments."""
+    return {'generation': 0, 'segments': {}, 'tombstones': {}}
+
+# PUBLIC_INTERFACE
+def add_segment(manifest: Dict, segment_id: str, name: str, replaces: Optional[str] = None) -> Optional[str]:
+    """
+    Mark a segment live, optionally deleting the segment it replaces.
+
+    Both changes are published in the same generation, so readers see
+    either the old segment or the new one, never both or neither.
+
+    Args:
+        manifest (Dict): Manifest yielded by SegmentManifest.transaction
+        segment_id (str): Id of the segment (the document's content hash)
+        name (str): Display name of the document
+        replaces (Optional[str]): Id of a live segment to delete
+
+    Returns:
+        Optional[str]: Id of the deleted segment, or None if replaces was
+            not live (or is the segment itself)
+    """
+    manifest['tombstones'].pop(segment_id, None)
+    manifest['segments'][segment_id] = {'name': name, 'added': time.time()}
+    if replaces is not None and replaces != segment_id and delete_segment(manifest, replaces):
+        return replaces
+    return None
+
+# PUBLIC_INTERFACE
+def delete_segment(manifest: Dict, segment_id: str) -> bool:
+    """
+    Replace a live segment by a tombstone.
+
+    Args:
+        manifest (Dict): Manifest yielded by SegmentManifest.transaction
+        segment_id (str): Id of the segment to delete
+
+    Returns:
+        bool: True if the segment was live
+    """
+    if manifest['segments'].pop(segment_id, None) is None:
+        return False
+    manifest['tombstones'][segment_id] = time.time()
+    return True
+
+# PUBLIC_INTERFACE
+class SegmentManifest:
+    """
+    Versioned list of the live segments of an index folder.
+
+    A segment is a subdirectory holding one document's immutable index
+    files, named by the document's content hash; new documents only ever
+    add segments. The manifest file records which segments are live and
+    which were deleted (tombstones). Changes are made under an exclusive
+    lock shared by all processes and published by atomically replacing the
+    manifest with its next generation, so readers never take the lock and
+    always see a complete snapshot.
+
+    Deleting a segment only writes its tombstone. compact removes the
+    files of segments deleted more than grace_period ago, without touching
+    live segments, and so runs in the background while searches continue.
+    """
+
+    def __init__(self, directory: str, grace_period: float = DEFAULT_GRACE_PERIOD):
+        """
+        Initialize the manifest of an index folder.
+
+        Args:
+            directory (str): Index folder holding the segments
+            grace_period (float): Seconds a deleted segment's files are kept
+        """
+        self.directory = directory
+        self.grace_period = grace_period
+        self.path = os.path.join(directory, MANIFEST_FILE)
+
+    def stamp(self) -> Optional[Tuple[int, int]]:
+        """
+        Identify the published manifest cheaply, to detect changes.
+
+        Returns:
+            Optional[Tuple[int, int]]: Inode and modification time of the
+                manifest file (every publication replaces the file), or None
+                if there is no manifest yet
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def read(self) -> Optional[Dict]:
+        """
+        Load the published manifest without locking.
+
+        Returns:
+            Optional[Dict]: Snapshot of the manifest
+                {
+                    'generation': Number of changes published so far,
+                    'segments': {segment id: {'name', 'added'}} of the live
+                        segments,
+                    'tombstones': {segment id: deletion time} of the deleted
+                        segments whose files are not removed yet
+                }
+                or None if there is no manifest yet
+        """
+        try:
+            with open(self.path) as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def transaction(self) -> Iterator[Dict]:
+        """
+        Lock the manifest for a change.
+
+        Yields the current manifest (empty if there is none yet) to modify
+        in place, with add_segment and delete_segment. On exit it is
+        published as the next generation if it was changed; nothing is
+        published if the block raises.
+
+        Yields:
+            Dict: The manifest, in the format returned by read
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with self._locked():
+            manifest = self.read() or _empty_manifest()
+            original = json.dumps(manifest, sort_keys=True)
+            yield manifest
+            if json.dumps(manifest, sort_keys=True) != original or not os.path.exists(self.path):
+                manifest['generation'] += 1
+                self._write(manifest)
+
+    def compact(self) -> List[str]:
+        """
+        Remove the files of segments deleted more than grace_period ago.
+
+        Returns:
+            List[str]: Ids of the segments removed
+        """
+        cutoff = time.time() - self.grace_period
+        removed = []
+        with self.transaction() as manifest:
+            for segment_id, deleted in list(manifest['tombstones'].items()):
+                if deleted > cutoff:
+                    continue
+                shutil.rmtree(os.path.join(self.directory, segment_id), ignore_errors=True)
+                del manifest['tombstones'][segment_id]
+                removed.append(segment_id)
+        return removed
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the manifest lock, across processes where the platform allows."""
+        if fcntl is None:
+            with _thread_lock:
+                yield
+            return
+        # Separate opens of the lock file exclude each other, even between
+        # threads of one process
+        with open(os.path.join(self.directory, _LOCK_FILE), 'a') as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _write(self, manifest: Dict) -> None:
+        """Atomically publish a manifest."""
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(handle, 'w') as temp_file:
+            json.dump(manifest, temp_file)
+        os.replace(temp_path, self.path)
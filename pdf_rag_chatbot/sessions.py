@@ -0,0 +1,304 @@
+"""Per-session conversation state for follow-up questions."""
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+from caching import LRUCache
+from text_index import tokenize
+
+# Default bounds of the session store
+DEFAULT_MAX_SESSIONS = 1024
+DEFAULT_SESSION_TTL = 1800.0  # seconds since the last turn
+
+# Per-session history bounds
+MAX_FOCUS_HISTORY = 5
+MAX_SEEN_SENTENCES = 50
+MAX_CANDIDATES = 6
+
+# Session ids are generated here; anything else is never used as a file name
+_SESSION_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+_SESSION_SUFFIX = '.json'
+
+# PUBLIC_INTERFACE
+def new_session_state(document_ids: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Create the state of a conversation without any turns.
+
+    The state is a JSON-serialisable dict, so sessions can be shared through files:
+        {
+            'documents': Active document ids, or None for every document,
+            'focus': Recent query focuses with indexable words, oldest first,
+            'seen': [document id, sentence id] pairs already used in answers,
+            'candidates': Unused hits of the last search, best first,
+            'turns': Number of answered messages,
+            'updated': Wall-clock time of the last save
+        }
+
+    Args:
+        document_ids (Optional[Iterable[str]]): Documents the conversation is about
+
+    Returns:
+        Dict: Session state
+    """
+    return {
+        'documents': None if document_ids is None else list(document_ids),
+        'focus': [],
+        'seen': [],
+        'candidates': [],
+        'turns': 0,
+        'updated': time.time()
+    }
+
+# PUBLIC_INTERFACE
+def set_documents(state: Dict, document_ids: Optional[Iterable[str]]) -> None:
+    """
+    Change the documents a conversation is about.
+
+    Stored candidates come from the previous documents, so they are dropped
+    when the selection changes.
+
+    Args:
+        state (Dict): Session state
+        document_ids (Optional[Iterable[str]]): Active document ids, or None
+            for every document
+    """
+    documents = None if document_ids is None else list(document_ids)
+    if documents != state['documents']:
+        state['documents'] = documents
+        state['candidates'] = []
+
+# PUBLIC_INTERFACE
+def follow_up(state: Dict, focus: str) -> Tuple[str, List[Dict]]:
+    """
+    Resolve what a message refers to in the context of its conversation.
+
+    A message without an indexable focus of its own ("tell me more") is a
+    follow-up: it continues the previous focus and is answered from the
+    unused candidates of the previous search when any are left.
+
+    Args:
+        state (Dict): Session state
+        focus (str): Focus of the new message (see nlp_processor.analyze_query)
+
+    Returns:
+        Tuple[str, List[Dict]]: Focus to search for, and the stored hits
+            answering a follow-up without a new search (empty if it needs one)
+    """
+    if tokenize(focus) or not state['focus']:
+        return focus, []
+    seen = {tuple(pair) for pair in state['seen']}
+    candidates = [hit for hit in state['candidates'] if (hit['document'], hit['sentence_id']) not in seen]
+    return state['focus'][-1], candidates
+
+# PUBLIC_INTERFACE
+def search_size(state: Dict, limit: int) -> int:
+    """
+    Number of hits to search for so a turn can skip seen sentences.
+
+    Args:
+        state (Dict): Session state
+        limit (int): Maximum number of hits the answer uses
+
+    Returns:
+        int: limit, plus room for the candidates kept for a follow-up and
+            for sentences already used in earlier answers
+    """
+    return limit + MAX_CANDIDATES + len(state['seen'])
+
+# PUBLIC_INTERFACE
+def record_turn(state: Dict, focus: str, hits: List[Dict], limit: int) -> List[Dict]:
+    """
+    Pick the hits to answer with and remember the turn.
+
+    Sentences used in earlier answers are skipped unless nothing else
+    matched; the best remaining hits answer this turn and the next ones are
+    kept as candidates for a follow-up.
+
+    Args:
+        state (Dict): Session state, updated in place
+        focus (str): Focus searched for
+        hits (List[Dict]): Hits in the format of corpus.Corpus.search, best first
+        limit (int): Maximum number of hits to answer with
+
+    Returns:
+        List[Dict]: The hits to answer with
+    """
+    seen = {tuple(pair) for pair in state['seen']}
+    unseen = [hit for hit in hits if (hit['document'], hit['sentence_id']) not in seen]
+    selected = (unseen or hits)[:limit]
+
+    if tokenize(focus) and (not state['focus'] or state['focus'][-1] != focus):
+        state['focus'] = (state['focus'] + [focus])[-MAX_FOCUS_HISTORY:]
+    state['seen'] = (state['seen'] + [
+        [hit['document'], hit['sentence_id']] for hit in selected
+        if (hit['document'], hit['sentence_id']) not in seen
+    ])[-MAX_SEEN_SENTENCES:]
+    state['candidates'] = unseen[len(selected):len(selected) + MAX_CANDIDATES] if unseen else []
+    state['turns'] += 1
+    return selected
+
+# PUBLIC_INTERFACE
+class SessionStore:
+    """
+    Bounded store of conversation states keyed by session id.
+
+    Sessions expire ttl seconds after their last save. With a folder, every
+    save also writes the session there as JSON, so the worker processes of
+    a server sharing the folder continue each other's conversations: a
+    lookup uses the in-memory copy only while it is the one last written,
+    and reads the file otherwise. Files older than the TTL are deleted when
+    found. Without a folder, sessions live in this process only.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        ttl: float = DEFAULT_SESSION_TTL,
+        folder: Optional[str] = None
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            max_sessions (int): Sessions held in memory
+            ttl (float): Session lifetime in seconds since its last save
+            folder (Optional[str]): Directory sharing sessions between
+                processes, or None to keep them in this process only
+        """
+        self.ttl = ttl
+        self.folder = folder
+        # session id -> (state, stamp of the file it was last written to)
+        self._sessions = LRUCache(max_sessions, ttl)
+        self._purged = time.monotonic()
+        self._purge_lock = threading.Lock()
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+    def get(self, session_id: Optional[str]) -> Tuple[str, Dict]:
+        """
+        Look up a session, starting a new one if it is unknown or expired.
+
+        Args:
+            session_id (Optional[str]): Id returned by an earlier call, or None
+
+        Returns:
+            Tuple[str, Dict]: The session id, which differs from session_id
+                for a new session, and its state (see new_session_state)
+        """
+        if session_id and _SESSION_ID_PATTERN.match(session_id):
+            entry = self._sessions.get(session_id)
+            if self.folder:
+                stamp = self._stamp(session_id)
+                if entry is None or entry[1] != stamp:
+                    entry = None if stamp is None else self._load(session_id)
+            if entry is not None:
+                return session_id, entry[0]
+        return uuid.uuid4().hex, new_session_state()
+
+    def save(self, session_id: str, state: Dict) -> None:
+        """
+        Store a session's state after a turn, restarting its TTL.
+
+        Args:
+            session_id (str): Id returned by get
+            state (Dict): Session state
+        """
+        state['updated'] = time.time()
+        stamp = None
+        if self.folder:
+            stamp = self._write(session_id, state)
+            self._purge_expired()
+        self._sessions.put(session_id, (state, stamp))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report usage of the in-memory sessions.
+
+        Returns:
+            Dict[str, int]: Hit, miss and size counters (see LRUCache.stats)
+        """
+        return self._sessions.stats()
+
+    def _path(self, session_id: str) -> str:
+        """Return the file path of a session."""
+        return os.path.join(self.folder, session_id + _SESSION_SUFFIX)
+
+    def _stamp(self, session_id: str) -> Optional[Tuple[int, int]]:
+        """Identify the current file of a session (every save replaces it), or None."""
+        try:
+            stat = os.stat(self._path(session_id))
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _write(self, session_id: str, state: Dict) -> Optional[Tuple[int, int]]:
+        """
+        Atomically write a session to the folder.
+
+        Args:
+            session_id (str): Session id
+            state (Dict): Session state
+
+        Returns:
+            Optional[Tuple[int, int]]: Stamp of the written file, or None if
+                it could not be written
+        """
+        handle, temp_path = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'w') as temp_file:
+                json.dump(state, temp_file, separators=(',', ':'))
+                temp_file.flush()
+                stat = os.fstat(temp_file.fileno())
+            os.replace(temp_path, self._path(session_id))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _load(self, session_id: str) -> Optional[Tuple[Dict, Tuple[int, int]]]:
+        """
+        Read a session written by this or another process into memory.
+
+        Args:
+            session_id (str): Session id
+
+        Returns:
+            Optional[Tuple[Dict, Tuple[int, int]]]: The session state and the
+                stamp of its file, or None if missing or expired
+        """
+        try:
+            with open(self._path(session_id)) as handle:
+                stat = os.fstat(handle.fileno())
+                state = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if time.time() - state['updated'] > self.ttl:
+            return None
+        entry = (state, (stat.st_ino, stat.st_mtime_ns))
+        self._sessions.put(session_id, entry)
+        return entry
+
+    def _purge_expired(self) -> None:
+        """Delete expired session files, at most once per TTL period."""
+        with self._purge_lock:
+            if time.monotonic() - self._purged < self.ttl:
+                return
+            self._purged = time.monotonic()
+        cutoff = time.time() - self.ttl
+        try:
+            names = os.listdir(self.folder)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.folder, name)
+            try:
+                if name.endswith(_SESSION_SUFFIX) and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
@@ -15,6 +15,10 @@ document.addEventListener('DOMContentLoaded', () => {
     const errorModal = document.getElementById('error-modal');
     const errorMessage = document.getElementById('error-message');
 
+    // Conversation id returned by the server, sent with every message so
+    // follow-up questions are answered in context
+    let sessionId = null;
+
     // Event Listeners for File Upload
     dropZone.addEventListener('dragover', (e) => {
         e.preventDefault();
@@ -59,6 +63,12 @@ document.addEventListener('DOMContentLoaded', () => {
         userInput.style.height = userInput.scrollHeight + 'px';
     });
 
+    // Files above this size are sent in resumable chunks through /uploads
+    const CHUNKED_UPLOAD_THRESHOLD = 8 * 1024 * 1024;
+    const CHUNK_SIZE = 8 * 1024 * 1024;
+    const MAX_UPLOAD_SIZE = 512 * 1024 * 1024;
+    const CHUNK_RETRIES = 5;
+
     // File Upload Handler
     async function handleFileUpload(file) {
         if (!file.type || file.type !== 'application/pdf') {
@@ -66,27 +76,29 @@ document.addEventListener('DOMContentLoaded', () => {
             return;
         }
 
-        if (file.size > 10 * 1024 * 1024) { // 10MB limit
-            showError('File size should not exceed 10MB.');
+        if (file.size > MAX_UPLOAD_SIZE) {
+            showError('File size should not exceed 512MB.');
             return;
         }
 
-        const formData = new FormData();
-        formData.append('file', file);
-
         showLoading('Uploading PDF...');
 
         try {
-            const response = await fetch('/upload', {
-                method: 'POST',
-                body: formData
-            });
+            if (file.size > CHUNKED_UPLOAD_THRESHOLD) {
+                await uploadInChunks(file);
+            } else {
+                const formData = new FormData();
+                formData.append('file', file);
+                const response = await fetch('/upload', {
+                    method: 'POST',
+                    body: formData
+                });
 
-            if (!response.ok) {
-                throw new Error('Upload failed');
+                if (!response.ok) {
+                    throw new Error('Upload failed');
+                }
             }
 
-            const result = await response.json();
             uploadStatus.textContent = 'File uploaded successfully!';
             uploadStatus.className = 'status-message success';
             
@@ -103,6 +115,59 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    // Resumable Upload: sends the file in chunks, and after a failed chunk
+    // asks the server how much arrived and continues from there
+    async function uploadInChunks(file) {
+        let response = await fetch('/uploads', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ filename: file.name, size: file.size })
+        });
+        if (!response.ok) {
+            throw new Error('Upload failed');
+        }
+        const upload = await response.json();
+        let offset = 0;
+        let failures = 0;
+
+        while (true) {
+            try {
+                response = await fetch(upload.upload_url, {
+                    method: 'PATCH',
+                    headers: {
+                        'Content-Type': 'application/offset+octet-stream',
+                        'Upload-Offset': String(offset)
+                    },
+                    body: file.slice(offset, offset + CHUNK_SIZE)
+                });
+            } catch (error) {
+                response = null;
+            }
+
+            if (response && response.ok) {
+                const result = await response.json();
+                if (result.complete) {
+                    return result;
+                }
+                offset = result.offset;
+                failures = 0;
+                loadingText.textContent = `Uploading PDF... ${Math.floor(100 * offset / file.size)}%`;
+                continue;
+            }
+            if (response && response.status !== 409 && response.status < 500) {
+                throw new Error('Upload failed');
+            }
+            if (++failures > CHUNK_RETRIES) {
+                throw new Error('Upload failed');
+            }
+            const status = await fetch(upload.upload_url);
+            if (!status.ok) {
+                throw new Error('Upload failed');
+            }
+            offset = (await status.json()).offset;
+        }
+    }
+
     // Chat Message Handler
     async function sendMessage() {
         const message = userInput.value.trim();
@@ -113,6 +178,12 @@ document.addEventListener('DOMContentLoaded', () => {
         userInput.value = '';
         userInput.style.height = 'auto';
 
+        // Stream the answer where the browser supports Server-Sent Events
+        if (typeof window.EventSource === 'function') {
+            streamResponse(message);
+            return;
+        }
+
         showLoading('Getting response...');
 
         try {
@@ -121,7 +192,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 headers: {
                     'Content-Type': 'application/json'
                 },
-                body: JSON.stringify({ message })
+                body: JSON.stringify({ message, session_id: sessionId })
             });
 
             if (!response.ok) {
@@ -129,7 +200,8 @@ document.addEventListener('DOMContentLoaded', () => {
             }
 
             const result = await response.json();
-            appendMessage(result.response, 'bot');
+            sessionId = result.session_id;
+            appendMessage(result.response.response, 'bot');
 
         } catch (error) {
             showError('Failed to get response. Please try again.');
@@ -138,6 +210,58 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    // Streaming Chat Handler: renders the first retrieved sentence, then the
+    // answer text as it arrives, then the final response
+    function streamResponse(message) {
+        const messageDiv = appendMessage('', 'bot');
+        messageDiv.classList.add('streaming');
+        const params = new URLSearchParams({ message });
+        if (sessionId) {
+            params.set('session_id', sessionId);
+        }
+        const source = new EventSource('/chat/stream?' + params);
+        let answer = '';
+
+        const update = (text) => {
+            messageDiv.textContent = text;
+            chatMessages.scrollTop = chatMessages.scrollHeight;
+        };
+
+        source.addEventListener('session', (e) => {
+            sessionId = JSON.parse(e.data).session_id;
+        });
+
+        source.addEventListener('hit', (e) => {
+            if (!messageDiv.textContent) {
+                update(JSON.parse(e.data).sentence);
+            }
+        });
+
+        source.addEventListener('chunk', (e) => {
+            answer += JSON.parse(e.data).text;
+            update(answer);
+        });
+
+        source.addEventListener('answer', (e) => {
+            update(JSON.parse(e.data).response);
+        });
+
+        source.addEventListener('done', () => {
+            source.close();
+            messageDiv.classList.remove('streaming');
+        });
+
+        // Fired both for server-sent error events and for connection failures
+        source.addEventListener('error', () => {
+            source.close();
+            messageDiv.classList.remove('streaming');
+            if (!messageDiv.textContent) {
+                messageDiv.remove();
+                showError('Failed to get response. Please try again.');
+            }
+        });
+    }
+
     // UI Helper Functions
     function appendMessage(content, type) {
         const messageDiv = document.createElement('div');
@@ -145,6 +269,7 @@ document.addEventListener('DOMContentLoaded', () => {
         messageDiv.textContent = content;
         chatMessages.appendChild(messageDiv);
         chatMessages.scrollTop = chatMessages.scrollHeight;
+        return messageDiv;
     }
 
     function showLoading(text) {
@@ -1,5 +1,25 @@
 """Pytest configuration file for the PDF RAG Chatbot tests."""
 import pytest
+from benchmarks.synthetic import build_pdf
+from pdf_processor import PyPDF2Extractor
+
+class HangingExtractor(PyPDF2Extractor):
+    """PyPDF2 backend that never returns from pages reading 'Hang'.
+
+    Defined here so extraction worker processes can import it; it takes the
+    default backend's name, so its pages have no fallback.
+    """
+
+    def page_text(self, document, index):
+        text = super().page_text(document, index)
+        while text.strip() == 'Hang':
+            pass
+        return text
+
+class HangingAlternativeExtractor(HangingExtractor):
+    """HangingExtractor registered under its own name, so pages fall back to PyPDF2."""
+
+    name = 'hanging'
 
 def pytest_configure(config):
     """Configure pytest for the test suite."""
@@ -20,3 +40,12 @@ def pytest_configure(config):
         "markers",
         "api: marks tests related to API integration"
     )
+
+@pytest.fixture
+def pdf_factory(tmp_path):
+    """Return a function writing a PDF with the given page texts to disk."""
+    def factory(page_texts, name='document.pdf'):
+        path = tmp_path / name
+        path.write_bytes(build_pdf(page_texts))
+        return str(path)
+    return factory
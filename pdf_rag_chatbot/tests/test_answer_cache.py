@@ -0,0 +1,76 @@
+"""Unit tests for the answer cache shared by worker processes."""
+import sqlite3
+import time
+import pytest
+from answer_cache import AnswerCache
+
+@pytest.fixture
+def cache_path(tmp_path):
+    """Path of the SQLite file shared by the caches of one test."""
+    return str(tmp_path / 'cache' / 'answers.sqlite3')
+
+def test_answers_are_shared_through_the_file(cache_path):
+    """Test that an answer stored by one process is found by another."""
+    writer = AnswerCache(cache_path, 'v1')
+    reader = AnswerCache(cache_path, 'v1')
+    key = writer.key('docs', 'What is the warranty?')
+    
+    assert reader.get(key) is None
+    writer.put(key, {'response': {'response': 'Two years.'}})
+    
+    assert reader.get(key) == {'response': {'response': 'Two years.'}}
+    assert reader.stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+def test_hits_return_fresh_copies(cache_path):
+    """Test that changing a returned answer does not change the cached one."""
+    cache = AnswerCache(cache_path, 'v1')
+    key = cache.key('docs', 'warranty')
+    cache.put(key, {'seen': []})
+    
+    cache.get(key)['seen'].append(['docs', 0])
+    
+    assert cache.get(key) == {'seen': []}
+
+def test_key_covers_documents_version_and_normalized_query(cache_path):
+    """Test which changes lead to a different cache key."""
+    cache = AnswerCache(cache_path, 'v1')
+    key = cache.key('docs', 'What is the warranty?')
+    
+    assert cache.key('docs', '  what is the WARRANTY ') == key
+    assert cache.key('other docs', 'What is the warranty?') != key
+    assert AnswerCache(cache_path, 'v2').key('docs', 'What is the warranty?') != key
+
+def test_expired_answers_are_misses(cache_path):
+    """Test that answers older than ttl are not served, from memory or disk."""
+    cache = AnswerCache(cache_path, 'v1', ttl=0.05)
+    key = cache.key('docs', 'warranty')
+    cache.put(key, {'response': 'Two years.'})
+    time.sleep(0.1)
+    
+    assert cache.get(key) is None
+    assert AnswerCache(cache_path, 'v1', ttl=0.05).get(key) is None
+
+def test_file_keeps_newest_entries(cache_path):
+    """Test that the file holds at most max_entries answers, dropping the oldest."""
+    cache = AnswerCache(cache_path, 'v1', max_entries=2)
+    keys = [cache.key('docs', query) for query in ('one', 'two', 'three')]
+    for number, key in enumerate(keys):
+        cache.put(key, {'answer': number})
+    
+    reader = AnswerCache(cache_path, 'v1')
+    assert reader.get(keys[0]) is None
+    assert [reader.get(key) for key in keys[1:]] == [{'answer': 1}, {'answer': 2}]
+    assert reader.stats()['size'] == 2
+
+def test_storage_errors_are_misses(tmp_path):
+    """Test that an unusable file only disables the shared store."""
+    (tmp_path / 'answers.sqlite3').write_bytes(b'not a database' * 100)
+    cache = AnswerCache(str(tmp_path / 'answers.sqlite3'), 'v1')
+    key = cache.key('docs', 'warranty')
+    
+    cache.put(key, {'response': 'Two years.'})
+    
+    assert cache.get(key) == {'response': 'Two years.'}
+    assert cache.stats()['size'] == 0
+    with pytest.raises(sqlite3.DatabaseError):
+        sqlite3.connect(str(tmp_path / 'answers.sqlite3')).execute('SELECT * FROM answers')
@@ -2,13 +2,20 @@
 import os
 import pytest
 from io import BytesIO
-from app import app
+from answer_cache import AnswerCache
+from app import app, corpus
+from sessions import SessionStore
 
 @pytest.fixture
-def client():
+def client(monkeypatch, tmp_path):
     """Create a test client for the Flask application."""
     app.config['TESTING'] = True
     app.config['UPLOAD_FOLDER'] = 'test_uploads'
+    # Answers and conversations stay out of the real cache folder, so no
+    # test sees another run's
+    monkeypatch.setitem(app.config, 'CACHE_FOLDER', str(tmp_path / 'cache'))
+    monkeypatch.setattr('app.answer_cache', AnswerCache(str(tmp_path / 'cache' / 'answers.sqlite3'), 'test'))
+    monkeypatch.setattr('app.sessions', SessionStore(folder=str(tmp_path / 'cache' / 'sessions')))
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     with app.test_client() as client:
         yield client
@@ -120,4 +127,140 @@ def test_chat_endpoint_context_handling(client):
         json={'message': 'Summarize the uploaded document'}
     )
     assert response.status_code == 200
-    assert 'response' in response.json
\ No newline at end of file
+    assert 'response' in response.json
+    
+    # Follow-up messages continue the same session
+    session_id = response.json['session_id']
+    response = client.post('/chat', json={'message': 'Tell me more', 'session_id': session_id})
+    assert response.status_code == 200
+    assert response.json['session_id'] == session_id
+
+def test_documents_endpoint(client):
+    """Test listing the documents available for chat."""
+    response = client.get('/documents')
+    assert response.status_code == 200
+    assert isinstance(response.json['documents'], list)
+
+def test_delete_document_endpoint(client):
+    """Test deleting a document, and deleting one that does not exist."""
+    corpus.add_document('doomed', 'doomed.pdf', {'sentences': ['The warranty period is two years.']})
+    
+    assert client.delete('/documents/doomed').status_code == 204
+    assert corpus.get_document('doomed') is None
+    assert client.delete('/documents/doomed').status_code == 404
+
+def test_chat_endpoint_caches_first_answers(client, monkeypatch):
+    """Test that a repeated first question skips query analysis until the documents change."""
+    analyzed = []
+    def analyze(message):
+        analyzed.append(message)
+        return {'intent': 'question', 'focus': 'warranty period' if 'warranty' in message else ''}
+    monkeypatch.setattr('app.analyze_query', analyze)
+    corpus.add_document('cached-manual', 'manual.pdf', {
+        'sentences': [
+            'The warranty period is two years.',
+            'The warranty period excludes batteries.',
+            'The warranty period starts on delivery.',
+            'Warranty claims need a receipt.'
+        ]
+    })
+    try:
+        request = {'message': 'What is the warranty period?', 'documents': ['cached-manual']}
+        first = client.post('/chat', json=request)
+        second = client.post('/chat', json=dict(request, message='what is the warranty period'))
+        follow_up = client.post('/chat', json={'message': 'Tell me more', 'session_id': second.json['session_id']})
+        
+        assert analyzed == ['What is the warranty period?', 'Tell me more']
+        assert second.json['response'] == first.json['response']
+        assert second.json['session_id'] != first.json['session_id']
+        assert follow_up.json['response']['response'] != first.json['response']['response']
+        
+        corpus.add_document('cached-manual', 'renamed.pdf', {'sentences': ['The warranty period is two years.']})
+        client.post('/chat', json=request)
+        assert len(analyzed) == 3
+    finally:
+        corpus.remove_document('cached-manual')
+
+def test_upload_endpoint_async_job_status(client):
+    """Test background ingestion and the job status endpoint."""
+    test_file, filename = create_test_pdf()
+    response = client.post(
+        '/upload?async=1',
+        data={'file': (test_file, filename)},
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 202
+    
+    status = client.get(response.json['status_url'])
+    assert status.status_code == 200
+    assert status.json['id'] == response.json['job_id']
+    assert status.json['status'] in ('queued', 'running', 'done', 'failed')
+
+def test_job_status_unknown_job(client):
+    """Test the job status endpoint with an unknown job id."""
+    response = client.get('/jobs/unknown')
+    assert response.status_code == 404
+
+def test_chat_stream_endpoint_sends_events(client):
+    """Test that the streaming chat endpoint sends Server-Sent Events."""
+    response = client.get('/chat/stream', query_string={'message': 'What is the content about?'})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    body = response.get_data(as_text=True)
+    assert 'event: answer' in body
+    assert body.endswith('event: done\ndata: {}\n\n')
+
+def test_chat_stream_endpoint_missing_message(client):
+    """Test the streaming chat endpoint without a message."""
+    response = client.get('/chat/stream')
+    assert response.status_code == 400
+    assert response.json['error'] == 'No message provided'
+
+def test_metrics_endpoint(client):
+    """Test that metrics are exposed in Prometheus text format."""
+    client.get('/documents')
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    body = response.get_data(as_text=True)
+    assert 'pdf_rag_http_requests_total{endpoint="list_documents",status="200"}' in body
+    assert 'pdf_rag_ingestion_queue_depth 0' in body
+    assert 'pdf_rag_cache_hit_ratio{cache="query"}' in body
+
+def test_chunked_upload_endpoints(client):
+    """Test creating, resuming and cancelling a chunked upload."""
+    response = client.post('/uploads', json={'filename': 'big.pdf', 'size': 10})
+    assert response.status_code == 201
+    upload_url = response.json['upload_url']
+    
+    response = client.patch(upload_url, data=b'%PDF-', headers={'Upload-Offset': '0'})
+    assert response.status_code == 200
+    assert response.json['offset'] == 5
+    assert response.json['complete'] is False
+    
+    response = client.patch(upload_url, data=b'1.4', headers={'Upload-Offset': '0'})
+    assert response.status_code == 409
+    assert response.headers['Upload-Offset'] == '5'
+    
+    assert client.get(upload_url).json['offset'] == 5
+    assert client.delete(upload_url).status_code == 204
+    assert client.get(upload_url).status_code == 404
+
+def test_chunked_upload_rejects_invalid_requests(client):
+    """Test chunked upload validation errors."""
+    assert client.post('/uploads', json={'filename': 'notes.txt', 'size': 10}).status_code == 400
+    assert client.post('/uploads', json={'filename': 'big.pdf', 'size': -1}).status_code == 400
+    upload_url = client.post('/uploads', json={'filename': 'big.pdf', 'size': 10}).json['upload_url']
+    assert client.patch(upload_url, data=b'%PDF-').status_code == 400
+    client.delete(upload_url)
+
+def test_chat_batch_endpoint(client):
+    """Test answering several queries in one request."""
+    response = client.post('/chat/batch', json={'queries': ['', '?']})
+    assert response.status_code == 200
+    assert len(response.json['results']) == 2
+    assert response.json['results'][1]['query'] == '?'
+    assert 'total' in response.json['timings']
+    
+    assert client.post('/chat/batch', json={'queries': 'warranty'}).status_code == 400
+    assert client.post('/chat/batch', json={'message': 'warranty'}).status_code == 400
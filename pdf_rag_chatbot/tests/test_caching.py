@@ -0,0 +1,57 @@
+"""Unit tests for the in-memory caching utilities."""
+from caching import LRUCache
+
+def test_get_and_put_count_hits_and_misses():
+    """Test basic lookups and the usage counters."""
+    cache = LRUCache(maxsize=2)
+    
+    assert cache.get('a') is None
+    cache.put('a', 1)
+    assert cache.get('a') == 1
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that the cache evicts in LRU order once full."""
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+def test_expired_entries_are_misses(monkeypatch):
+    """Test that entries older than the TTL are dropped."""
+    now = [100.0]
+    monkeypatch.setattr('caching.time.monotonic', lambda: now[0])
+    cache = LRUCache(maxsize=2, ttl=10)
+    cache.put('a', 1)
+    
+    now[0] = 105.0
+    assert cache.get('a') == 1
+    now[0] = 111.0
+    assert cache.get('a', 'expired') == 'expired'
+    assert len(cache) == 0
+
+def test_pop_and_clear():
+    """Test explicit removal of entries."""
+    cache = LRUCache()
+    cache.put('a', 1)
+    cache.put('b', 2)
+    
+    assert cache.pop('a') == 1
+    assert cache.pop('a', 'gone') == 'gone'
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'size': 0}
+
+def test_on_evict_receives_evicted_entries():
+    """Test that entries evicted to make room are passed to on_evict."""
+    evicted = []
+    cache = LRUCache(maxsize=1, on_evict=lambda key, value: evicted.append((key, value)))
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.pop('b')
+    
+    assert evicted == [('a', 1)]
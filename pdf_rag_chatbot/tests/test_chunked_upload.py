@@ -0,0 +1,82 @@
+"""Unit tests for resumable chunked uploads."""
+import hashlib
+from io import BytesIO
+import pytest
+from chunked_upload import ChunkedUploads, OffsetMismatchError, UploadError
+from conftest import build_pdf
+
+@pytest.fixture
+def uploads(tmp_path):
+    """Upload store writing into a temporary folder."""
+    return ChunkedUploads(str(tmp_path), max_bytes=1024 * 1024)
+
+class _BrokenStream:
+    """Stream delivering some bytes, then failing like a dropped connection."""
+
+    def __init__(self, data):
+        self._data = data
+
+    def read(self, size):
+        if self._data is None:
+            raise ConnectionError('client disconnected')
+        data, self._data = self._data, None
+        return data
+
+def test_chunks_complete_upload_with_digest(uploads):
+    """Test that appended chunks complete the upload and hash it on the way."""
+    data = build_pdf(['The warranty period is two years.'])
+    upload = uploads.create('manual.pdf', len(data), hashlib.sha256(data).hexdigest())
+    
+    middle = len(data) // 2
+    assert uploads.append(upload['id'], 0, BytesIO(data[:middle]))['offset'] == middle
+    done = uploads.append(upload['id'], middle, BytesIO(data[middle:]))
+    
+    assert done['complete'] is True
+    assert done['document_id'] == hashlib.sha256(data).hexdigest()
+    with open(done['path'], 'rb') as handle:
+        assert handle.read() == data
+
+def test_resume_after_disconnect(uploads, tmp_path):
+    """Test that bytes received before a disconnect are kept and the hash rebuilt."""
+    data = build_pdf(['The warranty period is two years.'])
+    upload = uploads.create('manual.pdf', len(data))
+    
+    with pytest.raises(ConnectionError):
+        uploads.append(upload['id'], 0, _BrokenStream(data[:100]))
+    offset = uploads.status(upload['id'])['offset']
+    assert offset == 100
+    
+    # Another process sharing the folder finishes the upload
+    other = ChunkedUploads(str(tmp_path), max_bytes=1024 * 1024)
+    with pytest.raises(OffsetMismatchError) as error:
+        other.append(upload['id'], 0, BytesIO(data))
+    assert error.value.offset == 100
+    done = other.append(upload['id'], offset, BytesIO(data[offset:]))
+    assert done['document_id'] == hashlib.sha256(data).hexdigest()
+
+def test_rejects_invalid_uploads(uploads):
+    """Test size limits, non-PDF contents, overlong chunks and digest mismatches."""
+    with pytest.raises(UploadError):
+        uploads.create('big.pdf', 2 * 1024 * 1024)
+    
+    upload = uploads.create('fake.pdf', 10)
+    with pytest.raises(UploadError, match='not a PDF'):
+        uploads.append(upload['id'], 0, BytesIO(b'GIF89a...'))
+    assert uploads.status(upload['id']) is None
+    
+    upload = uploads.create('short.pdf', 6)
+    with pytest.raises(UploadError, match='past the declared'):
+        uploads.append(upload['id'], 0, BytesIO(b'%PDF-1.4'))
+    
+    upload = uploads.create('wrong.pdf', 8, '0' * 64)
+    with pytest.raises(UploadError, match='sha256'):
+        uploads.append(upload['id'], 0, BytesIO(b'%PDF-1.4'))
+    assert uploads.status(upload['id']) is None
+
+def test_unknown_and_malformed_ids(uploads):
+    """Test that only ids made by the store are accepted."""
+    assert uploads.status('0' * 32) is None
+    assert uploads.status('../secret') is None
+    assert uploads.discard('../secret') is False
+    with pytest.raises(KeyError):
+        uploads.append('../secret', 0, BytesIO(b'%PDF-'))
@@ -0,0 +1,117 @@
+"""Unit tests for the multi-document corpus module."""
+import random
+import pytest
+from corpus import Corpus
+from retrieval import rank_sentences
+
+@pytest.fixture
+def sample_corpus():
+    """Corpus with two small documents."""
+    corpus = Corpus(max_workers=2)
+    corpus.add_document('manual', 'manual.pdf', {
+        'sentences': ['The warranty period is two years.', 'Cleaning requires a dry cloth.'],
+        'pages': [1, 2]
+    })
+    corpus.add_document('guide', 'guide.pdf', {
+        'sentences': ['Extended warranty coverage is optional.', 'Shipping is free.'],
+        'pages': [3, 3]
+    })
+    return corpus
+
+def test_documents_lists_shards(sample_corpus):
+    """Test the document summaries."""
+    summaries = sorted(sample_corpus.documents(), key=lambda d: d['id'])
+    
+    assert summaries == [
+        {'id': 'guide', 'name': 'guide.pdf', 'sentences': 2},
+        {'id': 'manual', 'name': 'manual.pdf', 'sentences': 2}
+    ]
+
+def test_search_merges_hits_across_documents(sample_corpus):
+    """Test that a search ranks hits from every document together."""
+    hits = sample_corpus.search('warranty')
+    
+    assert {hit['document'] for hit in hits} == {'manual', 'guide'}
+    assert hits[0]['score'] >= hits[1]['score']
+    assert all(hit['page'] in (1, 3) for hit in hits)
+
+def test_search_selected_documents(sample_corpus):
+    """Test restricting a search to a subset of documents."""
+    hits = sample_corpus.search('warranty', document_ids=['guide', 'unknown'])
+    
+    assert [hit['sentence'] for hit in hits] == ['Extended warranty coverage is optional.']
+    assert hits[0]['name'] == 'guide.pdf'
+    assert hits[0]['page'] == 3
+
+def test_search_top_k_and_removal(sample_corpus):
+    """Test hit limiting and removing a document."""
+    assert len(sample_corpus.search('warranty', k=1)) == 1
+    
+    assert sample_corpus.remove_document('guide') is True
+    assert sample_corpus.remove_document('guide') is False
+    assert [hit['document'] for hit in sample_corpus.search('warranty')] == ['manual']
+
+def test_update_swaps_documents_in_one_step(sample_corpus):
+    """Test that a replacement is atomic and leaves running searches' snapshot alone."""
+    snapshot = sample_corpus._select(None)
+    
+    removed = sample_corpus.update(
+        [('manual-v2', 'manual.pdf', {'sentences': ['The warranty period is three years.']})],
+        ['manual', 'unknown']
+    )
+    
+    assert removed == ['manual']
+    assert sorted(shard['id'] for shard in snapshot) == ['guide', 'manual']
+    assert sorted(hit['document'] for hit in sample_corpus.search('warranty')) == ['guide', 'manual-v2']
+
+def test_fingerprint_changes_with_selected_documents(sample_corpus):
+    """Test that fingerprints follow the documents searched, and only them."""
+    everything = sample_corpus.fingerprint()
+    manual = sample_corpus.fingerprint(['manual', 'unknown'])
+    
+    assert sample_corpus.fingerprint() == everything
+    assert sample_corpus.fingerprint(['manual', 'guide']) == everything
+    assert manual != everything
+    
+    sample_corpus.add_document('guide', 'renamed.pdf', {'sentences': ['Shipping is free.']})
+    assert sample_corpus.fingerprint() != everything
+    assert sample_corpus.fingerprint(['manual']) == manual
+
+def test_iter_search_yields_each_document(sample_corpus):
+    """Test that streamed per-document hits cover the merged search."""
+    per_document = list(sample_corpus.iter_search('warranty'))
+    
+    assert len(per_document) == 2
+    streamed = sorted(hit['sentence'] for hits in per_document for hit in hits)
+    assert streamed == sorted(hit['sentence'] for hit in sample_corpus.search('warranty'))
+
+def test_search_batch_matches_individual_searches(sample_corpus):
+    """Test that a batch returns what one search per focus would."""
+    focuses = ['warranty', 'shipping', 'warranty', 'unrelated']
+    
+    hits, seconds = sample_corpus.search_batch(focuses, k=2)
+    
+    assert hits == [sample_corpus.search(focus, k=2) for focus in focuses]
+    assert len(seconds) == len(focuses)
+    assert hits[0] is hits[2]
+
+def test_passage_first_ranking_is_opt_in():
+    """Test that large documents are only ranked through passages when enabled."""
+    rng = random.Random(7)
+    words = [f'word{number}' for number in range(200)]
+    sentences = [' '.join(rng.choice(words) for _ in range(rng.randint(4, 20))) + '.' for _ in range(300)]
+    by_sentence = Corpus()
+    by_sentence.add_document('doc', 'doc.pdf', {'sentences': sentences})
+    by_passage = Corpus(passage_first=True)
+    by_passage.add_document('doc', 'doc.pdf', {'sentences': sentences})
+    shard = by_sentence.get_document('doc')
+    
+    def ranked(passages):
+        return [sentence_id for sentence_id, _ in rank_sentences(
+            'word8 word18', sentences, shard['index'], limit=2, passages=passages
+        )]
+    
+    assert ranked(None) != ranked(shard['passages'])
+    assert [hit['sentence_id'] for hit in by_sentence.search('word8 word18', k=2)] == ranked(None)
+    assert [hit['sentence_id'] for hit in by_passage.search('word8 word18', k=2)] == ranked(shard['passages'])
+    assert by_passage.search_batch(['word8 word18'], k=2)[0][0] == by_passage.search('word8 word18', k=2)
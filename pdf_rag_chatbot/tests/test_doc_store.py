@@ -0,0 +1,94 @@
+"""Unit tests for the packed document store."""
+import os
+import pytest
+from doc_store import open_packed_document, write_packed_document
+from response_generator import generate_response
+from passages import build_passages
+from text_index import build_index, expand_terms, search_index
+
+@pytest.fixture
+def processed():
+    """Processed document with non-ASCII text and an unknown page."""
+    sentences = [
+        'The café serves coffee every morning.',
+        'Python is a programming language.',
+        'Coffee and Python keep the team going.'
+    ]
+    return {
+        'sentences': sentences,
+        'keywords': ['coffee', 'python', 'morning'],
+        'entities': ['Python'],
+        'pages': [1, None, 2],
+        'offsets': [0, None, 12],
+        'index': build_index(sentences)
+    }
+
+@pytest.fixture
+def packed(tmp_path, processed):
+    """Packed copy of the processed document."""
+    path = str(tmp_path / 'document.pdoc')
+    write_packed_document(path, processed, {'name': 'menu.pdf'})
+    return open_packed_document(path)
+
+def test_round_trip_preserves_fields(packed, processed):
+    """Test that every column reads back as written."""
+    assert list(packed['sentences']) == processed['sentences']
+    assert list(packed['keywords']) == processed['keywords']
+    assert list(packed['entities']) == processed['entities']
+    assert list(packed['pages']) == [1, None, 2]
+    assert packed['sentences'][-1] == processed['sentences'][-1]
+    assert packed.metadata == {'name': 'menu.pdf'}
+
+def test_packed_index_ranks_like_original(packed, processed):
+    """Test that BM25 search over the packed postings matches the dict index."""
+    terms = ['coffee', 'python', 'missing']
+    
+    assert search_index(packed['index'], terms) == search_index(processed['index'], terms)
+    assert sorted(packed['index']['postings']) == sorted(processed['index']['postings'])
+    assert expand_terms(packed['index'], ['cofee']) == ['coffee']
+
+def test_packed_passages_read_back(tmp_path, processed):
+    """Test that passages and sentence offsets are stored with the document."""
+    passages = build_passages(processed['index'], max_tokens=12, overlap=6)
+    path = str(tmp_path / 'passages.pdoc')
+    write_packed_document(path, dict(processed, passages=passages))
+    
+    document = open_packed_document(path)
+    
+    assert list(document['offsets']) == [0, None, 12]
+    assert list(document['passages']['bounds']) == passages['bounds'] == [(0, 2), (1, 3)]
+    assert dict(document['passages']['index']['postings']) == passages['index']['postings']
+    assert list(document['passages']['index']['lengths']) == passages['index']['lengths']
+
+def test_generate_response_reads_packed_document(packed):
+    """Test that response generation works on the packed view directly."""
+    response = generate_response({'focus': 'python language', 'intent': 'statement'}, packed)
+    
+    assert 'Python is a programming language.' in response['response']
+
+def test_empty_document(tmp_path):
+    """Test that a document without sentences can be stored."""
+    path = str(tmp_path / 'empty.pdoc')
+    write_packed_document(path, {'sentences': [], 'keywords': [], 'entities': []})
+    
+    document = open_packed_document(path)
+    
+    assert len(document['sentences']) == 0
+    assert document['index']['size'] == 0
+
+def test_open_rejects_missing_and_foreign_files(tmp_path):
+    """Test that files not in the packed format are not opened."""
+    foreign = tmp_path / 'foreign.pdoc'
+    foreign.write_bytes(b'%PDF-1.4 not a packed document')
+    
+    assert open_packed_document(str(tmp_path / 'missing.pdoc')) is None
+    assert open_packed_document(str(foreign)) is None
+
+def test_open_rejects_truncated_file(tmp_path, processed):
+    """Test that a file cut off inside its header is not opened."""
+    path = tmp_path / 'doc.pdoc'
+    write_packed_document(str(path), processed)
+    path.write_bytes(path.read_bytes()[:20])
+    
+    assert open_packed_document(str(path)) is None
+    assert [name for name in os.listdir(tmp_path)] == ['doc.pdoc']
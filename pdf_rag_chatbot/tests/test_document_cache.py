@@ -0,0 +1,65 @@
+"""Unit tests for the content-addressed document cache."""
+import os
+import pytest
+from document_cache import DocumentCache, hash_bytes
+
+@pytest.fixture
+def sample_processed():
+    """Sample process_text output."""
+    return {
+        'sentences': ['The warranty period is two years.'],
+        'keywords': ['warranty', 'period', 'years'],
+        'entities': ['two years']
+    }
+
+def test_hash_bytes_is_content_addressed():
+    """Test that equal bytes hash equally and different bytes differ."""
+    assert hash_bytes(b'%PDF-1.4 a') == hash_bytes(b'%PDF-1.4 a')
+    assert hash_bytes(b'%PDF-1.4 a') != hash_bytes(b'%PDF-1.4 b')
+    assert len(hash_bytes(b'')) == 64
+
+def test_put_and_get_round_trip(tmp_path, sample_processed):
+    """Test that stored entries are returned intact."""
+    cache = DocumentCache(str(tmp_path), 'v1')
+    digest = hash_bytes(b'document')
+    
+    assert cache.get(digest) is None
+    cache.put(digest, 'The warranty period is two years.', sample_processed)
+    
+    entry = cache.get(digest)
+    assert entry['text'] == 'The warranty period is two years.'
+    assert entry['processed'] == sample_processed
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+def test_version_change_misses(tmp_path, sample_processed):
+    """Test that entries written under another pipeline version are not served."""
+    digest = hash_bytes(b'document')
+    DocumentCache(str(tmp_path), 'v1').put(digest, 'text', sample_processed)
+    
+    assert DocumentCache(str(tmp_path), 'v2').get(digest) is None
+    assert DocumentCache(str(tmp_path), 'v1').get(digest) is not None
+
+def test_lru_eviction_respects_max_bytes(tmp_path, sample_processed):
+    """Test that the least recently used entry is evicted first."""
+    cache = DocumentCache(str(tmp_path), 'v1')
+    cache.put('a', 'text a', sample_processed)
+    entry_size = os.path.getsize(cache._path('a'))
+    cache.max_bytes = entry_size * 2 + entry_size // 2
+    
+    cache.put('b', 'text b', sample_processed)
+    os.utime(cache._path('a'), (1, 1))
+    os.utime(cache._path('b'), (2, 2))
+    cache.get('a')  # 'a' becomes the most recently used entry
+    cache.put('c', 'text c', sample_processed)
+    
+    assert cache.get('a') is not None
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    """Test that unreadable entries are treated as misses."""
+    cache = DocumentCache(str(tmp_path), 'v1')
+    with open(cache._path('bad'), 'wb') as handle:
+        handle.write(b'not compressed')
+    
+    assert cache.get('bad') is None
@@ -0,0 +1,60 @@
+"""Unit tests for the fuzzy term index module."""
+import pytest
+from nltk.metrics.distance import edit_distance
+from fuzzy_index import LazyFuzzyIndex, bounded_edit_distance, build_fuzzy_index, fuzzy_lookup
+
+@pytest.fixture
+def sample_vocabulary():
+    """Sample document vocabulary."""
+    return ['cloud', 'clouds', 'computing', 'warranty', 'period', 'ai', 'service']
+
+@pytest.mark.parametrize('source,target', [
+    ('cloud', 'clod'),
+    ('warranty', 'waranty'),
+    ('computing', 'computer'),
+    ('period', 'perido'),
+    ('', 'ab'),
+    ('kitten', 'sitting')
+])
+def test_bounded_edit_distance_matches_levenshtein(source, target):
+    """Test that distances within the bound agree with full Levenshtein."""
+    expected = edit_distance(source, target)
+    result = bounded_edit_distance(source, target, max_distance=2)
+    
+    assert result == (expected if expected <= 2 else 3)
+
+def test_bounded_edit_distance_exits_early_on_length_gap():
+    """Test that strings differing greatly in length are rejected."""
+    assert bounded_edit_distance('a', 'abcdef', max_distance=2) == 3
+
+def test_fuzzy_lookup_finds_typos(sample_vocabulary):
+    """Test that misspelt terms map to the intended vocabulary terms."""
+    fuzzy_index = build_fuzzy_index(sample_vocabulary)
+    
+    assert fuzzy_lookup(fuzzy_index, 'waranty') == ['warranty']
+    assert fuzzy_lookup(fuzzy_index, 'clowd') == ['cloud', 'clouds']
+    assert fuzzy_lookup(fuzzy_index, 'servise') == ['service']
+
+def test_fuzzy_lookup_agrees_with_brute_force(sample_vocabulary):
+    """Test that lookups return exactly the terms within the distance."""
+    fuzzy_index = build_fuzzy_index(sample_vocabulary)
+    
+    for query in ['cloud', 'compting', 'peroid', 'a', 'xyz']:
+        expected = sorted(term for term in sample_vocabulary if edit_distance(query, term) <= 2)
+        assert fuzzy_lookup(fuzzy_index, query) == expected
+
+def test_fuzzy_lookup_no_match(sample_vocabulary):
+    """Test lookups of terms far from the vocabulary."""
+    fuzzy_index = build_fuzzy_index(sample_vocabulary)
+    assert fuzzy_lookup(fuzzy_index, 'blockchain') == []
+
+def test_lazy_fuzzy_index_builds_on_first_lookup(sample_vocabulary):
+    """Test that the lazy index is only built by a lookup, and only once."""
+    fuzzy_index = LazyFuzzyIndex(sample_vocabulary)
+    assert not fuzzy_index.built
+    
+    assert fuzzy_lookup(fuzzy_index, 'waranty') == ['warranty']
+    assert fuzzy_index.built
+    deletes = fuzzy_index['deletes']
+    assert fuzzy_lookup(fuzzy_index, 'clowd') == ['cloud', 'clouds']
+    assert fuzzy_index['deletes'] is deletes
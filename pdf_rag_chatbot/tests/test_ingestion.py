@@ -0,0 +1,318 @@
+"""Unit tests for the ingestion pipeline and background job queue."""
+import os
+import shutil
+import threading
+import time
+import pytest
+from conftest import HangingExtractor, build_pdf
+from corpus import Corpus
+from document_cache import DocumentCache, hash_bytes
+from ingestion import DONE, FAILED, DocumentIngestor, IngestionError, IngestionQueue, QueueFullError
+from pdf_processor import EXTRACTORS
+
+@pytest.fixture
+def ingestor(tmp_path):
+    """Ingestion pipeline writing into temporary folders."""
+    config = {
+        'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+        'SPOOL_THRESHOLD': 1024 * 1024,
+        'INDEX_FOLDER': str(tmp_path / 'indexes'),
+        'PDF_EXTRACTOR': 'pypdf2',
+        'PDF_PAGE_TIMEOUT': None,
+        'SEGMENT_GRACE_PERIOD': 60,
+        'COMPACTION_INTERVAL': 3600
+    }
+    return DocumentIngestor(Corpus(), DocumentCache(str(tmp_path / 'cache'), 'v1'), config)
+
+def _cached_upload(ingestor, sentence):
+    """Build a one-page PDF whose processing results are already cached."""
+    data = build_pdf([sentence])
+    ingestor.document_cache.put(hash_bytes(data), sentence, {
+        'sentences': [sentence],
+        'keywords': [],
+        'entities': [],
+        'pages': [1]
+    })
+    return data
+
+def _wait_for(job, timeout=5.0):
+    """Wait until a job has finished running."""
+    deadline = time.time() + timeout
+    while job.status not in (DONE, FAILED) and time.time() < deadline:
+        time.sleep(0.01)
+
+def test_ingest_rejects_invalid_pdf(ingestor):
+    """Test that invalid uploads raise an ingestion error."""
+    with pytest.raises(IngestionError, match='Invalid PDF file'):
+        ingestor.ingest(b'%PDF-1.4 Test PDF content', 'test.pdf')
+
+def test_ingest_cached_document_skips_processing(ingestor):
+    """Test that a cached upload is indexed without extraction or NLP."""
+    data = build_pdf(['The warranty period is two years.'])
+    ingestor.document_cache.put(hash_bytes(data), 'The warranty period is two years.', {
+        'sentences': ['The warranty period is two years.'],
+        'keywords': ['warranty'],
+        'entities': [],
+        'pages': [1]
+    })
+    
+    result = ingestor.ingest(data, 'manual.pdf')
+    
+    assert result['cached'] is True
+    assert result['document_id'] == hash_bytes(data)
+    assert 'extract' not in result['timings']
+    assert 'load' in result['timings']
+    assert ingestor.corpus.search('warranty')[0]['name'] == 'manual.pdf'
+    
+    # The fuzzy term index waits for the first typo-tolerant lookup, and the
+    # passage index shares it
+    shard = ingestor.corpus.get_document(result['document_id'])
+    assert not shard['index']['fuzzy'].built
+    assert shard['passages']['index']['fuzzy'] is shard['index']['fuzzy']
+    assert ingestor.corpus.search('waranty')[0]['name'] == 'manual.pdf'
+    assert shard['index']['fuzzy'].built
+
+def _sentence_per_page(pages):
+    """Stand-in for process_pages taking each non-empty page's text as one sentence."""
+    pages = [(number, text) for number, text in pages if text]
+    return {
+        'sentences': [text for _, text in pages],
+        'keywords': [],
+        'entities': [],
+        'pages': [number for number, _ in pages],
+        'offsets': [0] * len(pages)
+    }
+
+def test_large_uploads_are_spooled_to_their_own_file(ingestor, monkeypatch):
+    """Test that concurrent uploads with one name never share a spool file, which is removed."""
+    ingestor.config['SPOOL_THRESHOLD'] = 0
+    spooled = []
+    
+    def process_pages(pages):
+        processed = _sentence_per_page(pages)
+        spooled.append(os.listdir(ingestor.config['UPLOAD_FOLDER']))
+        return processed
+    
+    monkeypatch.setattr('ingestion.process_pages', process_pages)
+    first = ingestor.ingest(build_pdf(['The warranty period is two years.']), 'manual.pdf')
+    second = ingestor.ingest(build_pdf(['The warranty period is three years.']), 'manual.pdf')
+    
+    assert first['document_id'] != second['document_id']
+    assert [len(names) for names in spooled] == [1, 1]
+    assert spooled[0] != spooled[1] and 'manual.pdf' not in spooled[0] + spooled[1]
+    assert os.listdir(ingestor.config['UPLOAD_FOLDER']) == []
+
+def test_ingest_rejects_partly_extracted_pdf(ingestor, monkeypatch):
+    """Test that a document whose extraction fails part way is neither cached nor indexed."""
+    def fail_after_first_page(extractor, document, source, workers, page_timeout):
+        yield 'The warranty period is two years.', None
+        raise RuntimeError('worker process died')
+    
+    monkeypatch.setattr('pdf_processor._extract_pages', fail_after_first_page)
+    monkeypatch.setattr('ingestion.process_pages', _sentence_per_page)
+    data = build_pdf(['The warranty period is two years.', 'Returns are free.'])
+    
+    with pytest.raises(IngestionError, match='worker process died'):
+        ingestor.ingest(data, 'manual.pdf')
+    assert ingestor.document_cache.get(hash_bytes(data)) is None
+    assert not os.path.exists(os.path.join(ingestor.config['INDEX_FOLDER'], hash_bytes(data)))
+    assert ingestor.corpus.documents() == []
+
+def test_ingest_off_main_thread_skips_hanging_page(ingestor, monkeypatch):
+    """Test that the page timeout holds for uploads ingested on a request or worker thread."""
+    monkeypatch.setitem(EXTRACTORS, 'pypdf2', HangingExtractor)
+    monkeypatch.setattr('ingestion.process_pages', _sentence_per_page)
+    ingestor.config['PDF_PAGE_TIMEOUT'] = 0.5
+    results = []
+    thread = threading.Thread(target=lambda: results.append(
+        ingestor.ingest(build_pdf(['First', 'Hang', 'Third']), 'manual.pdf')
+    ))
+    thread.start()
+    thread.join(30)
+    
+    assert not thread.is_alive()
+    shard = ingestor.corpus.get_document(results[0]['document_id'])
+    assert list(shard['sentences']) == ['First', 'Third']
+    assert list(shard['pages']) == [1, 3]
+
+def test_ingest_reads_upload_from_disk(ingestor, pdf_factory):
+    """Test that an upload on disk is hashed from the file when no digest is given."""
+    path = pdf_factory(['The warranty period is two years.'])
+    with open(path, 'rb') as handle:
+        digest = hash_bytes(handle.read())
+    ingestor.document_cache.put(digest, 'The warranty period is two years.', {
+        'sentences': ['The warranty period is two years.'],
+        'keywords': ['warranty'],
+        'entities': [],
+        'pages': [1]
+    })
+    
+    assert ingestor.ingest(path, 'manual.pdf')['document_id'] == digest
+
+def test_sync_reopens_packed_documents(ingestor):
+    """Test that documents indexed earlier are restored into a new corpus."""
+    data = build_pdf(['The warranty period is two years.'])
+    ingestor.document_cache.put(hash_bytes(data), 'The warranty period is two years.', {
+        'sentences': ['The warranty period is two years.'],
+        'keywords': ['warranty'],
+        'entities': [],
+        'pages': [1]
+    })
+    ingestor.ingest(data, 'manual.pdf')
+    restarted = DocumentIngestor(Corpus(), ingestor.document_cache, ingestor.config)
+    
+    assert restarted.sync() == 1
+    assert restarted.sync() == 0
+    assert restarted.corpus.search('warrenty')[0]['page'] == 1
+    assert restarted.ingest(data, 'manual.pdf')['cached'] is True
+
+def test_replacement_and_deletion_reach_other_workers(ingestor):
+    """Test that replacing and deleting documents apply to every worker's corpus."""
+    old = ingestor.ingest(_cached_upload(ingestor, 'The warranty period is two years.'), 'manual.pdf')
+    other = DocumentIngestor(Corpus(), ingestor.document_cache, ingestor.config)
+    assert other.sync() == 1
+    
+    new = ingestor.ingest(
+        _cached_upload(ingestor, 'The warranty period is three years.'),
+        'manual.pdf',
+        replaces=old['document_id']
+    )
+    
+    assert new['replaced'] == old['document_id']
+    assert [hit['sentence'] for hit in ingestor.corpus.search('warranty')] == ['The warranty period is three years.']
+    assert other.sync() == 2
+    assert [hit['document'] for hit in other.corpus.search('warranty')] == [new['document_id']]
+    
+    assert ingestor.delete(new['document_id']) is True
+    assert ingestor.delete(new['document_id']) is False
+    assert other.sync() == 1
+    assert other.corpus.documents() == []
+
+def test_compaction_removes_deleted_documents_files(ingestor):
+    """Test that deleted documents' files stay for the grace period, then go."""
+    data = _cached_upload(ingestor, 'The warranty period is two years.')
+    kept = ingestor.ingest(_cached_upload(ingestor, 'Shipping is free.'), 'shipping.pdf')['document_id']
+    deleted = ingestor.ingest(data, 'manual.pdf')['document_id']
+    ingestor.delete(deleted)
+    index_folder = ingestor.config['INDEX_FOLDER']
+    
+    assert ingestor.compact() == []
+    ingestor.config['SEGMENT_GRACE_PERIOD'] = 0
+    assert ingestor.compact() == [deleted]
+    assert sorted(os.listdir(index_folder)) == sorted([kept, 'manifest.json', 'manifest.lock'])
+    
+    # Uploading the document again makes it live once more
+    assert ingestor.ingest(data, 'manual.pdf')['document_id'] == deleted
+    assert ingestor.corpus.search('warranty')[0]['document'] == deleted
+
+def test_publish_rewrites_compacted_segment(ingestor):
+    """Test that a document compacted while open is written again from its mapping."""
+    digest = ingestor.ingest(_cached_upload(ingestor, 'The warranty period is two years.'), 'manual.pdf')['document_id']
+    index_dir = os.path.join(ingestor.config['INDEX_FOLDER'], digest)
+    document = ingestor._open_document(index_dir)
+    ingestor.delete(digest)
+    ingestor.config['SEGMENT_GRACE_PERIOD'] = 0
+    ingestor.compact()
+    
+    ingestor._publish(digest, 'manual.pdf', document, None)
+    
+    reopened = ingestor._open_document(index_dir)
+    assert list(reopened['sentences']) == ['The warranty period is two years.']
+    assert list(reopened['passages']['bounds']) == list(document['passages']['bounds'])
+
+def test_sync_lists_folder_without_manifest(ingestor):
+    """Test that an index folder written before manifests existed is restored."""
+    ingestor.ingest(_cached_upload(ingestor, 'The warranty period is two years.'), 'manual.pdf')
+    os.remove(os.path.join(ingestor.config['INDEX_FOLDER'], 'manifest.json'))
+    restarted = DocumentIngestor(Corpus(), ingestor.document_cache, ingestor.config)
+    
+    assert restarted.sync() == 1
+    assert restarted.corpus.documents()[0]['name'] == 'manual.pdf'
+
+def test_queue_runs_jobs_and_records_results():
+    """Test that submitted jobs run in the background."""
+    ingestion_queue = IngestionQueue(lambda data, filename, job: {'size': len(data)}, workers=1)
+    # Workers start on first use, so pre-fork servers start them per process
+    assert ingestion_queue._workers == []
+    
+    job = ingestion_queue.submit(b'abc', 'test.pdf')
+    _wait_for(job)
+    
+    assert ingestion_queue.get(job.id) is job
+    assert job.to_dict()['status'] == DONE
+    assert job.result == {'size': 3}
+    assert ingestion_queue.get('unknown') is None
+
+def test_queue_shares_job_status_through_job_folder(tmp_path):
+    """Test that another process's queue reports jobs from the shared job folder."""
+    def handler(data, filename, job):
+        job.set_stage('extract')
+        job.set_progress(2, 2)
+        return {'size': len(data)}
+    ingestion_queue = IngestionQueue(handler, workers=1, job_folder=str(tmp_path))
+    other = IngestionQueue(handler, workers=1, job_folder=str(tmp_path))
+    
+    job = ingestion_queue.submit(b'abc', 'test.pdf')
+    deadline = time.time() + 5
+    while other.get(job.id).status != DONE and time.time() < deadline:
+        time.sleep(0.01)
+    
+    assert other.get(job.id).to_dict() == job.to_dict()
+    assert other.get(job.id).to_dict()['pages_done'] == 2
+    assert other.get('0' * 32) is None
+    assert other.get('../secret') is None
+    other.job_ttl = 0
+    assert other.get(job.id) is None
+
+def test_queue_workers_survive_unwritable_job_folder(tmp_path):
+    """Test that job records failing to write neither fail jobs nor stop the workers."""
+    job_folder = tmp_path / 'jobs'
+    ingestion_queue = IngestionQueue(lambda data, filename, job: {'size': len(data)}, workers=1, job_folder=str(job_folder))
+    shutil.rmtree(job_folder)
+    
+    jobs = [ingestion_queue.submit(b'abc', 'test.pdf') for _ in range(2)]
+    for job in jobs:
+        _wait_for(job)
+    
+    assert [job.status for job in jobs] == [DONE, DONE]
+    assert ingestion_queue.get(jobs[1].id) is jobs[1]
+    assert all(worker.is_alive() for worker in ingestion_queue._workers)
+
+def test_queue_passes_options_to_handler():
+    """Test that keyword options given to submit reach the handler."""
+    ingestion_queue = IngestionQueue(lambda data, filename, job, digest=None: {'digest': digest}, workers=1)
+    
+    job = ingestion_queue.submit('upload.pdf', 'upload.pdf', digest='abc')
+    _wait_for(job)
+    
+    assert job.result == {'digest': 'abc'}
+
+def test_queue_records_failures():
+    """Test that handler errors mark the job as failed."""
+    def failing(data, filename, job):
+        raise IngestionError('Invalid PDF file')
+    ingestion_queue = IngestionQueue(failing, workers=1)
+    
+    job = ingestion_queue.submit(b'abc', 'test.pdf')
+    _wait_for(job)
+    
+    assert job.status == FAILED
+    assert job.error == 'Invalid PDF file'
+
+def test_queue_applies_backpressure():
+    """Test that submissions beyond the pending limit are rejected."""
+    release = threading.Event()
+    def blocking(data, filename, job):
+        release.wait(5)
+        return {}
+    ingestion_queue = IngestionQueue(blocking, workers=1, max_pending=1)
+    
+    running = ingestion_queue.submit(b'1', 'a.pdf')
+    while running.status != 'running':
+        time.sleep(0.01)
+    ingestion_queue.submit(b'2', 'b.pdf')
+    
+    with pytest.raises(QueueFullError):
+        ingestion_queue.submit(b'3', 'c.pdf')
+    assert ingestion_queue.depth() == 1
+    release.set()
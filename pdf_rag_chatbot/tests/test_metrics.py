@@ -0,0 +1,59 @@
+"""Unit tests for the metrics module."""
+import pytest
+from metrics import Registry, format_server_timing
+
+@pytest.fixture
+def registry():
+    """Enabled, empty metrics registry."""
+    return Registry()
+
+def test_stage_records_histogram(registry):
+    """Test that stage timings land in the histogram buckets."""
+    with registry.stage('retrieval'):
+        pass
+    registry.observe('retrieval', 0.2)
+    
+    text = registry.render()
+    
+    assert '# TYPE pdf_rag_stage_seconds histogram' in text
+    assert 'pdf_rag_stage_seconds_bucket{stage="retrieval",le="0.0005"} 1' in text
+    assert 'pdf_rag_stage_seconds_bucket{stage="retrieval",le="0.25"} 2' in text
+    assert 'pdf_rag_stage_seconds_bucket{stage="retrieval",le="+Inf"} 2' in text
+    assert 'pdf_rag_stage_seconds_count{stage="retrieval"} 2' in text
+
+def test_counters_and_gauges(registry):
+    """Test counter accumulation and gauges read at render time."""
+    registry.increment('http_requests', help_text='HTTP requests', endpoint='chat', status='200')
+    registry.increment('http_requests', endpoint='chat', status='200')
+    registry.add_cache('query', lambda: {'hits': 3, 'misses': 1, 'size': 2})
+    registry.add_gauge('broken', 'Gauge whose callback fails', lambda: 1 / 0)
+    
+    text = registry.render()
+    
+    assert 'pdf_rag_http_requests_total{endpoint="chat",status="200"} 2' in text
+    assert 'pdf_rag_cache_hit_ratio{cache="query"} 0.75' in text
+    assert 'pdf_rag_cache_entries{cache="query"} 2' in text
+    assert '\npdf_rag_broken ' not in text
+
+def test_request_timings_and_server_timing(registry):
+    """Test that stage timings are accumulated per request."""
+    registry.observe('retrieval', 0.5)
+    token = registry.begin_request()
+    registry.observe('retrieval', 0.001)
+    registry.observe('retrieval', 0.002)
+    
+    timings = registry.end_request(token)
+    
+    assert timings == {'retrieval': pytest.approx(0.003)}
+    assert format_server_timing(timings) == 'retrieval;dur=3.00'
+
+def test_disabled_registry_records_nothing():
+    """Test that a disabled registry ignores measurements."""
+    registry = Registry(enabled=False)
+    token = registry.begin_request()
+    with registry.stage('retrieval'):
+        pass
+    registry.increment('http_requests')
+    
+    assert registry.end_request(token) == {}
+    assert registry.render() == '\n'
@@ -1,6 +1,12 @@
 """Unit tests for the NLP processor module."""
 import pytest
-from nlp_processor import process_text, analyze_query
+import nlp_processor
+from caching import LRUCache
+from nlp_processor import (
+    OFFLINE_ENV_VAR, ResourceUnavailableError, analyze_queries, analyze_query, get_nlp,
+    get_sentence_tokenizer, get_stopwords, iter_processed_pages, normalize_query,
+    process_pages, process_text, query_cache_stats, _split_chunks
+)
 
 @pytest.fixture
 def sample_text():
@@ -52,6 +58,32 @@ def test_process_text_with_empty_input():
     assert len(result['keywords']) == 0
     assert len(result['entities']) == 0
 
+def test_process_text_chunked_matches_whole(sample_text):
+    """Test that small chunks and batches give the same elements."""
+    whole = process_text(sample_text)
+    chunked = process_text(sample_text, chunk_chars=60, batch_size=2)
+    
+    assert chunked['sentences'] == whole['sentences']
+    assert set(chunked['keywords']) == set(whole['keywords'])
+    assert any('Microsoft' in e for e in chunked['entities'])
+
+def test_process_text_requested_outputs_only(sample_text):
+    """Test that outputs not requested are left empty."""
+    result = process_text(sample_text, outputs=('keywords',))
+    
+    assert result['sentences'] == []
+    assert result['entities'] == []
+    assert 'software' in result['keywords']
+
+def test_split_chunks_respects_limit():
+    """Test that chunks stay within the size limit and keep all text."""
+    text = 'First sentence here. Second sentence here.\n\nA new paragraph follows.'
+    chunks = _split_chunks(text, 30)
+    
+    assert all(len(chunk) <= 30 for chunk in chunks)
+    assert ' '.join(chunks).split() == text.split()
+    assert _split_chunks('', 30) == []
+
 def test_analyze_query_with_question(sample_queries):
     """Test query analysis with question queries."""
     for query in sample_queries[:2]:  # First two are questions
@@ -77,4 +109,112 @@ def test_analyze_query_with_empty_input():
     
     assert isinstance(result, dict)
     assert result['intent'] == 'statement'
-    assert result['focus'] == ''
\ No newline at end of file
+    assert result['focus'] == ''
+def test_resources_are_loaded_once():
+    """Test that lazily loaded resources are shared singletons."""
+    assert get_nlp() is get_nlp()
+    assert get_stopwords() is get_stopwords()
+    assert 'the' in get_stopwords()
+
+def test_offline_mode_fails_fast(monkeypatch):
+    """Test that missing resources raise instead of downloading when offline."""
+    def missing(path):
+        raise LookupError(path)
+    
+    monkeypatch.setenv(OFFLINE_ENV_VAR, '1')
+    monkeypatch.setattr(nlp_processor, '_resources', {})
+    monkeypatch.setattr(nlp_processor.nltk.data, 'find', missing)
+    monkeypatch.setattr(nlp_processor.nltk, 'download', pytest.fail)
+    
+    with pytest.raises(ResourceUnavailableError):
+        get_stopwords()
+    with pytest.raises(ResourceUnavailableError):
+        get_sentence_tokenizer()
+
+def test_normalize_query():
+    """Test that equivalent queries share a normalized form."""
+    assert normalize_query('  What is the  Warranty period? ') == 'what is the warranty period'
+    assert normalize_query('what is the warranty period') == 'what is the warranty period'
+
+def test_analyze_query_is_cached(monkeypatch):
+    """Test that repeated queries skip the analysis and count as hits."""
+    calls = []
+    def fake_analysis(query):
+        calls.append(query)
+        return {'intent': 'question', 'focus': 'the warranty period'}
+    
+    monkeypatch.setattr(nlp_processor, '_query_cache', LRUCache(8))
+    monkeypatch.setattr(nlp_processor, '_analyze_query', fake_analysis)
+    
+    first = analyze_query('What is the warranty period?')
+    second = analyze_query('what is the  warranty period')
+    
+    assert first == second
+    assert len(calls) == 1
+    assert query_cache_stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+def test_keyword_queries_skip_the_parser(monkeypatch):
+    """Test that a few words without stopwords are the focus, without parsing."""
+    class Parsed(Exception):
+        pass
+    def parser():
+        raise Parsed()
+    
+    monkeypatch.setattr(nlp_processor, '_query_cache', LRUCache(8))
+    monkeypatch.setattr(nlp_processor, 'get_stopwords', lambda: frozenset({'me', 'more', 'the', 'is', 'what'}))
+    monkeypatch.setattr(nlp_processor, 'get_nlp', parser)
+    
+    assert analyze_queries(['Warranty period?', 'battery']) == [
+        {'intent': 'statement', 'focus': 'Warranty period'},
+        {'intent': 'statement', 'focus': 'battery'}
+    ]
+    with pytest.raises(Parsed):
+        analyze_query('Tell me more')
+    with pytest.raises(Parsed):
+        analyze_query('warranty period battery replacement')
+
+def test_analyze_queries_parses_distinct_uncached_queries_once(monkeypatch):
+    """Test that batch analysis reuses the cache and parses each new query once."""
+    batches = []
+    def fake_batch(queries):
+        batches.append(queries)
+        return [{'intent': 'question', 'focus': query.split()[-1]} for query in queries]
+    
+    monkeypatch.setattr(nlp_processor, '_query_cache', LRUCache(8))
+    monkeypatch.setattr(nlp_processor, '_analyze_query_batch', fake_batch)
+    analyze_query('What is the warranty')
+    
+    analyses = analyze_queries(['what is the warranty', 'Who pays shipping', 'who pays  shipping?'])
+    
+    assert batches == [['What is the warranty'], ['Who pays shipping']]
+    assert [analysis['focus'] for analysis in analyses] == ['warranty', 'shipping', 'shipping']
+
+def test_analyze_query_intent_without_parse(monkeypatch):
+    """Test that intent detection alone never needs the parser."""
+    monkeypatch.setattr(nlp_processor, '_query_cache', LRUCache(8))
+    monkeypatch.setattr(nlp_processor, 'get_nlp', pytest.fail)
+    
+    assert analyze_query('?!') == {'intent': 'statement', 'focus': ''}
+
+def test_process_pages_joins_sentences_across_pages():
+    """Test that a sentence split by a page break is kept whole."""
+    pages = [
+        (1, 'John Smith works at Microsoft. He is developing new'),
+        (2, 'software for cloud computing. The project aims to improve AI.')
+    ]
+    result = process_pages(pages)
+    
+    assert result['sentences'][1].split() == 'He is developing new software for cloud computing.'.split()
+    assert result['pages'] == [1, 1, 2]
+    assert result['offsets'] == [0, 31, 30]
+    assert 'software' in result['keywords']
+    assert any('Microsoft' in e for e in result['entities'])
+
+def test_iter_processed_pages_streams_events():
+    """Test that results are emitted per page as they are produced."""
+    events = list(iter_processed_pages([(1, 'Cloud computing is useful.'), (2, '')], outputs=('sentences', 'keywords')))
+    
+    assert events[0] == {'type': 'sentence', 'text': 'Cloud computing is useful.', 'page': 1, 'offset': 0}
+    assert events[1]['type'] == 'keywords'
+    assert events[1]['counts']['cloud'] == 1
+    assert not any(event['type'] == 'entities' for event in events)
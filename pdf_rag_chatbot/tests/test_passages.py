@@ -0,0 +1,59 @@
+"""Unit tests for passage chunking and passage-first retrieval."""
+import random
+from passages import build_passages, chunk_sentences
+from retrieval import rank_sentences
+from text_index import build_index
+
+def _document(count=300, seed=7):
+    """Random sentences over a small vocabulary."""
+    rng = random.Random(seed)
+    words = [f'word{number}' for number in range(200)]
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(4, 20))) + '.' for _ in range(count)]
+
+def test_chunk_sentences_respects_budget_and_overlap():
+    """Test that passages are token-budgeted, overlapping and cover every sentence."""
+    lengths = [random.Random(1).randint(1, 40) for _ in range(500)]
+    bounds = chunk_sentences(lengths, max_tokens=100, overlap=25)
+
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(lengths)
+    for (start, stop), (next_start, next_stop) in zip(bounds, bounds[1:]):
+        assert start < next_start <= stop < next_stop
+        assert sum(lengths[next_start:stop]) <= 25
+    for start, stop in bounds:
+        assert stop - start == 1 or sum(lengths[start:stop]) <= 100
+
+def test_chunk_sentences_keeps_long_sentence_alone():
+    """Test that a sentence over the budget still forms a passage."""
+    assert chunk_sentences([5, 300, 5], max_tokens=100, overlap=10) == [(0, 1), (1, 2), (2, 3)]
+
+def test_passage_index_matches_index_over_passage_texts():
+    """Test that the derived passage index equals one built from passage texts."""
+    sentences = _document()
+    passages = build_passages(build_index(sentences))
+    expected = build_index(' '.join(sentences[start:stop]) for start, stop in passages['bounds'])
+
+    assert passages['index'] == expected
+    assert passages['index']['size'] < len(sentences) / 4
+
+def test_rank_through_passages_finds_best_sentences():
+    """Test that passage-first ranking finds the sentences of the best passages."""
+    sentences = _document()
+    sentences[150:152] = ['The warranty covers battery repairs.', 'Warranty claims need a receipt.']
+    index = build_index(sentences)
+    passages = build_passages(index)
+
+    ranked = rank_sentences('warranty battery', sentences, index, limit=2, passages=passages)
+
+    assert [sentence_id for sentence_id, _ in ranked] == [150, 151]
+    assert ranked[0][1] > 1.0 > ranked[1][1] > 0.0
+    assert rank_sentences('warranty', sentences, index, limit=2, min_score=100.0, passages=passages) == []
+    assert rank_sentences('waranty', sentences, index, limit=1, passages=passages)[0][0] == 150
+
+def test_rank_small_document_by_sentence():
+    """Test that a document with few passages is ranked through the sentence index."""
+    sentences = _document(count=20)
+    index = build_index(sentences)
+    passages = build_passages(index)
+
+    assert rank_sentences('word1 word2', sentences, index, limit=2, passages=passages) == \
+        rank_sentences('word1 word2', sentences, index, limit=2)
@@ -1,7 +1,12 @@
 """Unit tests for the PDF processor module."""
 import os
+import threading
 import pytest
-from pdf_processor import extract_text_from_pdf, validate_pdf
+from pdf_processor import (
+    DEFAULT_EXTRACTOR, EXTRACTORS, PyPDF2Extractor, _reading_order,
+    extract_text_from_pdf, get_extractor, ingest_pdf, iter_pages, stream_pdf, validate_pdf
+)
+from conftest import HangingAlternativeExtractor, HangingExtractor, build_pdf
 
 @pytest.fixture
 def sample_pdf_path(tmp_path):
@@ -46,4 +51,126 @@ def test_extract_text_from_pdf_with_valid_file(sample_pdf_path):
 def test_extract_text_from_pdf_with_invalid_file():
     """Test text extraction from an invalid file."""
     result = extract_text_from_pdf('/nonexistent/path/file.pdf')
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+def test_iter_pages_yields_numbered_pages(pdf_factory):
+    """Test page-by-page extraction of a real PDF."""
+    path = pdf_factory(['First page text', 'Second page text'])
+    
+    assert list(iter_pages(path)) == [(1, 'First page text'), (2, 'Second page text')]
+
+def test_extract_text_from_pdf_joins_pages(pdf_factory):
+    """Test that page texts are joined with newlines."""
+    path = pdf_factory(['First page text', 'Second page text'])
+    
+    assert extract_text_from_pdf(path) == 'First page text\nSecond page text'
+
+def test_extract_text_from_pdf_parallel_matches_serial(pdf_factory):
+    """Test that the process-pool mode preserves page order."""
+    path = pdf_factory(['Page number %d' % i for i in range(1, 8)])
+    
+    assert extract_text_from_pdf(path, workers=3) == extract_text_from_pdf(path, workers=1)
+    assert [number for number, _ in iter_pages(path, workers=3)] == list(range(1, 8))
+
+def test_ingest_pdf_from_memory():
+    """Test single-pass validation and extraction of in-memory bytes."""
+    result = ingest_pdf(build_pdf(['First page text', 'Second page text']))
+    
+    assert result['valid'] is True
+    assert result['error'] == ''
+    assert result['pages'] == ['First page text', 'Second page text']
+    assert result['text'] == 'First page text\nSecond page text'
+    assert set(result['timings']) == {'parse', 'extract'}
+
+def test_stream_pdf_extracts_pages_as_consumed():
+    """Test that stream_pdf validates up front and reads each page only when asked."""
+    progress = []
+    result = stream_pdf(build_pdf(['First', 'Second', 'Third']), progress=lambda done, total: progress.append(done))
+    
+    assert result['valid'] is True and progress == []
+    assert next(result['pages']) == (1, 'First')
+    assert progress == [1]
+    assert list(result['pages']) == [(2, 'Second'), (3, 'Third')]
+    assert progress == [1, 2, 3]
+    assert set(result['timings']) == {'parse', 'extract'}
+
+def test_ingest_pdf_from_path(pdf_factory):
+    """Test ingestion from a file path."""
+    result = ingest_pdf(pdf_factory(['Only page']))
+    
+    assert result['valid'] is True
+    assert result['text'] == 'Only page'
+
+def test_ingest_pdf_with_invalid_bytes():
+    """Test ingestion of bytes that are not a PDF."""
+    result = ingest_pdf(b'%PDF-1.4 Test PDF content')
+    
+    assert result['valid'] is False
+    assert 'Invalid PDF file' in result['error']
+    assert result['text'] == ''
+    assert 'extract' not in result['timings']
+
+def test_reading_order_reads_columns_in_turn():
+    """Test that two-column lines are read column by column between full-width lines."""
+    lines = [
+        (72, 10, 540, 20, 'Title across the page'),
+        (72, 30, 290, 40, 'Left one'),
+        (320, 30, 540, 40, 'Right one'),
+        (72, 42, 290, 52, 'Left two'),
+        (320, 42, 540, 52, 'Right two'),
+        (72, 60, 540, 70, 'Footer across the page')
+    ]
+    
+    assert [line[4] for line in _reading_order(lines, 612)] == [
+        'Title across the page', 'Left one', 'Left two', 'Right one', 'Right two', 'Footer across the page'
+    ]
+
+def test_pymupdf_extractor_reads_columns_in_order():
+    """Test the layout-aware backend on pages whose content stream interleaves columns."""
+    pytest.importorskip('pymupdf')
+    pdf = build_pdf(['Left one\nLeft two\nRight one\nRight two'], columns=2)
+    
+    assert ingest_pdf(pdf)['pages'] == ['Left one Right one\nLeft two Right two']
+    assert ingest_pdf(pdf, extractor='pymupdf')['pages'] == ['Left one\nLeft two\nRight one\nRight two']
+
+def test_unknown_extractor_is_rejected():
+    """Test that a misconfigured backend name fails loudly."""
+    with pytest.raises(ValueError):
+        get_extractor('missing')
+
+def test_page_timeout_leaves_hanging_page_empty(monkeypatch):
+    """Test that a page running past the timeout, off the main thread, does not stall the document."""
+    monkeypatch.setitem(EXTRACTORS, DEFAULT_EXTRACTOR, HangingExtractor)
+    results = []
+    thread = threading.Thread(target=lambda: results.append(
+        ingest_pdf(build_pdf(['First', 'Hang', 'Third']), page_timeout=0.5)
+    ))
+    thread.start()
+    thread.join(30)
+    
+    assert results[0]['pages'] == ['First', '', 'Third']
+    assert results[0]['fallbacks'] == [{'page': 2, 'reason': 'timeout'}]
+    # Replaced and idle helpers are reused by later documents
+    assert ingest_pdf(build_pdf(['Again']), page_timeout=0.5)['pages'] == ['Again']
+
+def test_page_timeout_falls_back_to_default(monkeypatch):
+    """Test that a page the selected backend hangs on is extracted with PyPDF2."""
+    monkeypatch.setitem(EXTRACTORS, 'hanging', HangingAlternativeExtractor)
+    result = ingest_pdf(build_pdf(['First', 'Hang', 'Third']), extractor='hanging', workers=2, page_timeout=0.5)
+    
+    assert result['pages'] == ['First', 'Hang', 'Third']
+    assert result['fallbacks'] == [{'page': 2, 'reason': 'timeout'}]
+
+def test_failing_backend_falls_back_to_default(monkeypatch):
+    """Test that pages a selected backend cannot extract come from PyPDF2."""
+    class BrokenExtractor(PyPDF2Extractor):
+        name = 'broken'
+        
+        def page_text(self, document, index):
+            raise RuntimeError('cannot decode page')
+    
+    monkeypatch.setitem(EXTRACTORS, 'broken', BrokenExtractor)
+    result = ingest_pdf(build_pdf(['First', 'Second']), extractor='broken')
+    
+    assert result['pages'] == ['First', 'Second']
+    assert result['fallbacks'] == [{'page': 1, 'reason': 'error'}, {'page': 2, 'reason': 'error'}]
@@ -1,6 +1,10 @@
 """Unit tests for the response generator module."""
 import pytest
-from response_generator import generate_response, _find_relevant_sentences, _construct_response
+from corpus import Corpus
+from response_generator import generate_batch_responses, generate_corpus_response, generate_response, stream_corpus_response, _find_relevant_sentences, _construct_response
+from text_index import build_index
+from sessions import new_session_state
+from vector_index import build_vector_index
 
 @pytest.fixture
 def sample_query_analysis():
@@ -62,7 +66,7 @@ def test_find_relevant_sentences():
     
     assert isinstance(result, list)
     assert len(result) > 0
-    assert any('Cloud computing' in s for s in result)
+    assert any('Cloud computing' in s for s, _ in result)
 
 def test_find_relevant_sentences_with_no_matches():
     """Test finding relevant sentences with no matches."""
@@ -93,4 +97,147 @@ def test_construct_response_statement():
 def test_construct_response_empty():
     """Test response construction with no relevant sentences."""
     result = _construct_response('question', [])
-    assert result == "I couldn't find specific information about that."
\ No newline at end of file
+    assert result == "I couldn't find specific information about that."
+def test_find_relevant_sentences_ranked_with_index():
+    """Test that a prebuilt index ranks the best matching sentence first."""
+    sentences = [
+        'Cloud services are popular.',
+        'AI is advancing rapidly.',
+        'Cloud computing is important.'
+    ]
+    index = build_index(sentences)
+    
+    result = _find_relevant_sentences('cloud computing', sentences, [], index)
+    
+    assert [sentence for sentence, _ in result] == ['Cloud computing is important.', 'Cloud services are popular.']
+    assert result[0][1] > result[1][1]
+
+def test_find_relevant_sentences_tolerates_typos():
+    """Test that misspelt focus words still find their sentences."""
+    sentences = [
+        'The warranty period is two years.',
+        'AI is advancing rapidly.'
+    ]
+    
+    result = _find_relevant_sentences('waranty', sentences, [])
+    
+    assert [sentence for sentence, _ in result] == ['The warranty period is two years.']
+
+def test_find_relevant_sentences_falls_back_to_vectors():
+    """Test that sentences with no term match are found by similarity."""
+    sentences = [
+        'Shipping takes five business days.',
+        'AI is advancing rapidly.'
+    ]
+    
+    result = _find_relevant_sentences('shipped', sentences, [], vectors=build_vector_index(sentences))
+    
+    assert result[0][0] == 'Shipping takes five business days.'
+
+def test_generate_corpus_response_cites_document_and_page():
+    """Test that corpus responses name the source document and page."""
+    corpus = Corpus()
+    corpus.add_document('manual', 'manual.pdf', {
+        'sentences': ['The warranty period is two years.', 'Shipping is free.'],
+        'pages': [4, 5]
+    })
+    
+    result = generate_corpus_response({'intent': 'question', 'focus': 'warranty'}, corpus)
+    
+    assert 'two years' in result['response']
+    assert result['source'] == 'manual.pdf, page 4'
+
+def test_find_relevant_sentences_top_k_and_threshold():
+    """Test that only the k best sentences above the threshold are kept."""
+    sentences = [
+        'Cloud computing is important.',
+        'Cloud services are popular.',
+        'Cloud storage is cheap.',
+        'Computing power keeps growing.'
+    ]
+    
+    assert len(_find_relevant_sentences('cloud computing', sentences, [], k=3)) == 3
+    assert _find_relevant_sentences('cloud computing', sentences, [], k=4, min_score=0.9) == [
+        ('Cloud computing is important.', pytest.approx(1.0, abs=0.1))
+    ]
+
+def test_generate_response_confidence_reflects_match(sample_processed_text):
+    """Test that a full match is more confident than a partial one."""
+    full = generate_response({'intent': 'question', 'focus': 'cloud computing'}, sample_processed_text)
+    partial = generate_response({'intent': 'question', 'focus': 'cloud weather'}, sample_processed_text)
+    
+    assert float(partial['confidence']) < float(full['confidence']) <= 1.0
+
+def test_generate_corpus_response_empty_corpus():
+    """Test responses when no document has been uploaded."""
+    result = generate_corpus_response({'intent': 'question', 'focus': 'warranty'}, Corpus())
+    
+    assert result['source'] == 'none'
+    assert result['confidence'] == '0.0'
+
+def test_stream_corpus_response_matches_response():
+    """Test that streamed events end with the same response as the non-streaming path."""
+    corpus = Corpus()
+    corpus.add_document('manual', 'manual.pdf', {
+        'sentences': ['The warranty period is two years.', 'Warranty claims need a receipt.'],
+        'pages': [4, 5]
+    })
+    query_analysis = {'intent': 'question', 'focus': 'warranty'}
+    
+    events = list(stream_corpus_response(query_analysis, corpus))
+    names = [name for name, _ in events]
+    
+    assert names[0] == 'hit'
+    assert names[-1] == 'answer'
+    assert events[-1][1] == generate_corpus_response(query_analysis, corpus)
+    chunks = ''.join(payload['text'] for name, payload in events if name == 'chunk')
+    assert chunks == events[-1][1]['response']
+
+def test_stream_corpus_response_without_hits():
+    """Test that a stream without hits still ends with an answer."""
+    events = list(stream_corpus_response({'intent': 'question', 'focus': 'warranty'}, Corpus()))
+    
+    assert [name for name, _ in events] == ['chunk', 'answer']
+    assert events[-1][1]['source'] == 'none'
+
+def test_generate_corpus_response_follow_up_skips_used_sentences():
+    """Test that a follow-up continues the previous focus with new sentences."""
+    corpus = Corpus()
+    corpus.add_document('manual', 'manual.pdf', {
+        'sentences': [
+            'The warranty period is two years.',
+            'Warranty claims need a receipt.',
+            'Shipping is free.',
+            'The warranty excludes water damage.'
+        ],
+        'pages': [1, 1, 2, 3]
+    })
+    context = new_session_state()
+    
+    first = generate_corpus_response({'intent': 'question', 'focus': 'warranty'}, corpus, context=context)
+    follow_up = generate_corpus_response({'intent': 'statement', 'focus': ''}, corpus, context=context)
+    
+    ranked = [hit['sentence'] for hit in corpus.search('warranty')]
+    assert len(ranked) == 3
+    assert ranked[0] in first['response'] and ranked[1] in first['response']
+    assert follow_up['response'] == ranked[2]
+    assert context['turns'] == 2
+
+def test_generate_batch_responses_match_single_responses():
+    """Test that batch responses equal the per-query responses, with timings."""
+    corpus = Corpus()
+    corpus.add_document('manual', 'manual.pdf', {
+        'sentences': ['The warranty period is two years.', 'Shipping is free.'],
+        'pages': [4, 5]
+    })
+    analyses = [
+        {'intent': 'question', 'focus': 'warranty'},
+        {'intent': 'statement', 'focus': 'shipping'},
+        {'intent': 'question', 'focus': 'refunds'}
+    ]
+    
+    responses = generate_batch_responses(analyses, corpus)
+    
+    for analysis, response in zip(analyses, responses):
+        assert set(response.pop('timings')) == {'retrieval', 'response'}
+        assert response == generate_corpus_response(analysis, corpus)
@@ -0,0 +1,69 @@
+"""Unit tests for the segment manifest, tombstones and compaction."""
+import os
+import pytest
+from segments import SegmentManifest, add_segment, delete_segment
+
+@pytest.fixture
+def segments(tmp_path):
+    """Manifest of an index folder with two segment directories."""
+    for segment_id in ('manual', 'guide'):
+        (tmp_path / segment_id).mkdir()
+        (tmp_path / segment_id / 'document.pdoc').write_bytes(b'packed')
+    return SegmentManifest(str(tmp_path), grace_period=60)
+
+def test_transaction_publishes_generations(segments):
+    """Test that changes publish a new generation and unchanged transactions do not."""
+    assert segments.read() is None and segments.stamp() is None
+    
+    with segments.transaction() as manifest:
+        add_segment(manifest, 'manual', 'manual.pdf')
+    stamp = segments.stamp()
+    with segments.transaction() as manifest:
+        assert delete_segment(manifest, 'unknown') is False
+    
+    assert segments.stamp() == stamp
+    assert segments.read()['generation'] == 1
+    assert list(segments.read()['segments']) == ['manual']
+
+def test_failed_transaction_publishes_nothing(segments):
+    """Test that a transaction raising leaves the published manifest alone."""
+    with segments.transaction() as manifest:
+        add_segment(manifest, 'manual', 'manual.pdf')
+    
+    with pytest.raises(RuntimeError):
+        with segments.transaction() as manifest:
+            delete_segment(manifest, 'manual')
+            raise RuntimeError('interrupted')
+    
+    assert list(segments.read()['segments']) == ['manual']
+
+def test_replacement_tombstones_old_segment(segments):
+    """Test that replacing a segment deletes the old one in the same generation."""
+    with segments.transaction() as manifest:
+        add_segment(manifest, 'manual', 'manual.pdf')
+    with segments.transaction() as manifest:
+        assert add_segment(manifest, 'guide', 'manual.pdf', replaces='manual') == 'manual'
+        assert add_segment(manifest, 'guide', 'manual.pdf', replaces='unknown') is None
+    
+    manifest = segments.read()
+    assert manifest['generation'] == 2
+    assert list(manifest['segments']) == ['guide']
+    assert list(manifest['tombstones']) == ['manual']
+
+def test_compact_removes_expired_tombstones_only(segments):
+    """Test that compaction keeps live segments and recently deleted ones."""
+    with segments.transaction() as manifest:
+        add_segment(manifest, 'manual', 'manual.pdf')
+        add_segment(manifest, 'guide', 'guide.pdf')
+    with segments.transaction() as manifest:
+        assert delete_segment(manifest, 'manual') is True
+        assert delete_segment(manifest, 'manual') is False
+    
+    assert segments.compact() == []
+    segments.grace_period = 0
+    assert segments.compact() == ['manual']
+    
+    assert not os.path.exists(os.path.join(segments.directory, 'manual'))
+    assert os.path.exists(os.path.join(segments.directory, 'guide', 'document.pdoc'))
+    assert segments.read()['tombstones'] == {}
+    assert list(segments.read()['segments']) == ['guide']
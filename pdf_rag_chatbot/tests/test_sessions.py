@@ -0,0 +1,79 @@
+"""Unit tests for the conversation session store."""
+import json
+import os
+from sessions import SessionStore, follow_up, new_session_state, record_turn, set_documents
+
+def _hit(sentence_id, document='manual'):
+    """Build a search hit for a sentence."""
+    return {'document': document, 'sentence_id': sentence_id, 'sentence': f'Sentence {sentence_id}.', 'score': 1.0}
+
+def test_record_turn_skips_seen_sentences_and_keeps_candidates():
+    """Test that answered sentences are not repeated and the rest are kept."""
+    state = new_session_state()
+    hits = [_hit(i) for i in range(5)]
+    
+    assert record_turn(state, 'warranty', hits, 2) == hits[:2]
+    assert record_turn(state, 'warranty', hits, 2) == hits[2:4]
+    assert state['focus'] == ['warranty']
+    assert state['candidates'] == hits[4:]
+
+def test_follow_up_reuses_candidates():
+    """Test that messages without a focus continue the previous one."""
+    state = new_session_state()
+    hits = [_hit(i) for i in range(4)]
+    record_turn(state, 'warranty', hits, 2)
+    
+    assert follow_up(state, '') == ('warranty', hits[2:])
+    assert follow_up(state, 'shipping costs') == ('shipping costs', [])
+
+def test_set_documents_drops_candidates():
+    """Test that changing documents invalidates the stored candidates."""
+    state = new_session_state()
+    record_turn(state, 'warranty', [_hit(i) for i in range(4)], 2)
+    
+    set_documents(state, ['other'])
+    
+    assert state['documents'] == ['other']
+    assert state['candidates'] == []
+
+def test_store_creates_and_returns_sessions():
+    """Test that unknown or malformed ids start new sessions."""
+    store = SessionStore()
+    session_id, state = store.get(None)
+    state['turns'] = 1
+    store.save(session_id, state)
+    
+    assert store.get(session_id) == (session_id, state)
+    assert store.get('../../etc/passwd')[0] != '../../etc/passwd'
+    assert store.get('0' * 32)[0] != '0' * 32
+
+def test_store_shares_sessions_through_folder(tmp_path):
+    """Test that a conversation continues in another process sharing the folder."""
+    store = SessionStore(max_sessions=1, folder=str(tmp_path))
+    other = SessionStore(folder=str(tmp_path))
+    session_id, state = store.get(None)
+    state['focus'] = ['warranty']
+    store.save(session_id, state)
+    
+    assert os.listdir(tmp_path) == [session_id + '.json']
+    _, shared = other.get(session_id)
+    assert shared['focus'] == ['warranty']
+    
+    # A turn answered by the other process replaces the stale copy in memory
+    shared['focus'].append('shipping')
+    other.save(session_id, shared)
+    assert store.get(session_id)[1]['focus'] == ['warranty', 'shipping']
+    
+    # Sessions evicted from memory are read back from the folder
+    store.save(*store.get(None))
+    assert store.get(session_id)[1]['focus'] == ['warranty', 'shipping']
+
+def test_store_ignores_expired_session_files(tmp_path):
+    """Test that session files older than the TTL are not loaded."""
+    store = SessionStore(ttl=60, folder=str(tmp_path))
+    state = new_session_state()
+    state['updated'] -= 120
+    with open(tmp_path / ('a' * 32 + '.json'), 'w') as handle:
+        json.dump(state, handle)
+    
+    assert store.get('a' * 32)[0] != 'a' * 32
@@ -0,0 +1,83 @@
+"""Unit tests for the inverted index module."""
+import pytest
+from text_index import tokenize, build_index, search_index, share_postings
+
+@pytest.fixture
+def sample_sentences():
+    """Sample document sentences for indexing."""
+    return [
+        'Cloud computing is a technology that enables remote access to computing resources.',
+        'It provides scalable and flexible solutions for businesses.',
+        'Many companies are adopting cloud computing for their operations.',
+        'The warranty period is two years.'
+    ]
+
+def test_tokenize_lowercases_and_strips_punctuation():
+    """Test that tokenization yields lowercase word terms."""
+    assert tokenize('Cloud, computing!') == ['cloud', 'computing']
+    assert tokenize('') == []
+
+def test_build_index_postings(sample_sentences):
+    """Test that postings record sentence ids and term frequencies."""
+    index = build_index(sample_sentences)
+    
+    assert index['size'] == 4
+    assert len(index['lengths']) == 4
+    assert index['avg_length'] > 0
+    assert index['postings']['computing'] == [(0, 2), (2, 1)]
+    assert index['postings']['warranty'] == [(3, 1)]
+
+def test_build_index_empty():
+    """Test building an index over no sentences."""
+    index = build_index([])
+    
+    assert index['size'] == 0
+    assert index['postings'] == {}
+    assert index['avg_length'] == 0.0
+
+def test_search_index_ranks_by_bm25(sample_sentences):
+    """Test that sentences matching more query terms rank first."""
+    index = build_index(sample_sentences)
+    result = search_index(index, ['cloud', 'computing', 'operations'])
+    
+    assert [sentence_id for sentence_id, _ in result] == [2, 0]
+    assert all(score > 0 for _, score in result)
+
+def test_search_index_limit_and_missing_terms(sample_sentences):
+    """Test result limiting and unknown query terms."""
+    index = build_index(sample_sentences)
+    
+    assert len(search_index(index, ['cloud'], limit=1)) == 1
+    assert search_index(index, ['nonexistent']) == []
+
+def test_search_index_top_k_matches_full_ranking():
+    """Test that pruned top-k results equal the head of the full ranking."""
+    sentences = [f'term{i % 7} filler{i % 3} term{i % 5} word' for i in range(200)]
+    index = build_index(sentences)
+    terms = ['term1', 'term3', 'filler2', 'word']
+    
+    full = search_index(index, terms)
+    
+    for limit in (1, 5, 50):
+        top = search_index(index, terms, limit=limit)
+        assert [sentence_id for sentence_id, _ in top] == [sentence_id for sentence_id, _ in full[:limit]]
+        assert [score for _, score in top] == pytest.approx([score for _, score in full[:limit]])
+    threshold = full[9][1]
+    assert all(score > threshold for _, score in search_index(index, terms, min_score=threshold))
+
+def test_share_postings_looks_up_each_term_once():
+    """Test that a shared index fetches each posting list once and ranks identically."""
+    index = build_index(['Cloud computing is important.', 'Cloud storage is cheap.'])
+    expected = search_index(index, ['cloud', 'storage', 'missing'])
+    lookups = []
+    class CountingPostings(dict):
+        def get(self, term, default=None):
+            lookups.append(term)
+            return super().get(term, default)
+    index['postings'] = CountingPostings(index['postings'])
+    shared = share_postings(index)
+    
+    for _ in range(3):
+        assert search_index(shared, ['cloud', 'storage', 'missing']) == expected
+    
+    assert sorted(lookups) == ['cloud', 'missing', 'storage']
@@ -0,0 +1,59 @@
+"""Unit tests for the vector retrieval module."""
+import os
+import numpy as np
+import pytest
+from vector_index import build_vector_index, embed_query, load_vector_index, save_vector_index, search_vectors
+
+@pytest.fixture
+def sample_sentences():
+    """Sample document sentences."""
+    return [
+        'The warranty period is two years.',
+        'Shipping takes five business days.',
+        'Warranties cover manufacturing defects.',
+        'Returns are accepted within thirty days.'
+    ]
+
+def test_build_vector_index_layout(sample_sentences):
+    """Test that embeddings form one normalised float32 matrix."""
+    vectors = build_vector_index(sample_sentences, dimensions=256)
+    
+    assert vectors['matrix'].shape == (4, 256)
+    assert vectors['matrix'].dtype == np.float32
+    assert vectors['matrix'].flags['C_CONTIGUOUS']
+    assert np.allclose(np.linalg.norm(vectors['matrix'], axis=1), 1.0)
+
+def test_embed_query_is_deterministic(sample_sentences):
+    """Test that hashing gives the same query vector every time."""
+    vectors = build_vector_index(sample_sentences)
+    
+    assert np.array_equal(embed_query(vectors, 'warranty'), embed_query(vectors, 'warranty'))
+
+def test_search_vectors_matches_word_variants(sample_sentences):
+    """Test that related word forms rank the right sentences first."""
+    vectors = build_vector_index(sample_sentences)
+    
+    assert search_vectors(vectors, 'warranties', k=1)[0][0] == 2
+    assert search_vectors(vectors, 'shipped', k=1)[0][0] == 1
+
+def test_search_vectors_top_k_and_threshold(sample_sentences):
+    """Test result limiting and score filtering."""
+    vectors = build_vector_index(sample_sentences)
+    
+    result = search_vectors(vectors, 'warranty period', k=2)
+    assert len(result) == 2
+    assert result[0][1] >= result[1][1]
+    assert search_vectors(vectors, 'warranty', k=4, min_score=1.0) == []
+    assert search_vectors(build_vector_index([]), 'warranty') == []
+
+def test_save_and_load_memory_mapped(tmp_path, sample_sentences):
+    """Test that a saved index is memory-mapped and searches identically."""
+    vectors = build_vector_index(sample_sentences)
+    save_vector_index(vectors, str(tmp_path / 'vectors'))
+    
+    loaded = load_vector_index(str(tmp_path / 'vectors'))
+    
+    assert isinstance(loaded['matrix'], np.memmap)
+    assert sorted(os.listdir(tmp_path / 'vectors')) == ['idf.npy', 'matrix.npy']
+    assert search_vectors(loaded, 'returns') == search_vectors(vectors, 'returns')
+    assert load_vector_index(str(tmp_path / 'missing')) is None
@@ -0,0 +1,341 @@
+"""Inverted index module for ranking document sentences against a query."""
+import heapq
+import math
+import re
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from fuzzy_index import MAX_EDIT_DISTANCE, LazyFuzzyIndex, build_fuzzy_index, fuzzy_lookup
+
+# BM25 tuning parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# PUBLIC_INTERFACE
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase index terms.
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        List[str]: Lowercase word terms in order of appearance
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+# PUBLIC_INTERFACE
+def build_index(sentences: Iterable[str], fuzzy: bool = False) -> Dict:
+    """
+    Build an inverted index over a document's sentences.
+
+    The index is built once per document (at upload time) and stored with it
+    so that queries only touch the posting lists of their own terms.
+
+    Args:
+        sentences (Iterable[str]): Sentences of the document, in order
+        fuzzy (bool): Attach a fuzzy term index for expand_terms, built
+            by its first lookup and shared by copies of the index
+
+    Returns:
+        Dict: Inverted index
+            {
+                'postings': Mapping of term to a list of (sentence id, term frequency),
+                'lengths': Number of terms in each sentence,
+                'avg_length': Average sentence length in terms,
+                'size': Number of indexed sentences,
+                'fuzzy': LazyFuzzyIndex over the terms (only when fuzzy is True)
+            }
+    """
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+    lengths: List[int] = []
+
+    for sentence_id, sentence in enumerate(sentences):
+        terms = tokenize(sentence)
+        lengths.append(len(terms))
+        for term, frequency in Counter(terms).items():
+            postings.setdefault(term, []).append((sentence_id, frequency))
+
+    size = len(lengths)
+    index = {
+        'postings': postings,
+        'lengths': lengths,
+        'avg_length': (sum(lengths) / size) if size else 0.0,
+        'size': size
+    }
+    if fuzzy:
+        index['fuzzy'] = LazyFuzzyIndex(postings)
+    return index
+
+# PUBLIC_INTERFACE
+def search_index(
+    index: Dict,
+    terms: Iterable[str],
+    limit: Optional[int] = None,
+    min_score: float = 0.0
+) -> List[Tuple[int, float]]:
+    """
+    Rank indexed sentences against query terms using BM25 scoring.
+
+    Only the posting lists of the query terms are visited, merged sentence
+    by sentence (a union of the lists, so sentences matching more terms rank
+    higher) into a min-heap holding the best `limit` results. Once the heap
+    is full its smallest score becomes the entry threshold, and MaxScore
+    pruning applies: lists whose combined score upper bound cannot reach the
+    threshold stop driving the merge and are only probed, by binary search,
+    for sentences that can still qualify.
+
+    Args:
+        index (Dict): Index produced by build_index
+        terms (Iterable[str]): Query terms (already lowercased)
+        limit (Optional[int]): Maximum number of results to return
+        min_score (float): Only return sentences scoring above this
+
+    Returns:
+        List[Tuple[int, float]]: (sentence id, score) pairs, best first
+    """
+    if limit is not None and limit <= 0:
+        return []
+
+    # (score upper bound, idf weight, posting list) per matched term, with
+    # the lists of the lowest-impact terms first
+    lists = []
+    for term in set(terms):
+        postings = index['postings'].get(term)
+        if postings:
+            weight = _idf(index['size'], len(postings))
+            lists.append((weight * (BM25_K1 + 1.0), weight, postings))
+    lists.sort(key=lambda item: item[0])
+    bounds = []
+    total = 0.0
+    for bound, _, _ in lists:
+        total += bound
+        bounds.append(total)
+
+    lengths = index['lengths']
+    avg_length = index['avg_length']
+    positions = [0] * len(lists)
+    top: List[Tuple[float, int]] = []  # min-heap of (score, -sentence id)
+    threshold = min_score
+    # Lists before `essential` cannot lift a sentence above the threshold
+    # on their own, so only the remaining lists propose candidates
+    essential = bisect_right(bounds, threshold)
+
+    while essential < len(lists):
+        # Next candidate: the smallest unvisited sentence id in an essential list
+        candidate = None
+        for number in range(essential, len(lists)):
+            postings = lists[number][2]
+            if positions[number] < len(postings):
+                sentence_id = postings[positions[number]][0]
+                if candidate is None or sentence_id < candidate:
+                    candidate = sentence_id
+        if candidate is None:
+            break
+
+        length = lengths[candidate]
+        score = 0.0
+        for number in range(essential, len(lists)):
+            postings = lists[number][2]
+            position = positions[number]
+            if position < len(postings) and postings[position][0] == candidate:
+                score += lists[number][1] * _term_score(postings[position][1], length, avg_length)
+                positions[number] = position + 1
+
+        # Probe the non-essential lists, highest impact first, while the
+        # candidate can still beat the threshold
+        for number in range(essential - 1, -1, -1):
+            if score + bounds[number] <= threshold:
+                break
+            postings = lists[number][2]
+            position = bisect_left(postings, (candidate,), positions[number])
+            positions[number] = position
+            if position < len(postings) and postings[position][0] == candidate:
+                score += lists[number][1] * _term_score(postings[position][1], length, avg_length)
+
+        if score > threshold:
+            heapq.heappush(top, (score, -candidate))
+            if limit is not None and len(top) > limit:
+                heapq.heappop(top)
+            if limit is not None and len(top) == limit:
+                threshold = max(min_score, top[0][0])
+                essential = bisect_right(bounds, threshold)
+
+    return [(-negated_id, score) for score, negated_id in sorted(top, reverse=True)]
+
+# PUBLIC_INTERFACE
+def query_weight(index: Dict, terms: Iterable[str]) -> float:
+    """
+    Compute the score of an ideal match for query terms.
+
+    This is the BM25 score of a sentence of average length containing every
+    query term once: the sum of the terms' idf weights, where terms missing
+    from the index count with the weight of the rarest possible term. It is
+    used to turn raw scores into comparable relevance values.
+
+    Args:
+        index (Dict): Index produced by build_index
+        terms (Iterable[str]): Query terms (already lowercased)
+
+    Returns:
+        float: Sum of the terms' idf weights
+    """
+    total = 0.0
+    for term in set(terms):
+        postings = index['postings'].get(term)
+        total += _idf(index['size'], len(postings) if postings else 0)
+    return total
+
+# PUBLIC_INTERFACE
+def score_texts(
+    index: Dict,
+    terms: Iterable[str],
+    texts: Iterable[Tuple[int, str]],
+    avg_length: Optional[float] = None
+) -> List[Tuple[int, float]]:
+    """
+    Score a few texts against query terms using BM25, without their postings.
+
+    Term weights come from the index, and term frequencies and lengths from
+    the texts themselves. This re-ranks a small candidate set, such as the
+    sentences of the passages found through a passage index, without reading
+    the candidates' own posting lists.
+
+    Args:
+        index (Dict): Index providing the idf weights of the terms
+        terms (Iterable[str]): Query terms (already lowercased)
+        texts (Iterable[Tuple[int, str]]): (text id, text) pairs to score
+        avg_length (Optional[float]): Average length of the texts' kind,
+            used for length normalisation; the index's when None
+
+    Returns:
+        List[Tuple[int, float]]: (text id, score) pairs of the texts matching
+            any term, best first
+    """
+    weights = {}
+    for term in set(terms):
+        postings = index['postings'].get(term)
+        if postings:
+            weights[term] = _idf(index['size'], len(postings))
+    if avg_length is None:
+        avg_length = index['avg_length']
+
+    scored = []
+    for text_id, text in texts:
+        # A substring test rules out most texts without tokenizing them
+        text = text.lower()
+        if not any(term in text for term in weights):
+            continue
+        text_terms = tokenize(text)
+        counts = Counter(text_terms)
+        score = sum(
+            weight * _term_score(counts[term], len(text_terms), avg_length)
+            for term, weight in weights.items() if term in counts
+        )
+        if score > 0.0:
+            scored.append((text_id, score))
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return scored
+
+# PUBLIC_INTERFACE
+def share_postings(index: Dict) -> Dict:
+    """
+    Wrap an index so each posting list is looked up at most once.
+
+    A batch of queries against one document shares the returned view, so a
+    term used by many queries is fetched (and, for packed documents,
+    decoded from the mapped file) once for the whole batch instead of twice
+    per query by query_weight and search_index.
+
+    Args:
+        index (Dict): Index produced by build_index, or a packed document's
+
+    Returns:
+        Dict: Shallow copy of the index whose 'postings' remembers lookups
+    """
+    return dict(index, postings=_SharedPostings(index['postings']))
+
+# PUBLIC_INTERFACE
+def expand_terms(
+    index: Dict,
+    terms: Iterable[str],
+    max_distance: int = MAX_EDIT_DISTANCE
+) -> List[str]:
+    """
+    Expand query terms to the indexed terms within an edit distance.
+
+    The fuzzy index over the document vocabulary is built on first use and
+    kept in the index under 'fuzzy', so later lookups only verify the few
+    candidate terms sharing a deletion variant with the query term.
+
+    Args:
+        index (Dict): Index produced by build_index
+        terms (Iterable[str]): Query terms (already lowercased)
+        max_distance (int): Largest edit distance to accept
+
+    Returns:
+        List[str]: Distinct indexed terms close to any of the query terms
+    """
+    fuzzy_index = index.get('fuzzy')
+    if fuzzy_index is None:
+        fuzzy_index = index['fuzzy'] = build_fuzzy_index(index['postings'], max_distance)
+
+    expanded: List[str] = []
+    for term in terms:
+        for candidate in fuzzy_lookup(fuzzy_index, term, max_distance):
+            if candidate not in expanded:
+                expanded.append(candidate)
+    return expanded
+
+class _SharedPostings(Mapping):
+    """Posting-list mapping remembering every lookup, including misses."""
+
+    def __init__(self, postings):
+        self._postings = postings
+        self._fetched: Dict[str, Optional[List[Tuple[int, int]]]] = {}
+
+    def __getitem__(self, term: str) -> List[Tuple[int, int]]:
+        try:
+            postings = self._fetched[term]
+        except KeyError:
+            postings = self._fetched[term] = self._postings.get(term)
+        if postings is None:
+            raise KeyError(term)
+        return postings
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._postings)
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+def _idf(size: int, document_frequency: int) -> float:
+    """
+    Compute the BM25 inverse document frequency of a term.
+
+    Args:
+        size (int): Number of indexed sentences
+        document_frequency (int): Number of sentences containing the term
+
+    Returns:
+        float: Inverse document frequency weight
+    """
+    return math.log(1.0 + (size - document_frequency + 0.5) / (document_frequency + 0.5))
+
+def _term_score(frequency: int, length: int, avg_length: float) -> float:
+    """
+    Compute the length-normalised BM25 term frequency component.
+
+    Args:
+        frequency (int): Occurrences of the term in the sentence
+        length (int): Number of terms in the sentence
+        avg_length (float): Average sentence length in the index
+
+    Returns:
+        float: Saturated term frequency score
+    """
+    norm = 1.0 - BM25_B + BM25_B * (length / avg_length if avg_length else 1.0)
+    return frequency * (BM25_K1 + 1.0) / (frequency + BM25_K1 * norm)
@@ -0,0 +1,185 @@
+"""Vector retrieval module: hashed TF-IDF sentence embeddings searched with NumPy."""
+import os
+import tempfile
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from text_index import tokenize
+
+# Width of the hashed embedding space
+DEFAULT_DIMENSIONS = 512
+
+# Weight of character trigram features relative to whole words
+TRIGRAM_WEIGHT = 0.5
+
+_MATRIX_FILE = 'matrix.npy'
+_IDF_FILE = 'idf.npy'
+
+# PUBLIC_INTERFACE
+def build_vector_index(sentences: Iterable[str], dimensions: int = DEFAULT_DIMENSIONS) -> Dict:
+    """
+    Embed every sentence into one contiguous float32 matrix.
+
+    Words and their character trigrams are hashed into a fixed number of
+    signed buckets (the hashing trick), weighted by TF-IDF over the document
+    and L2-normalised, so a dot product is a cosine similarity. Hashing needs
+    no vocabulary or model download and is stable across processes.
+
+    Args:
+        sentences (Iterable[str]): Sentences of the document, in order
+        dimensions (int): Width of the embedding space
+
+    Returns:
+        Dict: Vector index
+            {
+                'matrix': float32 array of shape (sentences, dimensions),
+                'idf': float32 array of bucket weights, shape (dimensions,)
+            }
+    """
+    rows: List[int] = []
+    columns: List[int] = []
+    values: List[float] = []
+    count = 0
+    for row, sentence in enumerate(sentences):
+        count += 1
+        for column, value in _hashed_features(sentence, dimensions):
+            rows.append(row)
+            columns.append(column)
+            values.append(value)
+
+    matrix = np.zeros((count, dimensions), dtype=np.float32)
+    np.add.at(matrix, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), values)
+
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    idf = (np.log((1.0 + count) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+    matrix *= idf
+    _normalize_rows(matrix)
+    return {'matrix': matrix, 'idf': idf}
+
+# PUBLIC_INTERFACE
+def embed_query(vector_index: Dict, text: str) -> np.ndarray:
+    """
+    Embed query text into the space of a vector index.
+
+    Args:
+        vector_index (Dict): Index produced by build_vector_index
+        text (str): Query text
+
+    Returns:
+        np.ndarray: L2-normalised float32 query vector
+    """
+    idf = vector_index['idf']
+    vector = np.zeros(idf.shape[0], dtype=np.float32)
+    for column, value in _hashed_features(text, idf.shape[0]):
+        vector[column] += value
+    vector *= idf
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+# PUBLIC_INTERFACE
+def search_vectors(
+    vector_index: Dict,
+    text: str,
+    k: int = 10,
+    min_score: float = 0.0
+) -> List[Tuple[int, float]]:
+    """
+    Find the sentences most similar to query text.
+
+    Scores every sentence with a single matrix-vector product and selects
+    the top k with argpartition, sorting only those k.
+
+    Args:
+        vector_index (Dict): Index produced by build_vector_index or
+            load_vector_index
+        text (str): Query text
+        k (int): Maximum number of results
+        min_score (float): Smallest cosine similarity to return
+
+    Returns:
+        List[Tuple[int, float]]: (sentence id, similarity) pairs, best first
+    """
+    matrix = vector_index['matrix']
+    if matrix.shape[0] == 0 or k <= 0:
+        return []
+
+    scores = matrix @ embed_query(vector_index, text)
+    if k < scores.shape[0]:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.shape[0])
+    ranked = candidates[np.lexsort((candidates, -scores[candidates]))]
+    return [(int(row), float(scores[row])) for row in ranked if scores[row] > min_score]
+
+# PUBLIC_INTERFACE
+def save_vector_index(vector_index: Dict, directory: str) -> None:
+    """
+    Write a vector index to disk as .npy files.
+
+    Args:
+        vector_index (Dict): Index produced by build_vector_index
+        directory (str): Directory to write the index files into
+    """
+    os.makedirs(directory, exist_ok=True)
+    for name, key in ((_MATRIX_FILE, 'matrix'), (_IDF_FILE, 'idf')):
+        # A temporary file of its own, so concurrent writers never mix bytes
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as temp_file:
+                np.save(temp_file, vector_index[key])
+            os.replace(temp_path, os.path.join(directory, name))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+# PUBLIC_INTERFACE
+def load_vector_index(directory: str, mmap: bool = True) -> Optional[Dict]:
+    """
+    Load a vector index written by save_vector_index.
+
+    With mmap, the matrix is mapped read-only rather than read, so every
+    worker process loading it shares the same page-cache pages.
+
+    Args:
+        directory (str): Directory holding the index files
+        mmap (bool): Memory-map the matrix instead of reading it
+
+    Returns:
+        Optional[Dict]: The vector index, or None if it does not exist
+    """
+    try:
+        return {
+            'matrix': np.load(os.path.join(directory, _MATRIX_FILE), mmap_mode='r' if mmap else None),
+            'idf': np.load(os.path.join(directory, _IDF_FILE))
+        }
+    except (OSError, ValueError):
+        return None
+
+def _hashed_features(text: str, dimensions: int) -> Iterable[Tuple[int, float]]:
+    """
+    Hash the word and character trigram features of text into buckets.
+
+    Args:
+        text (str): Text to featurize
+        dimensions (int): Number of buckets
+
+    Yields:
+        Tuple[int, float]: Bucket index and signed feature weight
+    """
+    for word in tokenize(text):
+        yield _bucket(word, 1.0, dimensions)
+        padded = '<' + word + '>'
+        for start in range(len(padded) - 2):
+            yield _bucket('#' + padded[start:start + 3], TRIGRAM_WEIGHT, dimensions)
+
+def _bucket(feature: str, weight: float, dimensions: int) -> Tuple[int, float]:
+    """Map a feature to a bucket and a hash-derived sign."""
+    digest = zlib.crc32(feature.encode('utf-8'))
+    return digest % dimensions, (weight if digest & 0x80000000 else -weight)
+
+def _normalize_rows(matrix: np.ndarray) -> None:
+    """Scale each row of matrix to unit L2 norm in place."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
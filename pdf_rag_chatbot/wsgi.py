@@ -0,0 +1,28 @@
+"""
+WSGI entry point for production serving.
+
+Run with the bundled Gunicorn settings:
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+Gunicorn imports this module once in its master process (preload_app) and
+then forks the workers, so everything loaded here is shared copy-on-write:
+the spaCy pipeline, the NLTK resources, and the memory-mapped packed
+documents and vector indexes of every document indexed so far. Documents
+uploaded later through any worker are picked up by the others from the
+shared index folder (see DocumentIngestor.sync).
+"""
+import gc
+from app import app, ingestor
+from nlp_processor import warm_up
+
+# Load NLP resources before forking so missing ones fail at startup, and
+# reopen the documents indexed by earlier runs
+warm_up()
+ingestor.sync()
+
+# Stop the garbage collector from tracking the objects loaded so far: its
+# reference bookkeeping would otherwise write to, and so un-share, their pages
+# in every worker
+gc.freeze()
+
+application = app
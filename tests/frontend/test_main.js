@@ -101,8 +101,9 @@ describe('PDF RAG Chatbot Frontend Tests', () => {
             expect(fetch).not.toHaveBeenCalled();
         });
 
-        test('should reject files over 10MB', async () => {
-            const largeFile = new File(['x'.repeat(11 * 1024 * 1024)], 'large.pdf', { type: 'application/pdf' });
+        test('should reject files over 512MB', async () => {
+            const largeFile = new File(['test content'], 'large.pdf', { type: 'application/pdf' });
+            Object.defineProperty(largeFile, 'size', { value: 513 * 1024 * 1024 });
             const dropEvent = new DragEvent('drop');
             Object.defineProperty(dropEvent, 'dataTransfer', {
                 value: {
@@ -112,7 +113,7 @@ describe('PDF RAG Chatbot Frontend Tests', () => {
 
             await dropZone.dispatchEvent(dropEvent);
             
-            expect(errorMessage.textContent).toBe('File size should not exceed 10MB.');
+            expect(errorMessage.textContent).toBe('File size should not exceed 512MB.');
             expect(fetch).not.toHaveBeenCalled();
         });
     });
@@ -126,7 +127,10 @@ describe('PDF RAG Chatbot Frontend Tests', () => {
             fetch.mockImplementationOnce(() => 
                 Promise.resolve({
                     ok: true,
-                    json: () => Promise.resolve({ response: botResponse })
+                    json: () => Promise.resolve({
+                        response: { response: botResponse },
+                        session_id: 'session-1'
+                    })
                 })
             );
 